@@ -0,0 +1,88 @@
+"""Dish lookup, search and allergen filtering: DataFrame scans versus FoodIndex.
+
+For each catalog size, reports the time to build the index, to fetch the
+recipes of a 7-day plan by name (the old format_meals scan) versus by row,
+to answer a search by str.contains over names and recipes versus by prefix
+postings, and to plan a week with no restrictions versus with allergen
+restrictions, checking the planned dishes are free of the excluded allergens.
+First checks the ingredient categories found for a few dishes of the shipped
+CSV whose recipes are easy to misread.
+
+Run from the diet_plan directory:
+    python -m benchmarks.bench_food_index [--sizes 160 1014 5000] [--repeat 20]
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_food_store import CSV_PATH, grow_catalog
+from food_index import FoodIndex
+from food_store import MEAL_NAMES, FoodStore
+from week_planner import plan_days
+
+DAY_TARGET = np.array([2591, 162, 291, 86], dtype=np.float64)
+QUERIES = ['pan', 'chicken', 'dal mak', 'coconut', 'rice', 'ghee']
+RESTRICTIONS = [[], ['nuts'], ['vegetarian', 'gluten', 'nuts'], ['vegan', 'nuts']]
+# (dish, ingredient category, whether it contains it) for rows of the shipped CSV
+ALLERGEN_CHECKS = [('Vegetable Chop', 'gluten', True), ('Vegetable Cutlet', 'gluten', True),
+                   ('Chaat Papdi', 'gluten', True), ('Vada', 'gluten', False), ('Medu Vada', 'gluten', False),
+                   ('Lauki Kofta', 'dairy', True), ('Malai Kofta', 'dairy', True),
+                   ('Chingri Malai Curry', 'dairy', False), ('Chingri Malai Curry', 'fish', True)]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[160, 1014, 5000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    food_df = pd.read_csv(CSV_PATH)
+    index = FoodIndex(food_df['name'], food_df['recipe'])
+    wrong = [f"{name} {'contains' if contains else 'has no'} {category}" for name, category, contains in ALLERGEN_CHECKS
+             if index.exclusions[category][index.lookup(name)] != contains]
+    print(f"ingredient categories of known dishes: {len(ALLERGEN_CHECKS) - len(wrong)}/{len(ALLERGEN_CHECKS)} right")
+    for check in wrong:
+        print(f"  wrong: {check}")
+
+    for size in args.sizes:
+        catalog = grow_catalog(food_df, size, jitter=0.2)
+        build, index = timed(lambda: FoodIndex(catalog['name'], catalog['recipe']), args.repeat)
+        store = FoodStore(catalog, exclusions=index.exclusions)
+        print(f"{size} foods: index built in {build:.2f} ms")
+
+        plan = plan_days(store, store.all, MEAL_NAMES, DAY_TARGET, 7, rng=np.random.default_rng(0))
+        names = [store.names[row] for day in plan for indices, _ in day for row in indices]
+        scan, _ = timed(lambda: [catalog.loc[catalog['name'] == name, 'recipe'].iloc[0] for name in names], args.repeat)
+        by_row, _ = timed(lambda: [store.recipes[index.lookup(name)] for name in names], args.repeat)
+        print(f"  recipes for {len(names)} planned items   scan {scan:8.3f} ms   index {by_row:8.3f} ms")
+
+        text = catalog['name'] + ' ' + catalog['recipe']
+        scan, _ = timed(lambda: [catalog['name'][text.str.contains(query, case=False)].head(10).tolist()
+                                 for query in QUERIES], args.repeat)
+        search, _ = timed(lambda: [index.search(query) for query in QUERIES], args.repeat)
+        print(f"  {len(QUERIES)} searches                  scan {scan:8.3f} ms   index {search:8.3f} ms")
+
+        for restrictions in RESTRICTIONS:
+            filtered = store.candidates('All', restrictions)
+            median, plan = timed(lambda: plan_days(store, filtered, MEAL_NAMES, DAY_TARGET, 7,
+                                                   rng=np.random.default_rng(1)), args.repeat)
+            planned = np.concatenate([indices for day in plan for indices, _ in day])
+            violations = np.count_nonzero(~store.restriction_mask(restrictions)[planned])
+            print(f"  plan_days {', '.join(restrictions) or 'unrestricted':<26} {median:7.2f} ms"
+                  f"   {np.count_nonzero(filtered):5d} candidates   {violations} violations")
+
+
+if __name__ == '__main__':
+    main()
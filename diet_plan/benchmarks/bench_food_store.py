@@ -0,0 +1,100 @@
+"""Candidate filtering cost: DataFrame regex scans versus FoodStore masks.
+
+Grows indian_food_data_2.csv to catalog sizes around the INDB workbook
+(~1000 foods) and beyond, then times the filtering one recommend_meals call
+does for a 4-meal day, the old way (copy plus str.contains per filter and
+meal) and from the precomputed masks.
+
+Run from the diet_plan directory:
+    python -m benchmarks.bench_food_store [--sizes 160 1014 10000 100000]
+"""
+import argparse
+import os
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from food_store import MEAL_NAMES, NUTRIENT_COLUMNS, FoodStore
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'indian_food_data_2.csv')
+QUERIES = [('All', []), ('North Indian', ['vegetarian']), ('South Indian', ['vegan'])]
+
+
+def grow_catalog(food_df, size, jitter=0.0, seed=0):
+    """food_df repeated up to size rows with unique names; copies get nutrients scaled by up to +-jitter."""
+    catalog = food_df.iloc[np.arange(size) % len(food_df)].reset_index(drop=True)
+    copy = catalog.index // len(food_df)
+    catalog['name'] = catalog['name'] + ' #' + copy.astype(str)
+    if jitter:
+        factors = np.random.default_rng(seed).uniform(1 - jitter, 1 + jitter, (size, len(NUTRIENT_COLUMNS)))
+        factors[copy == 0] = 1.0
+        catalog[NUTRIENT_COLUMNS] = catalog[NUTRIENT_COLUMNS] * factors
+    return catalog
+
+
+def regex_filter(food_df, regional_preference, restrictions):
+    """The filtering recommend_meals did before FoodStore; returns each meal's candidate count."""
+    filtered_foods = food_df.copy()
+    if regional_preference.lower() != 'all':
+        filtered_foods = filtered_foods[filtered_foods['region'].str.contains(regional_preference, case=False, na=False) |
+                                        filtered_foods['region'].str.contains('All', case=False, na=False)]
+    if 'vegetarian' in restrictions:
+        filtered_foods = filtered_foods[~filtered_foods['food_group'].str.contains('Non-veg|Meat', case=False, na=False)]
+    if 'vegan' in restrictions:
+        filtered_foods = filtered_foods[~filtered_foods['food_group'].str.contains('Non-veg|Meat|Dairy', case=False, na=False)]
+    if len(filtered_foods) < 10:
+        filtered_foods = food_df.copy()
+    counts = []
+    for meal_name in MEAL_NAMES:
+        potential_items = filtered_foods[filtered_foods['meal_type'].str.contains(meal_name, case=False, na=False)]
+        if len(potential_items) < 5:
+            potential_items = filtered_foods
+        counts.append(len(potential_items))
+    return counts
+
+
+def mask_filter(store, regional_preference, restrictions):
+    filtered_foods = store.candidates(regional_preference, restrictions)
+    counts = []
+    for meal_name in MEAL_NAMES:
+        potential_items = filtered_foods & store.meal_mask(meal_name)
+        if np.count_nonzero(potential_items) < 5:
+            potential_items = filtered_foods
+        counts.append(int(np.count_nonzero(potential_items)))
+    return counts
+
+
+def time_call(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[160, 1014, 10000, 100000])
+    args = parser.parse_args()
+
+    food_df = pd.read_csv(CSV_PATH)
+    for size in args.sizes:
+        catalog = grow_catalog(food_df, size)
+        start = time.perf_counter()
+        store = FoodStore(catalog)
+        build = (time.perf_counter() - start) * 1e3
+        for regional_preference, restrictions in QUERIES:
+            assert regex_filter(catalog, regional_preference, restrictions) == \
+                mask_filter(store, regional_preference, restrictions)
+            regex = time_call(lambda: regex_filter(catalog, regional_preference, restrictions), 20)
+            masks = time_call(lambda: mask_filter(store, regional_preference, restrictions), 200)
+            label = f"{regional_preference} {','.join(restrictions) or '-'}"
+            print(f"{size:>7} foods  {label:<26} regex {regex:9.1f} us   masks {masks:7.1f} us"
+                  f"   ({regex / masks:5.0f}x, store built in {build:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
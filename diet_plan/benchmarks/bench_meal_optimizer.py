@@ -0,0 +1,83 @@
+"""Meal plan quality versus latency: random sample-and-scale against optimize_meal.
+
+Plans 4-meal days for a spread of calorie/macro targets on catalogs grown
+from indian_food_data_2.csv (copies with jittered nutrients), and reports the
+mean absolute deviation of the day's calories, protein, carbs and fat from
+target next to the time per day. The baseline is what recommend_meals did
+before the optimizer: 2-4 random foods per meal scaled to the calorie share.
+
+Run from the diet_plan directory:
+    python -m benchmarks.bench_meal_optimizer [--sizes 160 1014 5000] [--days 50]
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_food_store import CSV_PATH, grow_catalog
+from food_store import MEAL_NAMES, FoodStore
+from meal_optimizer import optimize_meal
+
+# (calories, protein, carbs, fat) per day: weight loss, maintenance and muscle gain targets
+TARGETS = np.array([[1700, 128, 170, 57], [2200, 165, 220, 73], [2591, 162, 291, 86],
+                    [2000, 125, 225, 67], [2850, 214, 321, 79], [3200, 240, 360, 89]], dtype=np.float64)
+
+
+def sample_and_scale(store, candidates, target, rng):
+    selected = rng.choice(candidates, min(rng.integers(2, 5), len(candidates)), replace=False)
+    calories = store.nutrients[selected, 0].sum()
+    return selected, np.full(len(selected), target[0] / calories if calories > 0 else 1.0)
+
+
+def plan_day(store, filtered, target, choose):
+    """Day totals from choose(candidates, meal target) for each of the four meals."""
+    used = np.zeros(len(store), dtype=bool)
+    totals = np.zeros(4)
+    for meal_name in MEAL_NAMES:
+        potential = filtered & store.meal_mask(meal_name) & ~used
+        if np.count_nonzero(potential) < 5:
+            potential = filtered & ~used
+        selected, multipliers = choose(np.flatnonzero(potential), target / len(MEAL_NAMES))
+        used[selected] = True
+        totals += multipliers @ store.nutrients[selected]
+    return totals
+
+
+def run(store, days, choose):
+    deviations, samples = [], []
+    for day in range(days):
+        target = TARGETS[day % len(TARGETS)]
+        filtered = store.candidates(('All', 'North Indian', 'South Indian')[day % 3], [])
+        start = time.perf_counter()
+        totals = plan_day(store, filtered, target, choose)
+        samples.append((time.perf_counter() - start) * 1e3)
+        deviations.append(np.abs(totals - target) / target)
+    samples.sort()
+    return np.mean(deviations, axis=0) * 100, statistics.median(samples), samples[int(len(samples) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[160, 1014, 5000])
+    parser.add_argument('--days', type=int, default=50)
+    args = parser.parse_args()
+
+    food_df = pd.read_csv(CSV_PATH)
+    for size in args.sizes:
+        store = FoodStore(grow_catalog(food_df, size, jitter=0.2))
+        print(f"{size} foods, mean |deviation| of daily totals (%), time per 4-meal day (ms)")
+        rng = np.random.default_rng(0)
+        methods = [("sample-and-scale", lambda candidates, target: sample_and_scale(store, candidates, target, rng))]
+        for beam_width in (1, 2, 4, 8):
+            methods.append((f"optimizer beam {beam_width}", lambda candidates, target, beam_width=beam_width: optimize_meal(
+                store.nutrients, candidates, target, groups=store.food_groups, beam_width=beam_width, rng=rng)))
+        for name, choose in methods:
+            deviation, median, p95 = run(store, args.days, choose)
+            print(f"  {name:<18} kcal {deviation[0]:5.1f}  protein {deviation[1]:5.1f}  carbs {deviation[2]:5.1f}"
+                  f"  fat {deviation[3]:5.1f}   median {median:6.2f} ms  p95 {p95:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
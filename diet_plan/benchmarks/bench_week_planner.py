@@ -0,0 +1,89 @@
+"""Weekly plans: the single-day path called per day versus plan_days in one pass.
+
+For each catalog size, plans 7-day, 4-meal weeks both ways and reports the
+time per week next to one single-day plan, the weekly deviation of calories,
+protein, carbs and fat from target, dishes repeated within DISH_WINDOW days
+and distinct dishes used.
+
+Run from the diet_plan directory:
+    python -m benchmarks.bench_week_planner [--sizes 160 1014 5000] [--weeks 20]
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_food_store import CSV_PATH, grow_catalog
+from food_store import MEAL_NAMES, FoodStore
+from meal_optimizer import optimize_meal
+from week_planner import DISH_WINDOW, plan_days
+
+DAYS = 7
+DAY_TARGET = np.array([2591, 162, 291, 86], dtype=np.float64)
+
+
+def plan_single_days(store, filtered, days, rng):
+    """The recommend_meals loop once per day: no dish twice a day, nothing carried between days."""
+    plan = []
+    for _ in range(days):
+        used = np.zeros(len(store), dtype=bool)
+        meals = []
+        for meal_name in MEAL_NAMES:
+            potential = filtered & store.meal_mask(meal_name) & ~used
+            if np.count_nonzero(potential) < 5:
+                potential = filtered & ~used
+            selected, multipliers = optimize_meal(store.nutrients, np.flatnonzero(potential), DAY_TARGET / len(MEAL_NAMES),
+                                                  groups=store.food_groups, rng=rng)
+            used[selected] = True
+            meals.append((selected, multipliers))
+        plan.append(meals)
+    return plan
+
+
+def score(store, plan):
+    days = np.array([sum(multipliers @ store.nutrients[indices] for indices, multipliers in day) for day in plan])
+    deviation = np.abs(days.sum(axis=0) - DAY_TARGET * len(plan)) / (DAY_TARGET * len(plan)) * 100
+    dishes = [set(np.concatenate([indices for indices, _ in day]).tolist()) for day in plan]
+    repeats = sum(len(dishes[a] & dishes[b]) for a in range(len(plan)) for b in range(a + 1, min(a + DISH_WINDOW, len(plan))))
+    return deviation, repeats, len(set().union(*dishes))
+
+
+def run(store, weeks, make_plan):
+    samples, deviations, repeats, distinct = [], [], [], []
+    for week in range(weeks):
+        filtered = store.candidates(('All', 'North Indian', 'South Indian')[week % 3], [])
+        rng = np.random.default_rng(week)
+        start = time.perf_counter()
+        plan = make_plan(filtered, rng)
+        samples.append((time.perf_counter() - start) * 1e3)
+        deviation, repeated, used = score(store, plan)
+        deviations.append(deviation)
+        repeats.append(repeated)
+        distinct.append(used)
+    return statistics.median(samples), np.mean(deviations, axis=0), np.mean(repeats), np.mean(distinct)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[160, 1014, 5000])
+    parser.add_argument('--weeks', type=int, default=20)
+    args = parser.parse_args()
+
+    food_df = pd.read_csv(CSV_PATH)
+    for size in args.sizes:
+        store = FoodStore(grow_catalog(food_df, size, jitter=0.2))
+        print(f"{size} foods, {DAYS}-day {len(MEAL_NAMES)}-meal plans; weekly |deviation| (%)")
+        for name, make_plan in (
+                ("single day x1", lambda filtered, rng: plan_single_days(store, filtered, 1, rng)),
+                (f"single day x{DAYS}", lambda filtered, rng: plan_single_days(store, filtered, DAYS, rng)),
+                ("plan_days", lambda filtered, rng: plan_days(store, filtered, MEAL_NAMES, DAY_TARGET, DAYS, rng=rng))):
+            median, deviation, repeats, distinct = run(store, args.weeks, make_plan)
+            print(f"  {name:<14} {median:7.2f} ms   kcal {deviation[0]:4.1f} protein {deviation[1]:5.1f}"
+                  f" carbs {deviation[2]:4.1f} fat {deviation[3]:4.1f}   repeats within {DISH_WINDOW} days {repeats:4.1f}"
+                  f"   distinct dishes {distinct:5.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,28 +1,18 @@
 import gradio as gr
 import pandas as pd
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 import warnings
 import matplotlib.pyplot as plt
+from food_data import load_foods
 warnings.filterwarnings('ignore')
 
-# Load the Indian food dataset from CSV
+# Load the Indian food dataset from the food data snapshot (validated and rebuilt from the CSV by food_data.py)
 try:
-    food_df = pd.read_csv('diet_plan\indian_food_data_1.csv')
+    food_df = load_foods('indian_food_data_1')
     print(f"Successfully loaded dataset with {len(food_df)} items")
-    
-    # Clean and prepare dataset
-    required_columns = ['name', 'calories', 'protein', 'carbohydrates', 'fat', 'serving_size', 'food_group', 'meal_type', 'recipe']
-    for col in required_columns:
-        if col not in food_df.columns:
-            raise ValueError(f"Missing required column: {col}")
-    numeric_cols = ['calories', 'protein', 'carbohydrates', 'fat', 'serving_size']
-    for col in numeric_cols:
-        food_df[col] = pd.to_numeric(food_df[col], errors='coerce')
-    food_df = food_df.dropna(subset=['name', 'calories', 'meal_type', 'recipe'])
 except Exception as e:
-    print(f"Error loading CSV: {e}")
-    raise gr.Error("Failed to load food data. Please ensure 'indian_food_data.csv' is available.")
+    print(f"Error loading food data: {e}")
+    raise gr.Error("Failed to load food data. Please ensure 'indian_food_data_1.csv' is available.")
 
 # Calculate caloric needs (Harris-Benedict Equation)
 def calculate_caloric_needs(weight, height, age, gender, activity_level):
@@ -1,28 +1,27 @@
 import gradio as gr
 import pandas as pd
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 import warnings
 import matplotlib.pyplot as plt
+from food_data import load_foods
+from food_index import FoodIndex, parse_restrictions
+from food_store import MEAL_NAMES, NUTRIENTS, FoodStore
+from meal_optimizer import meal_targets, optimize_meal
+from swap_index import SwapIndex
+from week_planner import grocery_list, plan_days
 warnings.filterwarnings('ignore')
 
-# Load the Indian food dataset from CSV
+# Load the Indian food dataset from the food data snapshot (validated and rebuilt from the CSV by food_data.py)
 try:
-    food_df = pd.read_csv(r"C:\Users\akshg\Desktop\Major 2\diet_plan\indian_food_data_2.csv")
+    food_df = load_foods('indian_food_data_2')
     print(f"Successfully loaded dataset with {len(food_df)} items")
-    
-    # Clean and prepare dataset
-    required_columns = ['name', 'calories', 'protein', 'carbohydrates', 'fat', 'serving_size', 'food_group', 'meal_type', 'recipe', 'region']
-    for col in required_columns:
-        if col not in food_df.columns:
-            raise ValueError(f"Missing required column: {col}")
-    numeric_cols = ['calories', 'protein', 'carbohydrates', 'fat', 'serving_size']
-    for col in numeric_cols:
-        food_df[col] = pd.to_numeric(food_df[col], errors='coerce')
-    food_df = food_df.dropna(subset=['name', 'calories', 'meal_type', 'recipe', 'region'])
+    # Dish names, recipes and ingredients indexed once, for search and ingredient-level restrictions
+    food_index = FoodIndex(food_df['name'], food_df['recipe'])
+    food_store = FoodStore(food_df, exclusions=food_index.exclusions)
+    swap_index = SwapIndex(food_store)
 except Exception as e:
-    print(f"Error loading CSV: {e}")
-    raise gr.Error("Failed to load food data. Please ensure 'indian_food_data.csv' is available.")
+    print(f"Error loading food data: {e}")
+    raise gr.Error("Failed to load food data. Please ensure 'indian_food_data_2.csv' is available.")
 
 # Calculate caloric needs (Harris-Benedict Equation)
 def calculate_caloric_needs(weight, height, age, gender, activity_level):
@@ -56,96 +55,153 @@ def calculate_macros(caloric_needs, goal):
     return {'calories': round(caloric_needs), 'protein': round(macros['protein']), 
             'carbs': round(macros['carbs']), 'fat': round(macros['fat'])}
 
+# Meal names for the day: Breakfast to Dinner, then numbered extra meals
+def daily_meal_names(meals_per_day):
+    meal_names = MEAL_NAMES[:meals_per_day]
+    if meals_per_day > len(meal_names):
+        meal_names.extend([f"Meal {i+1}" for i in range(len(meal_names), meals_per_day)])
+    return meal_names
+
+# Build a meal from the chosen foods and their portion multipliers
+def build_meal(meal_name, selected, multipliers):
+    nutrients = food_store.nutrients[selected] * multipliers[:, None]
+    servings = food_store.serving_size[selected] * multipliers
+    selected_items = [{'name': food_store.names[index], 'index': int(index), 'serving': round(float(serving)),
+                       'calories': float(calories), 'protein': float(protein), 'carbs': float(carbs), 'fat': float(fat)}
+                      for index, serving, (calories, protein, carbs, fat) in zip(selected, servings, nutrients)]
+    current_nutrition = dict(zip(NUTRIENTS, nutrients.sum(axis=0).tolist()))
+    return {'name': meal_name, 'items': selected_items, 
+            'nutrition': {k: round(v) for k, v in current_nutrition.items()}}
+
 # Recommend meals
 def recommend_meals(caloric_needs, macros, restrictions, meals_per_day, regional_preference):
-    filtered_foods = food_df.copy()
-    
-    # Filter by regional preference
-    if regional_preference.lower() != 'all':
-        filtered_foods = filtered_foods[filtered_foods['region'].str.contains(regional_preference, case=False, na=False) | 
-                                       filtered_foods['region'].str.contains('All', case=False, na=False)]
+    # Region and dietary filters are precomputed masks, falling back to all foods if too few remain
+    filtered_foods = food_store.candidates(regional_preference, restrictions)
     
-    # Filter by dietary restrictions
-    if 'vegetarian' in restrictions:
-        filtered_foods = filtered_foods[~filtered_foods['food_group'].str.contains('Non-veg|Meat', case=False, na=False)]
-    if 'vegan' in restrictions:
-        filtered_foods = filtered_foods[~filtered_foods['food_group'].str.contains('Non-veg|Meat|Dairy', case=False, na=False)]
-    
-    # Fallback if too few foods remain
-    if len(filtered_foods) < 10:
-        filtered_foods = food_df.copy()
-    
-    per_meal_calories = caloric_needs / meals_per_day
+    # Every meal aims at an equal share of the calorie and macro targets
+    target = meal_targets(dict(macros, calories=caloric_needs), meals_per_day)
     meal_plan = []
-    daily_meal_names = ["Breakfast", "Lunch", "Evening Snack", "Dinner"][:meals_per_day]
-    if meals_per_day > len(daily_meal_names):
-        daily_meal_names.extend([f"Meal {i+1}" for i in range(len(daily_meal_names), meals_per_day)])
+    used_today = np.zeros(len(food_store), dtype=bool)
     
-    for meal_name in daily_meal_names:
-        # Filter foods suitable for the meal type
-        potential_items = filtered_foods[filtered_foods['meal_type'].str.contains(meal_name, case=False, na=False)]
-        if len(potential_items) < 5:
-            potential_items = filtered_foods
-        num_items = np.random.randint(2, 5)
-        selected_food_items = potential_items.sample(min(num_items, len(potential_items)))
-        
-        selected_items = []
-        current_nutrition = {'calories': 0, 'protein': 0, 'carbs': 0, 'fat': 0}
-        for _, food in selected_food_items.iterrows():
-            serving_multiplier = 1.0
-            food_name = food.get('name', "Unknown")
-            serving_size = food.get('serving_size', 100) * serving_multiplier
-            item_calories = food.get('calories', 0) * serving_multiplier
-            item_protein = food.get('protein', 0) * serving_multiplier
-            item_carbs = food.get('carbohydrates', 0) * serving_multiplier
-            item_fat = food.get('fat', 0) * serving_multiplier
-            current_nutrition['calories'] += item_calories
-            current_nutrition['protein'] += item_protein
-            current_nutrition['carbs'] += item_carbs
-            current_nutrition['fat'] += item_fat
-            selected_items.append({'name': food_name, 'serving': round(serving_size), 'calories': item_calories, 
-                                   'protein': item_protein, 'carbs': item_carbs, 'fat': item_fat})
-        
-        if current_nutrition['calories'] > 0:
-            scaling_factor = per_meal_calories / current_nutrition['calories']
-            for item in selected_items:
-                item['serving'] = round(item['serving'] * scaling_factor)
-                item['calories'] = item['calories'] * scaling_factor
-                item['protein'] = item['protein'] * scaling_factor
-                item['carbs'] = item['carbs'] * scaling_factor
-                item['fat'] = item['fat'] * scaling_factor
-            current_nutrition = {k: sum(item[k] for item in selected_items) for k in ['calories', 'protein', 'carbs', 'fat']}
+    for meal_name in daily_meal_names(meals_per_day):
+        # Filter foods suitable for the meal type, skipping dishes already planned today
+        potential_items = filtered_foods & food_store.meal_mask(meal_name) & ~used_today
+        if np.count_nonzero(potential_items) < 5:
+            potential_items = filtered_foods & ~used_today
         
-        meal_plan.append({'name': meal_name, 'items': selected_items, 
-                          'nutrition': {k: round(v) for k, v in current_nutrition.items()}})
+        # Choose items and portions that best match the meal's calories, protein, carbs and fat
+        selected, multipliers = optimize_meal(food_store.nutrients, np.flatnonzero(potential_items), target,
+                                              groups=food_store.food_groups, rng=np.random)
+        used_today[selected] = True
+        meal_plan.append(build_meal(meal_name, selected, multipliers))
     return meal_plan
 
-# Format meal plan with recipes
-def format_meal_plan(meal_plan, daily_targets):
-    output = "# Your Personalized Indian Meal Plan\n\n"
-    output += f"## Daily Targets: {daily_targets['calories']} kcal, {daily_targets['protein']}g protein, {daily_targets['carbs']}g carbs, {daily_targets['fat']}g fat\n\n"
+# Recommend several days at once, without repeating a dish within a few days and balancing macros over the week
+def recommend_days(macros, restrictions, meals_per_day, regional_preference, days):
+    filtered_foods = food_store.candidates(regional_preference, restrictions)
+    meal_names = daily_meal_names(meals_per_day)
+    plan = plan_days(food_store, filtered_foods, meal_names, meal_targets(macros, 1), days, rng=np.random)
+    return [[build_meal(meal_name, selected, multipliers) for meal_name, (selected, multipliers) in zip(meal_names, day)]
+            for day in plan]
+
+# Format meals with recipes, returning the text and their total nutrition
+def format_meals(meal_plan):
+    output = ""
     total_nutrition = {'calories': 0, 'protein': 0, 'carbs': 0, 'fat': 0}
     
     for meal in meal_plan:
         output += f"### {meal['name']}\n"
         for item in meal['items']:
             output += f"- {item['name']} ({item['serving']}g) - {round(item['calories'])} kcal\n"
-            recipe = food_df.loc[food_df['name'] == item['name'], 'recipe'].iloc[0] if item['name'] in food_df['name'].values else "Recipe not available."
+            recipe = food_store.recipes[item['index']] or "Recipe not available."
             output += f"  *Recipe*: {recipe}\n"
         nutrition = meal['nutrition']
         total_nutrition = {k: total_nutrition[k] + v for k, v in nutrition.items()}
         output += f"\n**Nutrition:** {nutrition['calories']} kcal, {nutrition['protein']}g protein, {nutrition['carbs']}g carbs, {nutrition['fat']}g fat\n\n"
-    
+    return output, total_nutrition
+
+# Format meal plan with recipes
+def format_meal_plan(meal_plan, daily_targets):
+    output = "# Your Personalized Indian Meal Plan\n\n"
+    output += f"## Daily Targets: {daily_targets['calories']} kcal, {daily_targets['protein']}g protein, {daily_targets['carbs']}g carbs, {daily_targets['fat']}g fat\n\n"
+    meals, total_nutrition = format_meals(meal_plan)
+    output += meals
     output += f"## Summary: {total_nutrition['calories']} kcal, {total_nutrition['protein']}g protein, {total_nutrition['carbs']}g carbs, {total_nutrition['fat']}g fat\n"
     return output
 
+# Format a multi-day plan with each day's meals and a consolidated grocery list
+def format_days_plan(days_plan, daily_targets):
+    output = f"# Your {len(days_plan)}-Day Indian Meal Plan\n\n"
+    output += f"## Daily Targets: {daily_targets['calories']} kcal, {daily_targets['protein']}g protein, {daily_targets['carbs']}g carbs, {daily_targets['fat']}g fat\n\n"
+    for day_number, meal_plan in enumerate(days_plan, 1):
+        meals, total_nutrition = format_meals(meal_plan)
+        output += f"## Day {day_number}\n\n{meals}"
+        output += f"**Day {day_number} total:** {total_nutrition['calories']} kcal, {total_nutrition['protein']}g protein, {total_nutrition['carbs']}g carbs, {total_nutrition['fat']}g fat\n\n"
+    
+    output += "## Grocery List\n\n| Dish | Food group | Total | Meals |\n|---|---|---|---|\n"
+    items = [(item['index'], item['serving']) for meal_plan in days_plan for meal in meal_plan for item in meal['items']]
+    for name, food_group, grams, times in grocery_list(food_store, items):
+        output += f"| {name} | {food_group} | {round(grams)}g | {times} |\n"
+    return output
+
+def format_plan(plan_state):
+    if len(plan_state['days']) == 1:
+        return format_meal_plan(plan_state['days'][0], plan_state['targets'])
+    return format_days_plan(plan_state['days'], plan_state['targets'])
+
 # Main function
-def create_nutrition_plan(weight, height, age, gender, activity_level, goal, dietary_restrictions, meals_per_day, regional_preference):
+def create_nutrition_plan(weight, height, age, gender, activity_level, goal, dietary_restrictions, meals_per_day, regional_preference, days=1):
     caloric_needs = calculate_caloric_needs(weight, height, age, gender, activity_level)
     macros = calculate_macros(caloric_needs, goal)
-    restrictions = dietary_restrictions.lower().split(', ') if dietary_restrictions else []
-    meal_plan = recommend_meals(macros['calories'], macros, restrictions, meals_per_day, regional_preference)
-    return format_meal_plan(meal_plan, macros)
+    restrictions = parse_restrictions(dietary_restrictions) if dietary_restrictions else []
+    meals_per_day, days = int(meals_per_day), int(days)
+    if days == 1:
+        days_plan = [recommend_meals(macros['calories'], macros, restrictions, meals_per_day, regional_preference)]
+    else:
+        days_plan = recommend_days(macros, restrictions, meals_per_day, regional_preference, days)
+    # The plan is kept in the session so items can be swapped without regenerating it
+    plan_state = {'days': days_plan, 'targets': macros, 'restrictions': restrictions}
+    return format_plan(plan_state), plan_state
+
+# Swap a dish for the closest macro-equivalent one, portioned to keep the meal's totals
+def swap_meal_item(plan_state, item_name):
+    if not plan_state:
+        raise gr.Error("Generate a plan first")
+    if food_index.lookup(item_name) is None:
+        raise gr.Error(f"No dish named {item_name}")
+    meals = [meal for meal_plan in plan_state['days'] for meal in meal_plan]
+    planned = {item['index'] for meal in meals for item in meal['items']}
+    # The first occurrence of the dish is swapped
+    for meal in meals:
+        for position, item in enumerate(meal['items']):
+            if item['name'].lower() != item_name.strip().lower():
+                continue
+            swap = swap_index.substitute(item['index'], [item[k] for k in NUTRIENTS], plan_state['restrictions'], planned)
+            if swap is None:
+                raise gr.Error(f"No substitute found for {item['name']}")
+            index, multiplier = swap
+            calories, protein, carbs, fat = (food_store.nutrients[index] * multiplier).tolist()
+            meal['items'][position] = {'name': food_store.names[index], 'index': index,
+                                       'serving': round(float(food_store.serving_size[index] * multiplier)),
+                                       'calories': calories, 'protein': protein, 'carbs': carbs, 'fat': fat}
+            meal['nutrition'] = {k: round(sum(item[k] for item in meal['items'])) for k in NUTRIENTS}
+            return format_plan(plan_state), plan_state
+    raise gr.Error(f"{item_name} is not in your meal plan")
+
+# Dishes matching a search as you type, honouring the dietary restrictions
+def search_dishes(query, dietary_restrictions):
+    restrictions = parse_restrictions(dietary_restrictions) if dietary_restrictions else []
+    rows = food_index.search(query, limit=10, mask=food_store.restriction_mask(restrictions))
+    if not rows:
+        return "No matching dishes." if query.strip() else ""
+    output = ""
+    for row in rows:
+        calories, protein, carbs, fat = food_store.nutrients[row].tolist()
+        output += f"- **{food_store.names[row]}** ({round(food_store.serving_size[row])}g) - {round(calories)} kcal, {round(protein)}g protein, {round(carbs)}g carbs, {round(fat)}g fat\n"
+        allergens = food_index.allergens(row)
+        if allergens:
+            output += f"  *Contains*: {', '.join(allergens)}\n"
+    return output
 
 # Progress tracking (simple example)
 progress_data = {'dates': [], 'calories': []}
@@ -182,14 +238,24 @@ with gr.Blocks() as app:
         
         with gr.Column(scale=1, min_width=300):
             goal = gr.Radio(["Weight Loss", "Maintenance", "Muscle Gain"], label="Goal", value="Maintenance")
-            dietary_restrictions = gr.Textbox(label="Dietary Restrictions (e.g., vegetarian)", value="")
+            dietary_restrictions = gr.Textbox(label="Dietary Restrictions (e.g., vegetarian, gluten-free, no nuts)", value="")
             meals_per_day = gr.Slider(2, 4, value=3, step=1, label="Meals per Day")
+            days = gr.Slider(1, 7, value=1, step=1, label="Days to Plan")
             regional_preference = gr.Dropdown(["All", "North Indian", "South Indian", "East Indian", 
                                              "West Indian"], label="Regional Preference", value="All")
             submit_btn = gr.Button("Generate Plan", variant="primary")
 
     with gr.Row():
         output = gr.Markdown(label="Your Meal Plan")
+    plan_state = gr.State()
+    
+    with gr.Tab("Swap Item"):
+        swap_input = gr.Textbox(label="Dish to swap (as named in your plan)")
+        swap_btn = gr.Button("Swap Item")
+    
+    with gr.Tab("Search Dishes"):
+        search_input = gr.Textbox(label="Dish, recipe or ingredient")
+        search_output = gr.Markdown()
     
     with gr.Tab("Track Progress"):
         calories_input = gr.Number(label="Log Today's Calories")
@@ -202,8 +268,10 @@ with gr.Blocks() as app:
 
     submit_btn.click(fn=create_nutrition_plan, 
                      inputs=[weight, height, age, gender, activity_level, goal, dietary_restrictions, 
-                             meals_per_day, regional_preference], 
-                     outputs=output)
+                             meals_per_day, regional_preference, days], 
+                     outputs=[output, plan_state])
+    swap_btn.click(fn=swap_meal_item, inputs=[plan_state, swap_input], outputs=[output, plan_state])
+    search_input.change(fn=search_dishes, inputs=[search_input, dietary_restrictions], outputs=search_output)
     track_btn.click(fn=track_progress, inputs=calories_input, outputs=progress_plot)
     share_btn.click(fn=share_plan, inputs=output, outputs=share_output)
 
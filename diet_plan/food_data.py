@@ -0,0 +1,220 @@
+"""Food data ingestion and the binary snapshot the planners load.
+
+The CSVs and the INDB workbook are normalised into one schema (SCHEMA, one
+row per food with a source column), validated, and written to a single .npz
+snapshot together with a manifest of each source's size, mtime and SHA-256.
+load_foods() serves the snapshot while the manifest matches the sources and
+rebuilds it otherwise; a touched but unchanged source only has its manifest
+entry refreshed.
+
+The INDB workbook has no food group, meal type or region columns, so its rows
+are stored with region 'All' and those columns empty. Neither planner loads
+them yet: FoodStore's meal and restriction masks cannot select them until
+they are categorised.
+
+    python food_data.py [--rebuild]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+DIET_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_PATH = os.path.join(DIET_DIR, 'cache', 'foods.npz')
+# Bump when the schema or the normalisation changes to invalidate old snapshots
+SCHEMA_VERSION = 1
+
+TEXT_COLUMNS = ['name', 'food_group', 'meal_type', 'recipe', 'region', 'source']
+NUMERIC_COLUMNS = ['calories', 'protein', 'carbohydrates', 'fat', 'serving_size']
+SCHEMA = TEXT_COLUMNS[:1] + NUMERIC_COLUMNS + TEXT_COLUMNS[1:]
+
+CSV_COLUMNS = ['name', 'calories', 'protein', 'carbohydrates', 'fat', 'serving_size', 'food_group', 'meal_type', 'recipe']
+# Source name -> (path, reader, columns it must have, columns every row must fill)
+SOURCES = {
+    'indian_food_data_1': (os.path.join(DIET_DIR, 'indian_food_data_1.csv'), 'csv', CSV_COLUMNS,
+                           ['name', 'calories', 'meal_type', 'recipe']),
+    'indian_food_data_2': (os.path.join(DIET_DIR, 'indian_food_data_2.csv'), 'csv', CSV_COLUMNS + ['region'],
+                           ['name', 'calories', 'meal_type', 'recipe', 'region']),
+    'indb': (os.path.join(os.path.dirname(DIET_DIR), 'Food_INDB_2024.11.xlsx'), 'indb',
+             ['name', 'calories', 'protein', 'carbohydrates', 'fat'], ['name', 'calories']),
+}
+# INDB workbook columns behind the schema; its nutrients are per 100 g. It has no category columns
+# (food_code prefixes only name the data source), so food_group and meal_type stay empty
+INDB_COLUMNS = {'food_name': 'name', 'energy_kcal': 'calories', 'protein_g': 'protein',
+                'carb_g': 'carbohydrates', 'fat_g': 'fat'}
+
+SHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+def read_xlsx(path):
+    """First worksheet of an .xlsx as a DataFrame of strings, header from the first row.
+
+    Reads the sheet XML straight from the zip, which takes a fraction of the
+    time openpyxl needs and keeps the planners free of that dependency.
+    """
+    with zipfile.ZipFile(path) as workbook:
+        shared = []
+        if 'xl/sharedStrings.xml' in workbook.namelist():
+            for item in ET.fromstring(workbook.read('xl/sharedStrings.xml')):
+                shared.append(''.join(text.text or '' for text in item.iter(SHEET_NS + 't')))
+        sheet = ET.fromstring(workbook.read('xl/worksheets/sheet1.xml'))
+
+    rows = []
+    for row in sheet.iter(SHEET_NS + 'row'):
+        values = {}
+        for cell in row.iter(SHEET_NS + 'c'):
+            column = re.match(r'[A-Z]+', cell.get('r')).group()
+            kind = cell.get('t')
+            if kind == 'inlineStr':
+                values[column] = ''.join(text.text or '' for text in cell.iter(SHEET_NS + 't'))
+                continue
+            value = cell.find(SHEET_NS + 'v')
+            if value is not None:
+                values[column] = shared[int(value.text)] if kind == 's' else value.text
+        rows.append(values)
+    if not rows:
+        return pd.DataFrame()
+    header = rows[0]
+    return pd.DataFrame([[row.get(column) for column in header] for row in rows[1:]],
+                        columns=[header[column] for column in header])
+
+
+def _read_source(name):
+    path, reader, columns, required = SOURCES[name]
+    if reader == 'csv':
+        frame = pd.read_csv(path)
+    else:
+        frame = read_xlsx(path).rename(columns=INDB_COLUMNS)
+        frame['serving_size'] = 100
+        frame['region'] = 'All'
+    missing = [column for column in columns if column not in frame.columns]
+    if missing:
+        raise ValueError(f"{os.path.basename(path)} is missing required columns: {', '.join(missing)}")
+
+    for column in NUMERIC_COLUMNS:
+        frame[column] = pd.to_numeric(frame[column], errors='coerce') if column in frame else np.nan
+    for column in TEXT_COLUMNS:
+        if column not in frame:
+            frame[column] = np.nan
+    frame = frame.dropna(subset=required)
+    # Nutrients can be missing but not negative; servings default to 100 g
+    frame = frame[~(frame[NUMERIC_COLUMNS] < 0).any(axis=1)]
+    frame['serving_size'] = frame['serving_size'].fillna(100)
+    frame['source'] = name
+    for column in TEXT_COLUMNS:
+        frame[column] = frame[column].fillna('').astype(str).str.strip()
+    return frame[frame['name'] != ''][SCHEMA]
+
+
+def _fingerprint(path):
+    with open(path, 'rb') as source:
+        return hashlib.sha256(source.read()).hexdigest()
+
+
+def _manifest_entry(path):
+    """Size, mtime and hash of a source, or None when it is not there."""
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': _fingerprint(path)}
+
+
+def build_snapshot(snapshot=SNAPSHOT_PATH):
+    """Normalise every source and write the snapshot; returns the combined DataFrame."""
+    manifest = {'schema': SCHEMA_VERSION, 'sources': {name: _manifest_entry(SOURCES[name][0]) for name in SOURCES}}
+    # A missing source (say the workbook was not downloaded) is left out rather than failing the planners
+    foods = pd.concat([_read_source(name) for name in SOURCES if manifest['sources'][name]], ignore_index=True)
+    _write_snapshot(snapshot, foods, manifest)
+    return foods
+
+
+def _write_snapshot(snapshot, foods, manifest):
+    os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+    arrays = {column: foods[column].to_numpy(dtype=np.float64) for column in NUMERIC_COLUMNS}
+    # Text columns are stored as one NUL-separated UTF-8 buffer each rather than fixed-width unicode
+    arrays.update({column: np.frombuffer('\0'.join(foods[column]).encode(), dtype=np.uint8)
+                   for column in TEXT_COLUMNS})
+    arrays['manifest'] = np.array(json.dumps(manifest))
+    # Write next to the snapshot and swap it in, so readers never see half a file
+    temporary = f"{snapshot}.{os.getpid()}.tmp.npz"
+    np.savez(temporary, **arrays)
+    os.replace(temporary, snapshot)
+
+
+def _read_snapshot(snapshot):
+    with np.load(snapshot) as arrays:
+        manifest = json.loads(str(arrays['manifest']))
+        columns = {column: arrays[column] for column in NUMERIC_COLUMNS}
+        for column in TEXT_COLUMNS:
+            values = arrays[column].tobytes().decode().split('\0')
+            if len(values) != len(columns['calories']):
+                raise ValueError(f"column {column} has {len(values)} values for {len(columns['calories'])} foods")
+            columns[column] = values
+    return pd.DataFrame(columns)[SCHEMA], manifest
+
+
+def _check_manifest(manifest):
+    """(still valid, mtimes refreshed) for the current sources; refreshes the manifest in place."""
+    if manifest.get('schema') != SCHEMA_VERSION or set(manifest.get('sources', {})) != set(SOURCES):
+        return False, False
+    refreshed = False
+    for name, (path, _, _, _) in SOURCES.items():
+        entry = manifest['sources'][name]
+        if entry is None or not os.path.exists(path):
+            if entry is None and not os.path.exists(path):
+                continue
+            return False, False
+        stat = os.stat(path)
+        if stat.st_size != entry['size']:
+            return False, False
+        if stat.st_mtime_ns != entry['mtime_ns']:
+            # Touched: only a content change invalidates the snapshot
+            if _fingerprint(path) != entry['sha256']:
+                return False, False
+            entry['mtime_ns'] = stat.st_mtime_ns
+            refreshed = True
+    return True, refreshed
+
+
+def load_food_data(snapshot=SNAPSHOT_PATH):
+    """Every source's foods in SCHEMA, from the snapshot when it is current."""
+    if os.path.exists(snapshot):
+        try:
+            foods, manifest = _read_snapshot(snapshot)
+            valid, refreshed = _check_manifest(manifest)
+            if valid:
+                if refreshed:
+                    _write_snapshot(snapshot, foods, manifest)
+                return foods
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            print(f"Rebuilding unreadable food snapshot: {e}")
+    return build_snapshot(snapshot)
+
+
+def load_foods(source, snapshot=SNAPSHOT_PATH):
+    """The foods of one source, in SCHEMA with a fresh index."""
+    foods = load_food_data(snapshot)
+    return foods[foods['source'] == source].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the food data snapshot")
+    parser.add_argument('--snapshot', default=SNAPSHOT_PATH)
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild even if the snapshot is current")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    foods = build_snapshot(args.snapshot) if args.rebuild else load_food_data(args.snapshot)
+    print(f"{len(foods)} foods ({foods['source'].value_counts().to_dict()}) in {time.perf_counter() - start:.3f}s"
+          f" -> {args.snapshot}")
+
+
+if __name__ == '__main__':
+    main()
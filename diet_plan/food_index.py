@@ -0,0 +1,165 @@
+import bisect
+import re
+
+import numpy as np
+
+# Ingredient terms (English and common Hindi names) found in dish names and recipes, by the category they belong to
+INGREDIENTS = {
+    'nuts': ['almond', 'almonds', 'badam', 'cashew', 'cashews', 'kaju', 'walnut', 'walnuts', 'akhrot', 'peanut',
+             'peanuts', 'groundnut', 'moongfali', 'mungfali', 'pistachio', 'pista', 'chikki', 'nuts', 'nut'],
+    'gluten': ['wheat', 'atta', 'maida', 'semolina', 'suji', 'sooji', 'rava', 'bread', 'breads', 'breadcrumbs',
+               'crumbs', 'naan', 'roti', 'chapati', 'paratha', 'parantha', 'puri', 'puris', 'poori', 'papdi', 'bhature',
+               'bhatura', 'kulche', 'kulcha', 'pav', 'bun', 'buns', 'pasta', 'macaroni', 'spaghetti', 'lasagne',
+               'noodles', 'chowmein', 'vermicelli', 'semiya', 'seviyan', 'biscuit', 'cookies', 'cake', 'pastry',
+               'pizza', 'daliya', 'dalia', 'thepla', 'khakhra', 'mathri', 'samosa', 'kachori', 'sandwich', 'toast',
+               'barley', 'oats'],
+    'dairy': ['milk', 'doodh', 'curd', 'dahi', 'yogurt', 'raita', 'lassi', 'buttermilk', 'paneer', 'cheese', 'ghee',
+              'butter', 'cream', 'creamy', 'malai', 'khoa', 'khoya', 'kheer', 'makhani', 'custard', 'milkshake', 'mor'],
+    'egg': ['egg', 'eggs', 'anda', 'ande', 'omelette', 'omlet', 'nargisi', 'meringue', 'souffle', 'mayonnaise'],
+    'meat': ['chicken', 'murg', 'mutton', 'mangsho', 'lamb', 'meat', 'keema', 'beef', 'pork', 'yakhni'],
+    'fish': ['fish', 'machli', 'maach', 'maachh', 'macher', 'maacher', 'prawn', 'prawns', 'shrimp', 'chingri'],
+}
+# Multi-word terms that override their words' categories, e.g. coconut milk is not dairy, nor is a malai curry
+COMPOUND_INGREDIENTS = {
+    ('coconut', 'milk'): [], ('soya', 'milk'): [], ('malai', 'curry'): [], ('almond', 'milk'): ['nuts'],
+    ('peanut', 'butter'): ['nuts'], ('cottage', 'cheese'): ['dairy'], ('ice', 'cream'): ['dairy'],
+    ('gram', 'flour'): [], ('rice', 'flour'): [],
+}
+# Restrictions that exclude ingredient categories on top of FoodStore's food_group patterns
+RESTRICTION_INGREDIENTS = {'vegetarian': ['meat', 'fish'], 'vegan': ['meat', 'fish', 'egg', 'dairy']}
+# What users type for each category ("nut-free", "no eggs", "lactose free", ...)
+RESTRICTION_SYNONYMS = {'nut': 'nuts', 'peanut': 'nuts', 'peanuts': 'nuts', 'tree nuts': 'nuts', 'eggs': 'egg',
+                        'milk': 'dairy', 'lactose': 'dairy', 'wheat': 'gluten', 'veg': 'vegetarian',
+                        'seafood': 'fish', 'non-veg': 'meat'}
+
+CATEGORY_OF = {term: category for category, terms in INGREDIENTS.items() for term in terms}
+
+
+def tokenize(text):
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+
+def extract_ingredients(tokens):
+    """(ingredient terms, categories) found in a token list; compound terms win over their words."""
+    terms, categories = [], set()
+    i = 0
+    while i < len(tokens):
+        pair = tuple(tokens[i:i + 2])
+        if pair in COMPOUND_INGREDIENTS:
+            if ' '.join(pair) not in terms:
+                terms.append(' '.join(pair))
+            categories.update(COMPOUND_INGREDIENTS[pair])
+            i += 2
+            continue
+        category = CATEGORY_OF.get(tokens[i])
+        if category and tokens[i] not in terms:
+            terms.append(tokens[i])
+            categories.add(category)
+        i += 1
+    return terms, categories
+
+
+def parse_restrictions(text):
+    """Canonical restriction names from free text like "vegetarian, gluten-free, no nuts"."""
+    restrictions = []
+    for part in re.split(r'[,;/]|\band\b', text.lower()):
+        part = re.sub(r'^\s*(no|without)\s+|[\s-]*free\s*$', '', part.strip()).strip()
+        if part:
+            restrictions.append(RESTRICTION_SYNONYMS.get(part, part))
+    return restrictions
+
+
+class FoodIndex:
+    """Inverted index over dish names, recipe text and the ingredients extracted from them.
+
+    Built once at load: a token -> rows posting list (as sorted arrays) for
+    every word, a sorted token list for prefix search, a case-insensitive
+    name -> row map and, per ingredient category and restriction, a boolean
+    mask of the foods that contain it. The masks are what FoodStore ANDs in
+    for ingredient-level restrictions, so they cost no more than the
+    food_group filters.
+    """
+
+    def __init__(self, names, recipes):
+        self.names = np.asarray(names, dtype=object)
+        size = len(self.names)
+        self._rows = {}
+        name_postings, text_postings = {}, {}
+        self.ingredients = []
+        contains = {category: np.zeros(size, dtype=bool) for category in INGREDIENTS}
+        for row, (name, recipe) in enumerate(zip(self.names, recipes)):
+            # Duplicate names resolve to their first row, like the old DataFrame lookup
+            self._rows.setdefault(name.lower(), row)
+            name_tokens = tokenize(name)
+            tokens = name_tokens + tokenize(recipe)
+            terms, categories = extract_ingredients(tokens)
+            self.ingredients.append(terms)
+            for category in categories:
+                contains[category][row] = True
+            for token in set(name_tokens):
+                name_postings.setdefault(token, []).append(row)
+            for token in set(tokens):
+                text_postings.setdefault(token, []).append(row)
+
+        self._name_postings = {token: np.array(rows) for token, rows in name_postings.items()}
+        self._text_postings = {token: np.array(rows) for token, rows in text_postings.items()}
+        self._name_tokens = sorted(self._name_postings)
+        self._text_tokens = sorted(self._text_postings)
+        # Foods containing each category, plus each restriction's union of categories
+        self.exclusions = dict(contains)
+        for restriction, categories in RESTRICTION_INGREDIENTS.items():
+            self.exclusions[restriction] = np.logical_or.reduce([contains[category] for category in categories])
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, name):
+        """Row of a dish by name, case-insensitive, or None."""
+        return self._rows.get(name.strip().lower())
+
+    def _prefix_rows(self, prefix, postings, tokens):
+        start = bisect.bisect_left(tokens, prefix)
+        end = bisect.bisect_left(tokens, prefix + '\uffff')
+        if start == end:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate([postings[token] for token in tokens[start:end]]))
+
+    def search(self, query, limit=10, mask=None, names_only=False):
+        """Rows matching every word of query as a prefix, best first; mask limits the foods considered.
+
+        Foods whose name matches every word come before those matched through
+        their recipe or ingredients, and names starting with the query first.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        name_matches = text_matches = None
+        for word in words:
+            rows = self._prefix_rows(word, self._name_postings, self._name_tokens)
+            name_matches = rows if name_matches is None else np.intersect1d(name_matches, rows, assume_unique=True)
+            if not names_only:
+                rows = self._prefix_rows(word, self._text_postings, self._text_tokens)
+                text_matches = rows if text_matches is None else np.intersect1d(text_matches, rows, assume_unique=True)
+        if mask is not None:
+            name_matches = name_matches[mask[name_matches]]
+            text_matches = text_matches[mask[text_matches]] if text_matches is not None else None
+
+        query = ' '.join(words)
+        ranked = sorted(name_matches.tolist(), key=lambda row: (not self.names[row].lower().startswith(query),
+                                                                 self.names[row].lower()))
+        if text_matches is not None and len(ranked) < limit:
+            ranked += sorted(np.setdiff1d(text_matches, name_matches, assume_unique=True).tolist(),
+                             key=lambda row: self.names[row].lower())
+        # Drop later rows that repeat a dish name
+        seen, results = set(), []
+        for row in ranked:
+            if self.names[row].lower() not in seen:
+                seen.add(self.names[row].lower())
+                results.append(row)
+                if len(results) == limit:
+                    break
+        return results
+
+    def allergens(self, row):
+        """Ingredient categories present in a food."""
+        return [category for category in INGREDIENTS if self.exclusions[category][row]]
@@ -0,0 +1,130 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Nutrient order of FoodStore.nutrients and the dataset column behind each
+NUTRIENTS = ['calories', 'protein', 'carbs', 'fat']
+NUTRIENT_COLUMNS = ['calories', 'protein', 'carbohydrates', 'fat']
+CATEGORY_COLUMNS = ['region', 'food_group', 'meal_type']
+MEAL_NAMES = ["Breakfast", "Lunch", "Evening Snack", "Dinner"]
+# food_group patterns each dietary restriction excludes
+RESTRICTION_EXCLUDES = {'vegetarian': 'Non-veg|Meat', 'vegan': 'Non-veg|Meat|Dairy'}
+# Below this many foods the region and food_group filters are dropped rather than plan from too few
+MIN_CANDIDATES = 10
+
+
+class FoodStore:
+    """The food table as NumPy columns with precomputed filter masks.
+
+    Nutrients sit in one float matrix (NUTRIENTS order) and region,
+    food_group and meal_type as category codes. A filter is matched once
+    against the few distinct values of its column and expanded to a boolean
+    mask over all foods, so candidate sets are bitwise ANDs of cached masks
+    instead of regex scans over a copied DataFrame. Masks for every region,
+    restriction and meal slot are built up front; other patterns on first use.
+
+    exclusions maps a restriction (say 'nuts' or 'vegetarian') to the mask of
+    foods it rules out by ingredient, as FoodIndex.exclusions provides; it is
+    ANDed in alongside the food_group patterns.
+    """
+
+    def __init__(self, food_df, exclusions=None):
+        food_df = food_df.reset_index(drop=True)
+        self.size = len(food_df)
+        self.names = food_df['name'].to_numpy(dtype=object)
+        self.recipes = food_df['recipe'].to_numpy(dtype=object)
+        self.nutrients = food_df[NUTRIENT_COLUMNS].fillna(0).to_numpy(dtype=np.float64)
+        self.serving_size = food_df['serving_size'].fillna(100).to_numpy(dtype=np.float64)
+        self.all = np.ones(self.size, dtype=bool)
+        # column -> (code per food, distinct values); a missing column is one empty category
+        self._categories = {}
+        for column in CATEGORY_COLUMNS:
+            values = food_df[column].fillna('').astype(str) if column in food_df else pd.Series([''] * self.size)
+            self._categories[column] = pd.factorize(values)
+        self.food_groups = self._categories['food_group'][0]
+        self.meal_types = self._categories['meal_type'][0]
+        self.exclusions = exclusions or {}
+        self._masks = {}
+
+        for region in self._categories['region'][1]:
+            if region:
+                self.region_mask(region)
+        for restriction in set(RESTRICTION_EXCLUDES) | set(self.exclusions):
+            self.restriction_mask([restriction])
+        for meal_name in MEAL_NAMES:
+            self.meal_mask(meal_name)
+
+    def __len__(self):
+        return self.size
+
+    def categories(self, column):
+        """(code per food, distinct values) of a category column."""
+        return self._categories[column]
+
+    def match(self, column, pattern):
+        """Mask of foods whose column contains the regex pattern, case-insensitive like str.contains."""
+        key = (column, pattern)
+        mask = self._masks.get(key)
+        if mask is None:
+            codes, values = self._categories[column]
+            regex = re.compile(pattern, re.IGNORECASE)
+            hits = np.array([regex.search(value) is not None for value in values], dtype=bool)
+            mask = hits[codes] if len(hits) else np.zeros(self.size, dtype=bool)
+            mask.flags.writeable = False
+            self._masks[key] = mask
+        return mask
+
+    def region_mask(self, regional_preference):
+        """Foods from the preferred region plus the ones marked for all regions."""
+        if regional_preference.lower() == 'all':
+            return self.all
+        key = ('region_mask', regional_preference.lower())
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = self.match('region', regional_preference) | self.match('region', 'All')
+        return mask
+
+    def restriction_key(self, restrictions):
+        """The restrictions this store can filter on; unknown ones are ignored."""
+        return frozenset(restriction for restriction in restrictions
+                         if restriction in RESTRICTION_EXCLUDES or restriction in self.exclusions)
+
+    def restriction_mask(self, restrictions):
+        known = self.restriction_key(restrictions)
+        key = ('restriction_mask', known)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self.exclusion_mask(known)
+            for restriction in known:
+                if restriction in RESTRICTION_EXCLUDES:
+                    mask = mask & ~self.match('food_group', RESTRICTION_EXCLUDES[restriction])
+            self._masks[key] = mask
+        return mask
+
+    def exclusion_mask(self, restrictions):
+        """Foods free of the ingredients the restrictions exclude, from exclusions alone."""
+        known = frozenset(restriction for restriction in restrictions if restriction in self.exclusions)
+        key = ('exclusion_mask', known)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self.all
+            for restriction in known:
+                mask = mask & ~self.exclusions[restriction]
+            self._masks[key] = mask
+        return mask
+
+    def meal_mask(self, meal_name):
+        return self.match('meal_type', re.escape(meal_name))
+
+    def candidates(self, regional_preference, restrictions):
+        """Mask of foods passing the region and restriction filters.
+
+        If too few do, the region and food_group filters are dropped but the
+        ingredient exclusions are kept: someone asking for no nuts never gets
+        nuts because the filters left too few dishes.
+        """
+        mask = self.region_mask(regional_preference) & self.restriction_mask(restrictions)
+        if np.count_nonzero(mask) < MIN_CANDIDATES:
+            return self.exclusion_mask(restrictions)
+        return mask
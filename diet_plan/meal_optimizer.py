@@ -0,0 +1,116 @@
+import numpy as np
+
+from food_store import NUTRIENTS
+
+# Portion multiplier bounds relative to a food's serving size
+PORTION_BOUNDS = (0.5, 2.0)
+# An extra item has to cut the squared error by this factor to be kept
+ITEM_GAIN = 0.95
+# Weight of each nutrient's relative deviation, in NUTRIENTS order; calories count double
+NUTRIENT_WEIGHTS = np.array([2.0, 1.0, 1.0, 1.0])
+
+
+def meal_targets(macros, meals_per_day):
+    """Per-meal target vector in NUTRIENTS order from calculate_macros output."""
+    return np.array([macros[nutrient] for nutrient in NUTRIENTS], dtype=np.float64) / meals_per_day
+
+
+def refit_portions(rows, multipliers, target, bounds, sweeps=6):
+    """Bounded least squares over a few chosen items by coordinate descent on their Gram matrix."""
+    gram = (rows @ rows.T).tolist()
+    projections = (rows @ target).tolist()
+    multipliers = multipliers.tolist()
+    for _ in range(sweeps):
+        for i, row in enumerate(gram):
+            rest = sum(value * multiplier for value, multiplier in zip(row, multipliers)) - row[i] * multipliers[i]
+            multipliers[i] = min(max((projections[i] - rest) / max(row[i], 1e-12), bounds[0]), bounds[1])
+    multipliers = np.array(multipliers)
+    return multipliers, target - multipliers @ rows
+
+
+def optimize_meal(nutrients, candidates, target, groups=None, min_items=2, max_items=4, max_per_group=2,
+                  bounds=PORTION_BOUNDS, beam_width=4, explore=12, rng=None):
+    """Pick foods and portion multipliers whose totals best match target.
+
+    nutrients is the per-serving (n, 4) matrix in NUTRIENTS order, candidates the
+    food indices to choose from and groups an optional food group code per food;
+    at most max_per_group items share a group. Deviations are measured relative
+    to the target and weighted by NUTRIENT_WEIGHTS.
+
+    A beam search adds one item per step: every candidate's best bounded
+    multiplier against each beam state's residual is solved in closed form in a
+    single matrix product, the best beam_width children are kept and their
+    multipliers refitted jointly. With an rng the starting items are drawn from
+    the explore best single-item fits, so repeated calls vary the meal.
+    Returns (food indices, multipliers).
+    """
+    candidates = np.asarray(candidates)
+    if len(candidates) == 0:
+        return candidates, np.zeros(0)
+    # Work in relative, weighted units where the target is the vector of weights
+    scale = NUTRIENT_WEIGHTS / np.maximum(target, 1e-6)
+    rows = nutrients[candidates] * scale
+    goal = target * scale
+    norms = np.maximum((rows * rows).sum(axis=1), 1e-12)
+    candidate_groups = groups[candidates] if groups is not None else None
+    max_items = min(max_items, len(candidates))
+    min_items = min(min_items, max_items)
+
+    # Beam states: (positions into candidates, multipliers, residual, squared error)
+    beam = [((), np.zeros(0), goal, float(goal @ goal))]
+    best = None
+    for step in range(max_items):
+        residuals = np.array([state[2] for state in beam])
+        projections = rows @ residuals.T
+        multipliers = np.clip(projections / norms[:, None], bounds[0], bounds[1])
+        errors = (residuals * residuals).sum(axis=1) - 2 * multipliers * projections + multipliers ** 2 * norms[:, None]
+        for column, (positions, _, _, _) in enumerate(beam):
+            if positions:
+                errors[list(positions), column] = np.inf
+                if candidate_groups is not None:
+                    chosen_groups, counts = np.unique(candidate_groups[list(positions)], return_counts=True)
+                    full = chosen_groups[counts >= max_per_group]
+                    if len(full):
+                        errors[np.isin(candidate_groups, full), column] = np.inf
+
+        flat = errors.ravel()
+        finite = np.count_nonzero(np.isfinite(flat))
+        if finite == 0:
+            break
+        if step == 0 and rng is not None:
+            pool = np.argpartition(flat, min(explore, finite) - 1)[:min(explore, finite)]
+            order = rng.choice(pool, min(beam_width, len(pool)), replace=False)
+        else:
+            pool = np.argpartition(flat, min(beam_width * 2, finite) - 1)[:min(beam_width * 2, finite)]
+            order = pool[np.argsort(flat[pool])]
+
+        children = []
+        seen = set()
+        for position in order:
+            candidate, column = divmod(int(position), len(beam))
+            if not np.isfinite(flat[position]):
+                continue
+            positions, state_multipliers, _, _ = beam[column]
+            key = frozenset(positions + (candidate,))
+            if key in seen:
+                continue
+            seen.add(key)
+            positions = positions + (candidate,)
+            refit, residual = refit_portions(rows[list(positions)],
+                                             np.append(state_multipliers, multipliers[candidate, column]), goal, bounds)
+            children.append((positions, refit, residual, float(residual @ residual)))
+            if len(children) == beam_width:
+                break
+        if not children:
+            break
+        beam = sorted(children, key=lambda state: state[3])
+        if step + 1 >= min_items and (best is None or beam[0][3] < best[3] * ITEM_GAIN):
+            best = beam[0]
+
+    best = best or beam[0]
+    return candidates[list(best[0])], best[1]
+
+
+def meal_totals(nutrients, indices, multipliers):
+    """Nutrient totals of a meal, in NUTRIENTS order."""
+    return multipliers @ nutrients[indices]
@@ -0,0 +1,102 @@
+import numpy as np
+
+from food_store import RESTRICTION_EXCLUDES
+from meal_optimizer import NUTRIENT_WEIGHTS, PORTION_BOUNDS
+
+# Neighbours precomputed per food and partition; queries for more fall back to a scan
+NEIGHBOURS = 16
+# kcal per gram of each nutrient in NUTRIENTS order, to compare a swap's nutrients in energy terms
+ENERGY_PER_UNIT = np.array([1.0, 4.0, 4.0, 9.0])
+# Partitions are scored in blocks of this many foods to bound the similarity matrix
+BLOCK = 1024
+
+
+class SwapIndex:
+    """Nearest macro-equivalent substitutes for each food.
+
+    Foods are compared by their per-100 g (calories, protein, carbs, fat)
+    vectors, each nutrient scaled by its catalog mean and the vector
+    L2-normalised, so cosine similarity measures macro composition and the
+    portion can be rescaled afterwards. Neighbour lists are precomputed per
+    partition, one per meal type and diet restriction set, so a query is a
+    table lookup.
+    """
+
+    def __init__(self, store, neighbours=NEIGHBOURS):
+        self.store = store
+        self.neighbours = neighbours
+        per_100g = store.nutrients / np.maximum(store.serving_size, 1e-6)[:, None] * 100
+        scaled = per_100g / np.maximum(per_100g.mean(axis=0), 1e-6)
+        self.vectors = scaled / np.maximum(np.linalg.norm(scaled, axis=1, keepdims=True), 1e-12)
+        self._partitions = {}
+        profiles = [()] + [(restriction,) for restriction in RESTRICTION_EXCLUDES]
+        for meal_type in np.unique(store.meal_types):
+            for restrictions in profiles:
+                self._partition(meal_type, restrictions)
+
+    def _partition(self, meal_type, restrictions):
+        """(members, position of each food in members or -1, neighbour table, similarities) for one partition."""
+        known = self.store.restriction_key(restrictions)
+        key = (int(meal_type), known)
+        partition = self._partitions.get(key)
+        if partition is not None:
+            return partition
+        members = np.flatnonzero((self.store.meal_types == meal_type) & self.store.restriction_mask(known))
+        positions = np.full(len(self.store), -1)
+        positions[members] = np.arange(len(members))
+        count = min(self.neighbours, len(members) - 1)
+        table = np.empty((len(members), max(count, 0)), dtype=np.int64)
+        similarities = np.empty(table.shape)
+        vectors = self.vectors[members]
+        for start in range(0, len(members), BLOCK):
+            block = vectors[start:start + BLOCK] @ vectors.T
+            rows = np.arange(len(block))
+            block[rows, rows + start] = -np.inf
+            if count <= 0:
+                continue
+            top = np.argpartition(-block, count - 1, axis=1)[:, :count]
+            order = np.argsort(-np.take_along_axis(block, top, axis=1), axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            table[start:start + BLOCK] = members[top]
+            similarities[start:start + BLOCK] = np.take_along_axis(block, top, axis=1)
+        partition = self._partitions[key] = (members, positions, table, similarities)
+        return partition
+
+    def similar(self, index, restrictions=(), k=5, exclude=()):
+        """Up to k (food index, cosine similarity) pairs closest to a food of the same meal type."""
+        members, positions, table, similarities = self._partition(self.store.meal_types[index], restrictions)
+        exclude = set(exclude)
+        exclude.add(index)
+        position = positions[index]
+        if position >= 0:
+            found = [(int(food), float(similarity)) for food, similarity in zip(table[position], similarities[position])
+                     if food not in exclude][:k]
+            if len(found) == k:
+                return found
+        # The food is outside the partition (it breaks the restriction) or too many neighbours are excluded
+        scores = self.vectors[members] @ self.vectors[index]
+        order = np.argsort(-scores)
+        return [(int(members[i]), float(scores[i])) for i in order if members[i] not in exclude][:k]
+
+    def substitute(self, index, planned, restrictions=(), exclude=(), k=NEIGHBOURS):
+        """Closest substitute for a planned food and the multiplier that keeps the meal's totals.
+
+        planned is the removed item's nutrients in NUTRIENTS order. The
+        multiplier is the least-squares fit of the substitute to those
+        nutrients, counted in kcal and weighted like the optimizer. The most
+        similar food whose fit lies within PORTION_BOUNDS is taken, else the most
+        similar one clipped to them. Returns (index, multiplier), or None when
+        nothing can replace the food.
+        """
+        planned = np.asarray(planned, dtype=np.float64)
+        weights = NUTRIENT_WEIGHTS * ENERGY_PER_UNIT / max(planned[0], 1e-6)
+        target = planned * weights
+        fallback = None
+        for food, _ in self.similar(index, restrictions, k, exclude):
+            row = self.store.nutrients[food] * weights
+            multiplier = float(row @ target / max(row @ row, 1e-12))
+            if PORTION_BOUNDS[0] <= multiplier <= PORTION_BOUNDS[1]:
+                return food, multiplier
+            if fallback is None:
+                fallback = food, min(max(multiplier, PORTION_BOUNDS[0]), PORTION_BOUNDS[1])
+        return fallback
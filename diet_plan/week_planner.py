@@ -0,0 +1,295 @@
+import numpy as np
+
+from food_store import NUTRIENTS
+from meal_optimizer import ITEM_GAIN, NUTRIENT_WEIGHTS, PORTION_BOUNDS
+
+# A dish is planned at most once in any DISH_WINDOW consecutive days
+DISH_WINDOW = 3
+# A food group fills at most GROUP_LIMIT items of the same meal across any GROUP_WINDOW consecutive days
+GROUP_WINDOW = 3
+GROUP_LIMIT = 4
+# Weekly refit: weight of each meal's, each day's and the week's weighted deviations from their targets
+REFIT_WEIGHTS = (1.0, 0.5, 3.0)
+# On top of NUTRIENT_WEIGHTS for the week's totals: a protein shortfall the catalog cannot close at the
+# largest portions is made up in calories from carbohydrate rather than from fat
+WEEK_WEIGHTS = np.array([2.0, 1.0, 3.0, 1.0])
+
+
+def _window(days, width):
+    """(days, days) mask of day pairs closer than width."""
+    day = np.arange(days)
+    return np.abs(day[:, None] - day[None, :]) < width
+
+
+def _consecutive(days, width):
+    """(days, windows) mask with one column per run of width consecutive days."""
+    width = min(width, days)
+    day = np.arange(days)[:, None]
+    start = np.arange(days - width + 1)[None, :]
+    return ((day >= start) & (day < start + width)).astype(np.int32)
+
+
+def _refit_days(rows, multipliers, goals, bounds, sweeps=6):
+    """refit_portions for a batch of meals with the same item count: rows (meals, items, 4)."""
+    gram = np.einsum('aik,ajk->aij', rows, rows)
+    projections = np.einsum('aik,ak->ai', rows, goals)
+    diagonal = np.maximum(np.einsum('aii->ai', gram), 1e-12)
+    multipliers = multipliers.copy()
+    for _ in range(sweeps):
+        for i in range(rows.shape[1]):
+            rest = (gram[:, i] * multipliers).sum(axis=1) - gram[:, i, i] * multipliers[:, i]
+            multipliers[:, i] = np.minimum(np.maximum((projections[:, i] - rest) / diagonal[:, i], bounds[0]), bounds[1])
+    return multipliers, goals - np.einsum('ai,aik->ak', multipliers, rows)
+
+
+def _refit_week(store, plan, scale, goal, bounds, weights=REFIT_WEIGHTS, sweeps=8):
+    """Refit every portion of a plan in place by coordinate descent on their joint Gram matrix.
+
+    Foods are in plan_days' scaled units, where goal is one meal's target.
+    Each meal, each day and the whole plan are fitted to their targets at
+    once, so a miss one day can be made up by portions on another.
+    """
+    meal_weight, day_weight, week_weight = weights
+    meal_count = len(plan[0])
+    items = [(day, day * meal_count + slot, index, multiplier) for day, meals in enumerate(plan)
+             for slot, (indices, multipliers) in enumerate(meals) for index, multiplier in zip(indices, multipliers)]
+    if not items:
+        return
+    days, meals, indices, multipliers = (np.array(column) for column in zip(*items))
+    rows = store.nutrients[indices] * scale
+    week_rows = rows * WEEK_WEIGHTS
+    gram = (rows @ rows.T) * (meal_weight ** 2 * (meals[:, None] == meals[None, :])
+                              + day_weight ** 2 * (days[:, None] == days[None, :])) \
+        + week_weight ** 2 * (week_rows @ week_rows.T)
+    projections = (rows @ goal) * (meal_weight ** 2 + day_weight ** 2 * meal_count) \
+        + week_weight ** 2 * meal_count * len(plan) * (week_rows @ (goal * WEEK_WEIGHTS))
+    diagonal = np.maximum(np.diag(gram), 1e-12)
+    multipliers = multipliers.astype(np.float64)
+    for _ in range(sweeps):
+        for i in range(len(multipliers)):
+            rest = gram[i] @ multipliers - gram[i, i] * multipliers[i]
+            multipliers[i] = min(max((projections[i] - rest) / diagonal[i], bounds[0]), bounds[1])
+    offset = 0
+    for meals in plan:
+        for slot, (indices, _) in enumerate(meals):
+            meals[slot] = (indices, multipliers[offset:offset + len(indices)])
+            offset += len(indices)
+
+
+def _swap_week(store, plan, pools, scale, goal, dish_near, group_windows, group_limit, max_per_group, bounds,
+               weights=REFIT_WEIGHTS, sweeps=1):
+    """Swap single items of a plan in place for better allowed ones under _refit_week's objective.
+
+    pools are each meal's candidate foods. With an item taken out of its
+    meal, day and week, the best bounded portion of every food in the pool
+    against the three residuals is solved in closed form in one pass, and the
+    item is replaced when another food allowed by the dish and food group
+    windows does better. Portions move only to each item's own best fit, so
+    the plan is refitted with _refit_week afterwards.
+    """
+    meal_weight, day_weight, week_weight = weights
+    days, meal_count = len(plan), len(plan[0])
+    near = dish_near.astype(np.int32)
+    # Squared-error weight of each nutrient of the week's residual
+    week_nutrients = week_weight ** 2 * WEEK_WEIGHTS ** 2
+    # Residual of every meal in scaled units; a day's and the week's are their sums
+    meal_residuals = np.array([[goal - multipliers @ (store.nutrients[indices] * scale) for indices, multipliers in meals]
+                               for meals in plan])
+    day_residuals = meal_residuals.sum(axis=1)
+    week_residual = day_residuals.sum(axis=0)
+    # Plans of each food within the dish window of each day, and items per food group in each meal of each day
+    near_count = np.zeros((len(store), days), dtype=np.int32)
+    slot_groups = np.zeros((meal_count, int(store.food_groups.max()) + 1, days), dtype=np.int32)
+    for day, meals in enumerate(plan):
+        for slot, (indices, _) in enumerate(meals):
+            near_count[indices] += near[day]
+            np.add.at(slot_groups[slot, :, day], store.food_groups[indices], 1)
+    pool_rows = [store.nutrients[pool] * scale for pool in pools]
+    pool_norms = [(meal_weight ** 2 + day_weight ** 2) * (rows * rows).sum(axis=1) + (rows * rows) @ week_nutrients
+                  for rows in pool_rows]
+
+    for _ in range(sweeps):
+        swapped = False
+        for day, meals in enumerate(plan):
+            for slot, (indices, multipliers) in enumerate(meals):
+                pool, rows, norms = pools[slot], pool_rows[slot], pool_norms[slot]
+                indices, multipliers = indices.copy(), multipliers.copy()
+                for i, index in enumerate(indices):
+                    row = store.nutrients[index] * scale
+                    meal_residuals[day, slot] += multipliers[i] * row
+                    day_residuals[day] += multipliers[i] * row
+                    week_residual += multipliers[i] * row
+                    near_count[index] -= near[day]
+                    slot_groups[slot, store.food_groups[index], day] -= 1
+
+                    direction = meal_weight ** 2 * meal_residuals[day, slot] + day_weight ** 2 * day_residuals[day] \
+                        + week_nutrients * week_residual
+                    norm = (meal_weight ** 2 + day_weight ** 2) * (row @ row) + (row * row) @ week_nutrients
+                    fit = min(max(row @ direction / max(norm, 1e-12), bounds[0]), bounds[1])
+                    change = fit ** 2 * norm - 2 * fit * (row @ direction)
+                    projections = rows @ direction
+                    fits = np.clip(projections / np.maximum(norms, 1e-12), bounds[0], bounds[1])
+                    changes = fits ** 2 * norms - 2 * fits * projections
+                    window_full = ((slot_groups[slot] @ group_windows >= group_limit).astype(np.int32)
+                                   @ group_windows[day]) > 0
+                    group_full = (slot_groups[slot, :, day] >= max_per_group) | window_full
+                    changes[(near_count[pool, day] > 0) | group_full[store.food_groups[pool]]] = np.inf
+                    best = int(np.argmin(changes))
+                    if changes[best] < change - 1e-9:
+                        index, fit, swapped = pool[best], fits[best], True
+                        row = store.nutrients[index] * scale
+
+                    indices[i], multipliers[i] = index, fit
+                    meal_residuals[day, slot] -= fit * row
+                    day_residuals[day] -= fit * row
+                    week_residual -= fit * row
+                    near_count[index] += near[day]
+                    slot_groups[slot, store.food_groups[index], day] += 1
+                meals[slot] = (indices, multipliers)
+        if not swapped:
+            break
+
+
+def plan_days(store, filtered, meal_names, day_target, days=7, dish_window=DISH_WINDOW, group_window=GROUP_WINDOW,
+              group_limit=GROUP_LIMIT, min_items=2, max_items=4, max_per_group=2,
+              bounds=PORTION_BOUNDS, explore=8, swap_sweeps=1, rng=None):
+    """Plan the same meals for several days at once; returns plan[day][meal] = (food indices, multipliers).
+
+    Meals are planned slot by slot for every day together. Each greedy step
+    scores every candidate's best bounded portion against every day's residual
+    in one (foods, days) pass, then walks the days to take their best allowed
+    item, so a dish or food group taken by one day is blocked for its
+    neighbours before they choose. A slot's target is the rest of the day's
+    target spread over the remaining meals, averaged with the same share of the
+    rest of the week's. The windows are relaxed for a day whose candidates
+    they would exhaust.
+
+    The finished plan is refitted jointly against each meal's, each day's and
+    the week's targets, so what one day misses another makes up; single items
+    are then swapped for better allowed ones under the same objective and the
+    plan refitted again.
+    """
+    day_target = np.asarray(day_target, dtype=np.float64)
+    dish_near = _window(days, dish_window)
+    group_windows = _consecutive(days, group_window)
+    group_count = int(store.food_groups.max()) + 1 if len(store) else 0
+    dish_days = np.zeros((len(store), days), dtype=bool)
+    planned = np.zeros((days, len(NUTRIENTS)))
+    plan = [[None] * len(meal_names) for _ in range(days)]
+    # Relative, weighted units: every meal's nominal share of day_target becomes the weight vector
+    scale = NUTRIENT_WEIGHTS / np.maximum(day_target / len(meal_names), 1e-6)
+
+    pools = []
+    for slot, meal_name in enumerate(meal_names):
+        pool = filtered & store.meal_mask(meal_name)
+        if np.count_nonzero(pool) < 5:
+            pool = filtered
+        candidates = np.flatnonzero(pool)
+        pools.append(candidates)
+        groups = store.food_groups[candidates]
+        meals_left = len(meal_names) - slot
+        day_share = (day_target - planned) / meals_left
+        week_share = (day_target * days - planned.sum(axis=0)) / (days * meals_left)
+        targets = np.maximum((day_share + week_share) / 2, day_target / len(meal_names) * 0.1)
+
+        rows = store.nutrients[candidates] * scale
+        norms = np.maximum((rows * rows).sum(axis=1), 1e-12)[:, None]
+        goal = targets * scale
+        residuals = goal.copy()
+        dish_today = dish_days[candidates]
+        dish_blocked = (dish_today.astype(np.int32) @ dish_near.astype(np.int32)) > 0
+        # Items per food group in this meal of each day
+        slot_groups = np.zeros((group_count, days), dtype=np.int32)
+        chosen = [[] for _ in range(days)]
+        multipliers = [np.zeros(0) for _ in range(days)]
+        active = np.ones(days, dtype=bool)
+
+        for step in range(min(max_items, len(candidates))):
+            projections = rows @ residuals.T
+            fits = np.clip(projections / norms, bounds[0], bounds[1])
+            errors = (residuals * residuals).sum(axis=1) - 2 * fits * projections + fits ** 2 * norms
+            # Foods each day may not take: dishes in its window and full food groups
+            window_full = ((slot_groups @ group_windows >= group_limit).astype(np.int32) @ group_windows.T) > 0
+            group_full = (slot_groups >= max_per_group) | window_full
+            invalid = dish_blocked | group_full[groups]
+            picks = {}
+            for day in np.flatnonzero(active):
+                column = np.where(invalid[:, day], np.inf, errors[:, day])
+                valid = np.count_nonzero(column < np.inf)
+                if valid == 0:
+                    # The windows exhausted the pool: keep only the per-day rules for this day
+                    column = np.where(dish_today[:, day] | (slot_groups[:, day] >= max_per_group)[groups], np.inf,
+                                      errors[:, day])
+                    valid = np.count_nonzero(column < np.inf)
+                if valid == 0:
+                    active[day] = False
+                    continue
+                if step == 0 and rng is not None:
+                    best = rng.choice(np.argpartition(column, min(explore, valid) - 1)[:min(explore, valid)])
+                else:
+                    best = np.argmin(column)
+                picks[day] = int(best)
+                # Block the pick for this day and the neighbouring days still to come in the walk
+                dish_today[best, day] = True
+                dish_blocked[best, dish_near[day]] = True
+                invalid[best, dish_near[day]] = True
+                group = groups[best]
+                slot_groups[group, day] += 1
+                newly_full = ((slot_groups[group] @ group_windows >= group_limit).astype(np.int32) @ group_windows.T) > 0
+                newly_full[day] |= slot_groups[group, day] >= max_per_group
+                if newly_full.any():
+                    invalid[np.ix_(groups == group, newly_full)] = True
+            if not picks:
+                break
+
+            # Every day still planning this meal holds step + 1 items, so their portions refit as one batch
+            picked_days = np.array(list(picks))
+            positions = np.array([chosen[day] + [picks[day]] for day in picked_days])
+            start = np.array([np.append(multipliers[day], fits[picks[day], day]) for day in picked_days])
+            refit, residual = _refit_days(rows[positions], start, goal[picked_days], bounds)
+            error = (residual * residual).sum(axis=1)
+            previous = (residuals[picked_days] * residuals[picked_days]).sum(axis=1)
+            for i, day in enumerate(picked_days):
+                if step >= min_items and error[i] >= previous[i] * ITEM_GAIN:
+                    # Another item would not pay for itself: this day's meal is done. The dish stays blocked
+                    # for the neighbouring days, which only narrows their choice for this meal.
+                    active[day] = False
+                    slot_groups[groups[picks[day]], day] -= 1
+                    continue
+                chosen[day] = positions[i].tolist()
+                multipliers[day] = refit[i]
+                residuals[day] = residual[i]
+            if not active.any():
+                break
+
+        for day in range(days):
+            indices = candidates[chosen[day]]
+            dish_days[indices, day] = True
+            planned[day] += multipliers[day] @ store.nutrients[indices]
+            plan[day][slot] = (indices, multipliers[day])
+
+    # Greedy picks and per-meal portions lock in early misses: refit the week, swap items under the same
+    # objective and refit again
+    meal_goal = day_target / len(meal_names) * scale
+    _refit_week(store, plan, scale, meal_goal, bounds)
+    if swap_sweeps:
+        _swap_week(store, plan, pools, scale, meal_goal, dish_near, group_windows, group_limit, max_per_group, bounds,
+                   sweeps=swap_sweeps)
+        _refit_week(store, plan, scale, meal_goal, bounds)
+    return plan
+
+
+def grocery_list(store, items):
+    """Consolidate (food index, grams) pairs into (name, food group, total grams, times planned) rows.
+
+    Rows are per dish: foods sharing a name (case-insensitive) and food group
+    are one row, named as first planned. Rows are sorted by food group, then name.
+    """
+    _, group_names = store.categories('food_group')
+    rows = {}
+    for index, grams in items:
+        group = group_names[store.food_groups[index]]
+        key = (store.names[index].lower(), group)
+        name, _, total, times = rows.get(key, (store.names[index], group, 0.0, 0))
+        rows[key] = (name, group, total + float(grams), times + 1)
+    return sorted(rows.values(), key=lambda row: (row[1], row[0]))
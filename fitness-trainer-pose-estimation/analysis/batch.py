@@ -0,0 +1,217 @@
+import csv
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+from exercises.registry import EXERCISES
+from exercises.tracking import create_exercise, track_exercise, describe_exercise_data
+from feedback.hud import HudCompositor
+from pose_estimation.backends import DEFAULT_TIER
+from pose_estimation.filters import OneEuroFilterBank
+from pose_estimation.rate_control import AdaptiveRateController
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+SUMMARY_FIELDS = ['video', 'exercise_type', 'reps', 'frames', 'pose_frames', 'inferences', 'duration_s',
+                  'processing_s', 'processing_fps', 'timeline', 'annotated_video', 'error']
+
+# Each worker process builds its own estimator once and reuses it for every video it is handed
+_pose_estimator = None
+
+
+def collect_jobs(source, default_exercise=None):
+    """List (video_path, exercise_type) pairs from a directory or a manifest CSV.
+
+    A manifest has a `path` column and an optional `exercise_type` column;
+    relative paths are resolved against the manifest's directory. Rows without
+    an exercise type fall back to default_exercise.
+    """
+    jobs = []
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                jobs.append((os.path.join(source, name), default_exercise))
+    else:
+        base_dir = os.path.dirname(os.path.abspath(source))
+        with open(source, newline='') as f:
+            for row in csv.DictReader(f):
+                path = row['path'].strip()
+                if not os.path.isabs(path):
+                    path = os.path.join(base_dir, path)
+                jobs.append((path, (row.get('exercise_type') or '').strip() or default_exercise))
+
+    for path, exercise_type in jobs:
+        if exercise_type not in EXERCISES:
+            raise ValueError(f"No valid exercise type for {path}: {exercise_type!r}")
+    return jobs
+
+
+def init_worker(tier=DEFAULT_TIER, backend='mediapipe'):
+    """Process pool initializer: one PoseEstimator per worker, single threaded OpenCV."""
+    global _pose_estimator
+    # The pool already uses every core; OpenCV's own thread pool would only oversubscribe them
+    cv2.setNumThreads(1)
+    from pose_estimation.estimation import PoseEstimator
+    _pose_estimator = PoseEstimator(tier=tier, backend=backend)
+
+
+def timeline_row(frame_index, fps, exercise_type, exercise_data, pose_detected):
+    row = {'frame': frame_index, 'time_s': round(frame_index / fps, 3), 'pose_detected': pose_detected}
+    if exercise_data is not None:
+        data = describe_exercise_data(exercise_type, exercise_data)
+        data.pop('warnings', None)
+        row.update(data)
+    return row
+
+
+def analyze_video(video_path, exercise_type, out_dir, render=False, output_format='parquet', pose_estimator=None,
+                  inference_fps=None, smoothing=None):
+    """Score one recorded video and write its per-frame timeline.
+
+    Returns a summary dict with the rep count, frame counts and throughput.
+    Rendering the annotated video is optional since drawing and encoding cost
+    more than the tracking itself. With inference_fps the model runs at that
+    rate between stage thresholds (see AdaptiveRateController); smoothing is
+    a (min_cutoff, beta) pair for the One-Euro landmark filter. The estimator
+    is reset first, so no tracking from a worker's previous video carries over.
+    """
+    pose_estimator = pose_estimator or _pose_estimator
+    name = os.path.splitext(os.path.basename(video_path))[0]
+    summary = {'video': video_path, 'exercise_type': exercise_type, 'reps': 0, 'frames': 0,
+               'pose_frames': 0, 'inferences': 0, 'duration_s': 0.0, 'processing_s': 0.0, 'processing_fps': 0.0,
+               'timeline': None, 'annotated_video': None, 'error': None}
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        summary['error'] = 'could not open video'
+        return summary
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    pose_estimator.reset()
+    writer = None
+    if render:
+        summary['annotated_video'] = os.path.join(out_dir, f"{name}_annotated.avi")
+        size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        writer = cv2.VideoWriter(summary['annotated_video'], cv2.VideoWriter_fourcc(*'XVID'), fps, size)
+        hud = HudCompositor(exercise_type)
+
+    # Tracker, rate controller and filter state are per video too
+    exercise = create_exercise(exercise_type)
+    rate_controller = AdaptiveRateController(pose_estimator, inference_fps) if inference_fps else None
+    landmark_filter = OneEuroFilterBank(*smoothing) if smoothing else None
+    exercise_data = None
+    counter = 0
+    rows = []
+    start = time.perf_counter()
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if rate_controller is not None:
+                landmarks = rate_controller.estimate_landmarks(frame, exercise=exercise, timestamp=len(rows) / fps)
+            else:
+                landmarks = pose_estimator.estimate_landmarks(frame)
+            pose_detected = landmarks is not None
+            if pose_detected and landmark_filter is not None:
+                landmarks = landmark_filter(landmarks, len(rows) / fps)
+            if pose_detected:
+                summary['pose_frames'] += 1
+                if render:
+                    pose_estimator.draw_exercise_lines(frame, landmarks, exercise_type)
+                exercise_data, counter = track_exercise(exercise, exercise_type, landmarks, frame, render,
+                                                        timestamp=len(rows) / fps)
+                if render:
+                    hud.render(frame, exercise_data)
+            # Frames without a pose repeat the last tracker state so counters stay monotonic
+            rows.append(timeline_row(len(rows), fps, exercise_type, exercise_data, pose_detected))
+            if writer is not None:
+                writer.write(frame)
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
+
+    summary['processing_s'] = round(time.perf_counter() - start, 3)
+    summary['frames'] = len(rows)
+    summary['inferences'] = rate_controller.inferences if rate_controller is not None else len(rows)
+    summary['reps'] = counter
+    summary['duration_s'] = round(len(rows) / fps, 3)
+    if summary['processing_s'] > 0:
+        summary['processing_fps'] = round(len(rows) / summary['processing_s'], 1)
+    summary['timeline'] = write_table(rows, os.path.join(out_dir, f"{name}_timeline"), output_format)
+    return summary
+
+
+def write_table(rows, path_stem, output_format='parquet'):
+    """Write rows to Parquet when pandas and a Parquet engine are available, else CSV.
+
+    Returns the path actually written.
+    """
+    if output_format == 'parquet':
+        try:
+            import pandas as pd
+            pd.DataFrame(rows).to_parquet(path_stem + '.parquet', index=False)
+            return path_stem + '.parquet'
+        except ImportError:
+            logger.warning("pandas/pyarrow not available, writing CSV instead of Parquet")
+
+    fieldnames = []
+    for row in rows:
+        fieldnames.extend(key for key in row if key not in fieldnames)
+    with open(path_stem + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path_stem + '.csv'
+
+
+def _analyze_job(job):
+    video_path, exercise_type, out_dir, render, output_format, inference_fps, smoothing = job
+    try:
+        return analyze_video(video_path, exercise_type, out_dir, render, output_format,
+                             inference_fps=inference_fps, smoothing=smoothing)
+    except Exception as e:
+        logger.exception(f"Analysis failed for {video_path}")
+        return {'video': video_path, 'exercise_type': exercise_type, 'error': str(e)}
+
+
+def run_batch(jobs, out_dir, workers=None, render=False, output_format='parquet', inference_fps=None,
+              tier=DEFAULT_TIER, backend='mediapipe', smoothing=None):
+    """Analyze videos across a process pool and write summary.csv to out_dir.
+
+    Videos are the unit of work: each is processed start to finish by one
+    worker, so the pose model can track across consecutive frames and
+    throughput scales with the number of workers.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(tier, backend)) as pool:
+        futures = [pool.submit(_analyze_job, (path, exercise_type, out_dir, render, output_format, inference_fps, smoothing))
+                   for path, exercise_type in jobs]
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries.append(summary)
+            logger.info(f"{summary['video']}: {summary.get('reps')} reps, "
+                        f"{summary.get('processing_fps')} fps {summary.get('error') or ''}")
+
+    summaries.sort(key=lambda summary: summary['video'])
+    summary_path = os.path.join(out_dir, 'summary.csv')
+    with open(summary_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(summaries)
+
+    elapsed = time.perf_counter() - start
+    total_frames = sum(summary.get('frames') or 0 for summary in summaries)
+    logger.info(f"Analyzed {len(summaries)} videos ({total_frames} frames) in {elapsed:.1f}s "
+                f"with {workers} workers, {total_frames / max(elapsed, 1e-9):.1f} fps overall")
+    return summaries
@@ -5,6 +5,9 @@ import time
 import sys
 import traceback
 import logging
+import os
+import json
+from datetime import date
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG, 
@@ -15,12 +18,20 @@ logger = logging.getLogger(__name__)
 # Import attempt with error handling
 try:
     from pose_estimation.estimation import PoseEstimator
-    from exercises.squat import Squat
-    from exercises.hammer_curl import HammerCurl
-    from exercises.push_up import PushUp
     from feedback.information import get_exercise_info
-    from feedback.layout import layout_indicators
+    from feedback.hud import HudCompositor
     from utils.draw_text_with_background import draw_text_with_background
+    from streaming.frame_pipeline import FramePipeline
+    from streaming.profiles import STREAM_PROFILES, ProfileAdapter
+    from streaming.ingest import InferenceWorkerPool, decode_frame
+    from pose_estimation.landmarks import landmarks_payload
+    from pose_estimation.rate_control import AdaptiveRateController
+    from pose_estimation.backends import TIERS, DEFAULT_TIER, select_tier
+    from pose_estimation.filters import OneEuroFilterBank
+    from exercises import tracking as exercise_tracking
+    from exercises.tracking import describe_exercise_data
+    from exercises.registry import EXERCISES, overlay_connections
+    from sessions.registry import SessionRegistry
     logger.info("Successfully imported pose estimation modules")
 except ImportError as e:
     logger.error(f"Failed to import required modules: {e}")
@@ -48,6 +59,8 @@ except ImportError:
             return {}
         def get_user_stats(self, *args, **kwargs):
             return {'total_workouts': 0, 'total_exercises': 0, 'streak_days': 0}
+        def get_version(self, *args, **kwargs):
+            return 0, None
     
     workout_logger = DummyWorkoutLogger()
 
@@ -56,246 +69,499 @@ app = Flask(__name__)
 app.secret_key = 'fitness_trainer_secret_key'  # Required for sessions
 
 # Global variables
-camera = None
-output_frame = None
 lock = threading.Lock()
-exercise_running = False
-current_exercise = None
-current_exercise_data = None
-exercise_counter = 0
-exercise_goal = 0
-sets_completed = 0
-sets_goal = 0
-workout_start_time = None
-
-def initialize_camera():
-    global camera
-    if camera is None:
-        camera = cv2.VideoCapture(0)
-    return camera
 
-def release_camera():
-    global camera
+# Workout state lives in one WorkoutSession per Flask session
+SESSION_IDLE_TIMEOUT = float(os.environ.get('SESSION_IDLE_TIMEOUT', 30 * 60))
+
+# Cameras by index, and the session currently training in front of each one
+cameras = {}
+camera_events = {}
+camera_owners = {}
+camera_lock = threading.Lock()
+
+# Backoff between failed camera reads in seconds, doubled up to the maximum
+IDLE_BACKOFF_MIN = float(os.environ.get('FRAME_IDLE_BACKOFF_MIN', 0.01))
+IDLE_BACKOFF_MAX = float(os.environ.get('FRAME_IDLE_BACKOFF_MAX', 0.5))
+
+# One background frame producer per camera, shared by all /video_feed clients
+frame_producers = {}
+producers_lock = threading.Lock()
+
+# Camera inference rate in Hz between stage thresholds (0 infers every frame) and
+# the rate used near a threshold (0 means every frame)
+INFERENCE_TARGET_FPS = float(os.environ.get('INFERENCE_TARGET_FPS', 10))
+INFERENCE_BOOST_FPS = float(os.environ.get('INFERENCE_BOOST_FPS', 0)) or None
+
+# Infer only a crop around the person found in the previous frame
+POSE_ROI_TRACKING = os.environ.get('POSE_ROI_TRACKING', '1') != '0'
+
+# MJPEG stream profile for /video_feed clients that do not pick one with ?profile=;
+# 'auto' starts at STREAM_AUTO_START and adapts to how fast each client drains the stream
+STREAM_PROFILE = os.environ.get('STREAM_PROFILE', 'auto')
+STREAM_AUTO_START = os.environ.get('STREAM_AUTO_START', 'medium')
+
+# Pose engine and performance tier for this deployment; POSE_TIER=auto benchmarks
+# the tiers at startup and keeps the most accurate one reaching POSE_TARGET_FPS
+POSE_BACKEND = os.environ.get('POSE_BACKEND', 'mediapipe')
+POSE_TIER = os.environ.get('POSE_TIER', DEFAULT_TIER)
+POSE_TARGET_FPS = float(os.environ.get('POSE_TARGET_FPS', 15))
+
+def resolve_pose_tier():
+    if POSE_TIER != 'auto':
+        return POSE_TIER
+    try:
+        tier, measured = select_tier(POSE_TARGET_FPS, POSE_BACKEND)
+    except Exception as e:
+        logger.error(f"Pose tier self-benchmark failed, using {DEFAULT_TIER}: {e}")
+        return DEFAULT_TIER
+    logger.info(f"Selected pose tier {tier} for {POSE_TARGET_FPS:.0f} fps target "
+                f"({', '.join(f'{name}: {fps:.1f} fps' for name, fps in measured.items())})")
+    return tier
+
+deployment_pose_tier = resolve_pose_tier()
+
+def create_pose_estimator():
+    return PoseEstimator(roi_tracking=POSE_ROI_TRACKING, tier=deployment_pose_tier, backend=POSE_BACKEND)
+
+# One-Euro smoothing of landmarks before they reach the trackers; off unless a min cutoff is set,
+# since smoothing can cost reps (see benchmarks/bench_filters.py)
+LANDMARK_FILTER_MIN_CUTOFF = float(os.environ.get('LANDMARK_FILTER_MIN_CUTOFF', 0))
+LANDMARK_FILTER_BETA = float(os.environ.get('LANDMARK_FILTER_BETA', 5.0))
+
+def create_landmark_filter():
+    if not LANDMARK_FILTER_MIN_CUTOFF:
+        return None
+    return OneEuroFilterBank(LANDMARK_FILTER_MIN_CUTOFF, LANDMARK_FILTER_BETA)
+
+def exercise_choices():
+    """(key, name, image) for every registered exercise; image is None when static/images has none."""
+    choices = []
+    for key, spec in EXERCISES.items():
+        image = f'images/{key}.png'
+        has_image = os.path.exists(os.path.join(app.static_folder, image))
+        choices.append((key, spec['info']['name'], image if has_image else None))
+    return choices
+
+# Frames uploaded by browsers are inferred on a pool of threads, each client pinned to one of them
+INGEST_WORKERS = int(os.environ.get('INGEST_WORKERS', 0)) or None
+ingest_worker = InferenceWorkerPool(create_pose_estimator, workers=INGEST_WORKERS)
+INGEST_TIMEOUT = float(os.environ.get('INGEST_TIMEOUT', 2.0))
+
+def release_workout_session(workout):
+    """Stop an evicted session's exercise and free its camera and estimator."""
+    workout.exercise_running = False
+    # Ends any open /status_feed streams of this session
+    workout.status_events.close()
+    if camera_owners.get(workout.camera_index) is workout:
+        del camera_owners[workout.camera_index]
+    ingest_worker.release(workout.session_id)
+    logger.info(f"Evicted idle workout session {workout.session_id}")
+
+workout_sessions = SessionRegistry(idle_timeout=SESSION_IDLE_TIMEOUT, on_evict=release_workout_session)
+
+def get_workout_session():
+    """Resolve the caller's WorkoutSession from the Flask session cookie."""
+    session_id = session.get('workout_session_id')
+    if session_id is None:
+        session_id = session['workout_session_id'] = SessionRegistry.new_session_id()
+    return workout_sessions.get_or_create(session_id)
+
+def get_camera_ready(camera_index=0):
+    """Event set once the camera is open so the capture thread can block instead of spinning."""
+    with camera_lock:
+        return camera_events.setdefault(camera_index, threading.Event())
+
+def initialize_camera(camera_index=0):
+    camera_ready = get_camera_ready(camera_index)
+    with camera_lock:
+        if cameras.get(camera_index) is None:
+            cameras[camera_index] = cv2.VideoCapture(camera_index)
+    camera_ready.set()
+    return cameras[camera_index]
+
+def release_camera(camera_index=0):
+    get_camera_ready(camera_index).clear()
+    with camera_lock:
+        camera = cameras.pop(camera_index, None)
     if camera is not None:
         camera.release()
-        camera = None
 
-def generate_frames():
-    global output_frame, lock, exercise_running, current_exercise, current_exercise_data
-    global exercise_counter, exercise_goal, sets_completed, sets_goal
-    
-    pose_estimator = PoseEstimator()
+def read_camera_frame(camera_index=0):
+    """Read from a camera, reporting failure while it is not initialized."""
+    camera = cameras.get(camera_index)
+    if camera is None:
+        return False, None
+    return camera.read()
+
+def infer_exercise_frame(pose_estimator, camera_index, frame, rate_controller=None):
+    """Run pose estimation only while the camera's owner has an exercise running."""
+    workout = camera_owners.get(camera_index)
+    if workout is None or not (workout.exercise_running and workout.current_exercise):
+        return None
+    # The session training in front of the camera may ask for its own tier
+    pose_estimator.set_tier(workout.pose_tier or deployment_pose_tier)
+    if rate_controller is not None:
+        landmarks = rate_controller.estimate_landmarks(frame, exercise=workout.current_exercise)
+    else:
+        landmarks = pose_estimator.estimate_landmarks(frame)
+    if landmarks is not None and workout.landmark_filter is not None:
+        landmarks = workout.landmark_filter(landmarks, time.monotonic())
+    if workout.first_frame_latency is None and workout.exercise_started_at is not None:
+        workout.first_frame_latency = time.perf_counter() - workout.exercise_started_at
+        logger.info(f"First frame processed {workout.first_frame_latency * 1000:.1f} ms after start")
+    return landmarks
+
+def track_exercise(workout, landmarks, frame, draw=True):
+    """Advance the session's tracker and return its raw output tuple."""
+    exercise_data, workout.exercise_counter = exercise_tracking.track_exercise(
+        workout.current_exercise, workout.current_exercise_data['type'], landmarks, frame, draw)
+    return exercise_data
+
+def render_exercise_frame(pose_estimator, camera_index, frame, landmarks, draw=True):
+    """Track the camera owner's exercise for the newest (33, 4) landmark array.
     
-    while True:
-        if camera is None:
-            continue
+    Draws the overlay only when draw is true and returns (frame, message), where
+    message is the serialized landmark/tracker update for landmark subscribers.
+    """
+    workout = camera_owners.get(camera_index)
+    message = None
+
+    # Only process frames if an exercise is running
+    if workout is not None and workout.exercise_running and workout.current_exercise:
+        exercise_type = workout.current_exercise_data['type']
+        update = {'exercise_type': exercise_type, 'landmarks': None}
+        if landmarks is not None:
+            if draw:
+                pose_estimator.draw_exercise_lines(frame, landmarks, exercise_type)
+
+            # The same result may be rendered on several captured frames; the
+            # trackers only count on stage transitions, so this is idempotent.
+            exercise_data = track_exercise(workout, landmarks, frame, draw)
+            update.update(describe_exercise_data(exercise_type, exercise_data))
+            update['landmarks'] = landmarks_payload(landmarks)
             
-        success, frame = camera.read()
-        if not success:
-            continue
-        
-        # Only process frames if an exercise is running
-        if exercise_running and current_exercise:
-            # Process with pose estimation
-            results = pose_estimator.estimate_pose(frame, current_exercise_data['type'])
+            if draw:
+                # Static HUD parts come from the session's cached layer, only values are drawn per frame
+                exercise_info = get_exercise_info(exercise_type)
+                workout.hud.render(frame, exercise_data, header=(
+                    f"Exercise: {exercise_info.get('name', 'N/A')}",
+                    f"Reps Goal: {workout.exercise_goal}",
+                    f"Sets Goal: {workout.sets_goal}",
+                    f"Current Set: {workout.sets_completed + 1}"))
             
-            if results.pose_landmarks:
-                # Track exercise based on type
-                if current_exercise_data['type'] == "squat":
-                    counter, angle, stage = current_exercise.track_squat(results.pose_landmarks.landmark, frame)
-                    layout_indicators(frame, current_exercise_data['type'], (counter, angle, stage))
-                    exercise_counter = counter
-                    
-                elif current_exercise_data['type'] == "push_up":
-                    counter, angle, stage = current_exercise.track_push_up(results.pose_landmarks.landmark, frame)
-                    layout_indicators(frame, current_exercise_data['type'], (counter, angle, stage))
-                    exercise_counter = counter
-                    
-                elif current_exercise_data['type'] == "hammer_curl":
-                    (counter_right, angle_right, counter_left, angle_left,
-                     warning_message_right, warning_message_left, progress_right, 
-                     progress_left, stage_right, stage_left) = current_exercise.track_hammer_curl(
-                        results.pose_landmarks.landmark, frame)
-                    layout_indicators(frame, current_exercise_data['type'], 
-                                     (counter_right, angle_right, counter_left, angle_left,
-                                      warning_message_right, warning_message_left, 
-                                      progress_right, progress_left, stage_right, stage_left))
-                    exercise_counter = max(counter_right, counter_left)
-                
-                # Display exercise information
-                exercise_info = get_exercise_info(current_exercise_data['type'])
-                draw_text_with_background(frame, f"Exercise: {exercise_info.get('name', 'N/A')}", (40, 50),
-                                         cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255), (118, 29, 14), 1)
-                draw_text_with_background(frame, f"Reps Goal: {exercise_goal}", (40, 80),
-                                         cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255), (118, 29, 14), 1)
-                draw_text_with_background(frame, f"Sets Goal: {sets_goal}", (40, 110),
-                                         cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255), (118, 29, 14), 1)
-                draw_text_with_background(frame, f"Current Set: {sets_completed + 1}", (40, 140),
-                                         cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255), (118, 29, 14), 1)
-                
-                # Check if rep goal is reached for current set
-                if exercise_counter >= exercise_goal:
-                    sets_completed += 1
-                    exercise_counter = 0
-                    # Reset exercise counter in the appropriate exercise object
-                    if current_exercise_data['type'] == "squat" or current_exercise_data['type'] == "push_up":
-                        current_exercise.counter = 0
-                    elif current_exercise_data['type'] == "hammer_curl":
-                        current_exercise.counter_right = 0
-                        current_exercise.counter_left = 0
-                    
-                    # Check if all sets are completed
-                    if sets_completed >= sets_goal:
-                        exercise_running = False
-                        draw_text_with_background(frame, "WORKOUT COMPLETE!", (frame.shape[1]//2 - 150, frame.shape[0]//2),
-                                                cv2.FONT_HERSHEY_DUPLEX, 1.2, (255, 255, 255), (0, 200, 0), 2)
-                    else:
-                        draw_text_with_background(frame, f"SET {sets_completed} COMPLETE! Rest for 30 sec", 
-                                                (frame.shape[1]//2 - 200, frame.shape[0]//2),
-                                                cv2.FONT_HERSHEY_DUPLEX, 1.0, (255, 255, 255), (0, 0, 200), 2)
-                        # We could add rest timer functionality here
-        else:
-            # Display welcome message if no exercise is running
-            cv2.putText(frame, "Select an exercise to begin", (frame.shape[1]//2 - 150, frame.shape[0]//2),
-                       cv2.FONT_HERSHEY_DUPLEX, 0.8, (255, 255, 255), 1)
-                
-        # Encode the frame in JPEG format
+            # Check if rep goal is reached for current set
+            set_event = workout.check_set_complete()
+            workout.record_progress(exercise_data, set_event)
+            update['event'] = set_event
+            if draw and set_event == 'workout_complete':
+                draw_text_with_background(frame, "WORKOUT COMPLETE!", (frame.shape[1]//2 - 150, frame.shape[0]//2),
+                                        cv2.FONT_HERSHEY_DUPLEX, 1.2, (255, 255, 255), (0, 200, 0), 2)
+            elif draw and set_event == 'set_complete':
+                draw_text_with_background(frame, f"SET {workout.sets_completed} COMPLETE! Rest for 30 sec", 
+                                        (frame.shape[1]//2 - 200, frame.shape[0]//2),
+                                        cv2.FONT_HERSHEY_DUPLEX, 1.0, (255, 255, 255), (0, 0, 200), 2)
+                # We could add rest timer functionality here
+        update.update(workout.status())
+        message = json.dumps(update, separators=(',', ':'))
+    elif draw:
+        # Display welcome message if no exercise is running
+        cv2.putText(frame, "Select an exercise to begin", (frame.shape[1]//2 - 150, frame.shape[0]//2),
+                   cv2.FONT_HERSHEY_DUPLEX, 0.8, (255, 255, 255), 1)
+
+    if workout is not None and draw:
         with lock:
-            output_frame = frame.copy()
-            
-        # Yield the frame in byte format
-        ret, buffer = cv2.imencode('.jpg', output_frame)
-        frame = buffer.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+            workout.output_frame = frame
+    return frame, message
+
+def get_frame_producer(camera_index=0):
+    """Return the shared background pipeline for a camera, starting it on first use."""
+    with producers_lock:
+        producer = frame_producers.get(camera_index)
+        if producer is None or not producer.running:
+            pose_estimator = create_pose_estimator()
+            rate_controller = None
+            if INFERENCE_TARGET_FPS:
+                rate_controller = AdaptiveRateController(pose_estimator, INFERENCE_TARGET_FPS, INFERENCE_BOOST_FPS)
+            producer = FramePipeline(
+                read_frame=lambda: read_camera_frame(camera_index),
+                infer=lambda frame: infer_exercise_frame(pose_estimator, camera_index, frame, rate_controller),
+                render=lambda frame, landmarks, draw: render_exercise_frame(pose_estimator, camera_index, frame,
+                                                                            landmarks, draw),
+                source_ready=get_camera_ready(camera_index),
+                idle_backoff=IDLE_BACKOFF_MIN,
+                max_idle_backoff=IDLE_BACKOFF_MAX
+            ).start()
+            frame_producers[camera_index] = producer
+            logger.info(f"Started frame producer for camera {camera_index}")
+        return producer
+
+def generate_frames(camera_index=0, profile='auto'):
+    # Every client reads from the same producer, so extra viewers add no inference cost,
+    # and clients on the same profile share one encode per frame
+    producer = get_frame_producer(camera_index)
+    adapter = ProfileAdapter(STREAM_AUTO_START) if profile == 'auto' else None
+    if adapter is not None:
+        profile = adapter.profile
+    subscription = producer.subscribe(profile)
+    try:
+        while not subscription.closed and producer.running:
+            skipped = subscription.skipped
+            frame = subscription.next(timeout=1.0)
+            if frame is None:
+                continue
+            # Yield the frame in byte format
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+            if adapter is not None and adapter.record(subscription.skipped - skipped) != profile:
+                logger.info(f"Stream for camera {camera_index} switched from {profile} to {adapter.profile}")
+                profile = adapter.profile
+                subscription.close()
+                subscription = producer.subscribe(profile)
+    finally:
+        subscription.close()
 
 @app.route('/')
 def index():
     """Home page with exercise selection"""
     logger.info("Rendering index page")
     try:
-        return render_template('index.html')
+        # ?source=browser captures frames in the browser and uploads them for tracking
+        return render_template('index.html', frame_source=request.args.get('source', 'camera'),
+                               stream_profile=request.args.get('profile'),
+                               exercises=exercise_choices(), exercise_connections=overlay_connections())
     except Exception as e:
         logger.error(f"Error rendering index: {e}")
         return f"Error rendering template: {str(e)}", 500
 
+def dashboard_summary():
+    """Everything the dashboard shows, read from the workout logger's rollups."""
+    recent_workouts = workout_logger.get_recent_workouts(5)
+    weekly_stats = workout_logger.get_weekly_stats()
+    exercise_distribution = workout_logger.get_exercise_distribution()
+    user_stats = workout_logger.get_user_stats()
+    
+    # Format workouts for display
+    formatted_workouts = []
+    for workout in recent_workouts:
+        formatted_workouts.append({
+            'date': workout['date'],
+            'exercise': workout['exercise_type'].replace('_', ' ').title(),
+            'sets': workout['sets'],
+            'reps': workout['reps'],
+            'duration': f"{workout['duration_seconds'] // 60}:{workout['duration_seconds'] % 60:02d}"
+        })
+    
+    exercise_names = {key: spec['info']['name'] for key, spec in EXERCISES.items()}
+    return {
+        'success': True,
+        'recent_workouts': formatted_workouts,
+        'weekly_workouts': sum(day['workout_count'] for day in weekly_stats.values()),
+        'total_workouts': user_stats['total_workouts'],
+        'total_exercises': user_stats['total_exercises'],
+        'streak_days': user_stats['streak_days'],
+        'weekly_activity': {
+            'labels': [date.fromisoformat(day).strftime('%a') for day in weekly_stats],
+            'values': [round(day.get('duration_seconds', 0) / 60, 1) for day in weekly_stats.values()]
+        },
+        'exercise_distribution': {
+            'labels': [exercise_names.get(key, key) for key in exercise_distribution],
+            'values': list(exercise_distribution.values())
+        }
+    }
+
 @app.route('/dashboard')
 def dashboard():
     """Dashboard page with workout statistics"""
     logger.info("Rendering dashboard page")
     try:
-        # Get data for the dashboard
-        recent_workouts = workout_logger.get_recent_workouts(5)
-        weekly_stats = workout_logger.get_weekly_stats()
-        exercise_distribution = workout_logger.get_exercise_distribution()
-        user_stats = workout_logger.get_user_stats()
-        
-        # Format workouts for display
-        formatted_workouts = []
-        for workout in recent_workouts:
-            formatted_workouts.append({
-                'date': workout['date'],
-                'exercise': workout['exercise_type'].replace('_', ' ').title(),
-                'sets': workout['sets'],
-                'reps': workout['reps'],
-                'duration': f"{workout['duration_seconds'] // 60}:{workout['duration_seconds'] % 60:02d}"
-            })
-        
-        # Calculate total workouts this week
-        weekly_workout_count = sum(day['workout_count'] for day in weekly_stats.values())
-        
-        return render_template('dashboard.html',
-                              recent_workouts=formatted_workouts,
-                              weekly_workouts=weekly_workout_count,
-                              total_workouts=user_stats['total_workouts'],
-                              total_exercises=user_stats['total_exercises'],
-                              streak_days=user_stats['streak_days'])
+        return render_template('dashboard.html', **dashboard_summary())
     except Exception as e:
         logger.error(f"Error in dashboard: {e}")
         traceback.print_exc()
         return f"Error loading dashboard: {str(e)}", 500
 
+# (etag, JSON body) of the last /dashboard_data response
+dashboard_cache = (None, None)
+
+@app.route('/dashboard_data')
+def dashboard_data():
+    """Dashboard statistics as JSON, revalidated with ETag/Last-Modified"""
+    global dashboard_cache
+    # The rollup version changes with every logged workout, the date moves the weekly window and streak
+    version, updated_at = workout_logger.get_version()
+    etag = f"{version}-{date.today().isoformat()}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        cached_etag, body = dashboard_cache
+        if cached_etag != etag:
+            body = json.dumps(dashboard_summary(), separators=(',', ':'))
+            dashboard_cache = (etag, body)
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    if updated_at is not None:
+        response.last_modified = updated_at
+    # Let browsers keep the response but revalidate it on every load
+    response.cache_control.no_cache = True
+    return response
+
 @app.route('/video_feed')
 def video_feed():
     """Video streaming route"""
-    return Response(generate_frames(),
+    camera_index = request.args.get('camera', get_workout_session().camera_index, type=int)
+    profile = request.args.get('profile', STREAM_PROFILE)
+    if profile != 'auto' and profile not in STREAM_PROFILES:
+        return jsonify({'success': False, 'error': 'Invalid stream profile'}), 400
+    return Response(generate_frames(camera_index, profile),
                    mimetype='multipart/x-mixed-replace; boundary=frame')
 
+@app.route('/landmark_feed')
+def landmark_feed():
+    """Server-Sent Events stream of landmarks and tracker state, without video"""
+    camera_index = request.args.get('camera', get_workout_session().camera_index, type=int)
+    
+    def generate():
+        for message in get_frame_producer(camera_index).subscribe_landmarks():
+            yield f"data: {message}\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/start_exercise', methods=['POST'])
 def start_exercise():
     """Start a new exercise based on user selection"""
-    global exercise_running, current_exercise, current_exercise_data
-    global exercise_counter, exercise_goal, sets_completed, sets_goal
-    global workout_start_time
+    workout = get_workout_session()
     
     data = request.json
     exercise_type = data.get('exercise_type')
     sets_goal = int(data.get('sets', 3))
     exercise_goal = int(data.get('reps', 10))
+    camera_index = int(data.get('camera', workout.camera_index))
+    frame_source = data.get('source', 'camera')
+    pose_tier = data.get('tier') or None
+    if pose_tier is not None and pose_tier not in TIERS:
+        return jsonify({'success': False, 'error': 'Invalid pose tier'})
     
-    # Initialize camera if not already done
-    initialize_camera()
-    
-    # Reset counters
-    exercise_counter = 0
-    sets_completed = 0
-    workout_start_time = time.time()
-    
-    # Initialize the appropriate exercise class
-    if exercise_type == "squat":
-        current_exercise = Squat()
-    elif exercise_type == "push_up":
-        current_exercise = PushUp()
-    elif exercise_type == "hammer_curl":
-        current_exercise = HammerCurl()
-    else:
+    # Build the exercise's engine from its registry spec
+    current_exercise = exercise_tracking.create_exercise(exercise_type)
+    if current_exercise is None:
         return jsonify({'success': False, 'error': 'Invalid exercise type'})
     
-    # Store exercise data
-    current_exercise_data = {
-        'type': exercise_type,
-        'sets': sets_goal,
-        'reps': exercise_goal
-    }
+    # Release the previous station if this session moves to another camera or the browser
+    if camera_owners.get(workout.camera_index) is workout and (
+            frame_source == 'browser' or workout.camera_index != camera_index):
+        del camera_owners[workout.camera_index]
     
-    # Start the exercise
-    exercise_running = True
+    # Reset counters and start the exercise for this session
+    workout.frame_source = frame_source
+    workout.camera_index = camera_index
+    workout.pose_tier = pose_tier
+    workout.landmark_filter = create_landmark_filter()
+    workout.hud = HudCompositor(exercise_type)
+    workout.start(exercise_type, current_exercise, sets_goal, exercise_goal)
+    
+    if frame_source == 'browser':
+        # Frames arrive through /ingest_frame, no server camera needed
+        ingest_worker.start()
+    else:
+        # Initialize camera if not already done
+        initialize_camera(camera_index)
+        camera_owners[camera_index] = workout
+        
+        # Make sure the producer is up even before the video feed is opened
+        get_frame_producer(camera_index)
     
     return jsonify({'success': True})
 
 @app.route('/stop_exercise', methods=['POST'])
 def stop_exercise():
     """Stop the current exercise and log the workout"""
-    global exercise_running, current_exercise_data, workout_start_time
-    global exercise_counter, exercise_goal, sets_completed, sets_goal
+    workout = get_workout_session()
     
-    if exercise_running and current_exercise_data:
+    if workout.exercise_running and workout.current_exercise_data:
         # Calculate duration
-        duration = int(time.time() - workout_start_time) if workout_start_time else 0
+        duration = int(time.time() - workout.workout_start_time) if workout.workout_start_time else 0
         
         # Log the workout
         workout_logger.log_workout(
-            exercise_type=current_exercise_data['type'],
-            sets=sets_completed + (1 if exercise_counter > 0 else 0),  # Include partial set
-            reps=exercise_goal,
+            exercise_type=workout.current_exercise_data['type'],
+            sets=workout.sets_completed + (1 if workout.exercise_counter > 0 else 0),  # Include partial set
+            reps=workout.exercise_goal,
             duration_seconds=duration
         )
     
-    exercise_running = False
+    workout.stop()
     return jsonify({'success': True})
 
+@app.route('/ingest_frame', methods=['POST'])
+def ingest_frame():
+    """Run pose tracking on a frame captured in the browser and return compact JSON"""
+    workout = get_workout_session()
+    if not (workout.exercise_running and workout.current_exercise):
+        return jsonify({'success': True, 'exercise_running': False})
+    
+    frame, is_rgb = decode_frame(request.get_data(cache=False), request.mimetype,
+                                 request.headers.get('X-Frame-Width', type=int),
+                                 request.headers.get('X-Frame-Height', type=int))
+    if frame is None:
+        return jsonify({'success': False, 'error': 'Could not decode frame'}), 400
+    
+    try:
+        landmarks = ingest_worker.start().submit(workout.session_id, frame, is_rgb,
+                                                     workout.pose_tier or deployment_pose_tier).result(timeout=INGEST_TIMEOUT)
+    except Exception as e:
+        logger.error(f"Ingest inference failed: {e}")
+        return jsonify({'success': False, 'error': 'Inference failed'}), 503
+    
+    if landmarks is not None and workout.landmark_filter is not None:
+        landmarks = workout.landmark_filter(landmarks, time.monotonic())
+    
+    if workout.first_frame_latency is None:
+        workout.first_frame_latency = time.perf_counter() - workout.exercise_started_at
+    
+    response = {'success': True, 'exercise_running': True, 'landmarks': None}
+    if landmarks is not None:
+        exercise_type = workout.current_exercise_data['type']
+        exercise_data = track_exercise(workout, landmarks, frame, draw=False)
+        response.update(describe_exercise_data(exercise_type, exercise_data))
+        response['landmarks'] = landmarks_payload(landmarks)
+        response['event'] = workout.check_set_complete()
+        workout.record_progress(exercise_data, response['event'])
+    response.update(workout.status())
+    return jsonify(response)
+
+# Seconds between SSE keepalive comments on an idle /status_feed
+STATUS_KEEPALIVE = float(os.environ.get('STATUS_KEEPALIVE', 15))
+
+@app.route('/status_feed')
+def status_feed():
+    """Server-Sent Events stream of status deltas: started, rep, stage, set_complete, workout_complete, stopped"""
+    workout = get_workout_session()
+    subscription = workout.status_events.subscribe()
+    snapshot = json.dumps(dict(workout.status(), event='status'), separators=(',', ':'))
+    
+    def generate():
+        try:
+            yield f"data: {snapshot}\n\n"
+            while not subscription.closed and not workout.status_events.closed:
+                message = subscription.next(timeout=STATUS_KEEPALIVE)
+                if message is None:
+                    # An open status stream counts as activity, and the comment detects closed tabs
+                    workout.touch()
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            subscription.close()
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/get_status', methods=['GET'])
 def get_status():
     """Return current exercise status"""
-    global exercise_counter, sets_completed, exercise_goal, sets_goal, exercise_running
-    
-    return jsonify({
-        'exercise_running': exercise_running,
-        'current_reps': exercise_counter,
-        'current_set': sets_completed + 1 if exercise_running else 0,
-        'total_sets': sets_goal,
-        'rep_goal': exercise_goal
-    })
+    return jsonify(get_workout_session().status())
 
 @app.route('/profile')
 def profile():
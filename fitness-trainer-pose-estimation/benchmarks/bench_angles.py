@@ -0,0 +1,53 @@
+"""Microbenchmark: scalar calculate_angle vs the vectorized angle engine.
+
+Run from the project root:
+    python -m benchmarks.bench_angles
+"""
+import timeit
+
+import numpy as np
+
+from pose_estimation.angle_calculation import calculate_angle, calculate_angles, joint_angles
+
+# Hammer curl evaluates the most joints per frame
+TRIPLETS = np.array([[11, 13, 15], [12, 14, 16], [13, 11, 23], [14, 12, 24]])
+FRAME_SHAPE = (720, 1280)
+
+
+def scalar_frame(pixels):
+    return [calculate_angle(pixels[a], pixels[b], pixels[c]) for a, b, c in TRIPLETS.tolist()]
+
+
+def scalar_sequence(sequence_pixels):
+    return [scalar_frame(pixels) for pixels in sequence_pixels]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    landmarks = rng.random((33, 4), dtype=np.float32)
+    pixels = (landmarks[:, :2] * (FRAME_SHAPE[1], FRAME_SHAPE[0])).astype(np.int32)
+    pixel_lists = pixels.tolist()
+
+    sequence = rng.random((3000, 33, 4), dtype=np.float32)
+    sequence_pixels = (sequence[..., :2] * (FRAME_SHAPE[1], FRAME_SHAPE[0])).astype(np.int32)
+    sequence_lists = sequence_pixels.tolist()
+
+    # Both paths must agree before timing them
+    assert np.allclose(scalar_frame(pixel_lists), calculate_angles(pixels[TRIPLETS]))
+    assert np.allclose(scalar_sequence(sequence_lists), calculate_angles(sequence_pixels[:, TRIPLETS]))
+
+    cases = [
+        ("per frame, scalar (4 joints)", lambda: scalar_frame(pixel_lists), 20000),
+        ("per frame, vectorized (4 joints)", lambda: calculate_angles(pixels[TRIPLETS]), 20000),
+        ("per frame, vectorized 3-D", lambda: joint_angles(landmarks, TRIPLETS, FRAME_SHAPE, use_z=True), 20000),
+        ("3000 frames, scalar", lambda: scalar_sequence(sequence_lists), 5),
+        ("3000 frames, vectorized", lambda: calculate_angles(sequence_pixels[:, TRIPLETS]), 5),
+        ("3000 frames, vectorized 3-D", lambda: joint_angles(sequence, TRIPLETS, FRAME_SHAPE, use_z=True), 5),
+    ]
+    for name, func, number in cases:
+        seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+        print(f"{name:<36} {seconds * 1e6:10.2f} us/call")
+
+
+if __name__ == '__main__':
+    main()
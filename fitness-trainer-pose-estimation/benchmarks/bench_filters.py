@@ -0,0 +1,59 @@
+"""Rep counting on jittery landmarks, raw vs the One-Euro filter bank.
+
+Replays synthetic squat recordings with increasing landmark jitter (a stand-in
+for cheaper model tiers) and compares the rep count and the number of stage
+changes against the jitter-free recording. Also times the filter per frame.
+
+Run from the project root:
+    python -m benchmarks.bench_filters
+"""
+import timeit
+
+import numpy as np
+
+from benchmarks.bench_rate_control import FPS, FRAME_SHAPE, knee_angle_track, landmark_sequence
+from exercises.squat import Squat
+from pose_estimation.filters import OneEuroFilterBank
+
+
+def replay(sequence, landmark_filter=None):
+    """Rep count and number of stage changes for a landmark sequence."""
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    squat = Squat()
+    counter, stage_changes, previous_stage = 0, 0, None
+    for index, landmarks in enumerate(sequence):
+        if landmark_filter is not None:
+            landmarks = landmark_filter(landmarks, index / FPS)
+        counter, _, stage = squat.track_squat(landmarks, frame, draw=False)
+        if stage != previous_stage:
+            stage_changes += 1
+            previous_stage = stage
+    return counter, stage_changes
+
+
+def main():
+    for seed in range(3):
+        angles = knee_angle_track(np.random.default_rng(seed))
+        truth = replay(landmark_sequence(angles, np.random.default_rng(seed), noise=0.0))
+        print(f"seed {seed}  no jitter          reps {truth[0]:3d}  stage changes {truth[1]:4d}")
+        for noise in (0.002, 0.004, 0.008):
+            sequence = landmark_sequence(angles, np.random.default_rng(seed + 10), noise=noise)
+            raw = replay(sequence)
+            filtered = replay(sequence, OneEuroFilterBank())
+            print(f"seed {seed}  jitter {noise:.3f}  raw reps {raw[0]:3d}  stage changes {raw[1]:4d}   "
+                  f"filtered reps {filtered[0]:3d}  stage changes {filtered[1]:4d}")
+
+    landmarks = landmark_sequence(np.full(20000, 178.0), np.random.default_rng(0))
+    landmark_filter = OneEuroFilterBank()
+    frames = iter(range(len(landmarks)))
+
+    def step():
+        index = next(frames)
+        landmark_filter(landmarks[index], index / FPS)
+
+    seconds = timeit.timeit(step, number=len(landmarks)) / len(landmarks)
+    print(f"filter cost {seconds * 1e6:.1f} us/frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Per-frame HUD cost: redrawing everything vs the cached static layer.
+
+Draws the web app's HUD (header lines, counter, stage, progress bar, gauge)
+on a 1280x720 frame the old way, every element from scratch, and with
+HudCompositor, which pastes the cached static layer and draws the values.
+
+Run from the project root:
+    python -m benchmarks.bench_hud
+"""
+import timeit
+
+import cv2
+import numpy as np
+
+from exercises.registry import EXERCISES
+from feedback.hud import HudCompositor
+from feedback.layout import layout_indicators
+from utils.draw_text_with_background import draw_text_with_background
+
+FRAME_SHAPE = (720, 1280, 3)
+HEADER = ("Exercise: Hammer Curl", "Reps Goal: 10", "Sets Goal: 3", "Current Set: 1")
+
+
+def redraw(frame, exercise_type, exercise_data):
+    layout_indicators(frame, exercise_type, exercise_data)
+    for i, text in enumerate(HEADER):
+        draw_text_with_background(frame, text, (40, 50 + 30 * i), cv2.FONT_HERSHEY_DUPLEX, 0.7,
+                                  (255, 255, 255), (118, 29, 14), 1)
+
+
+def sample_state(exercise_type, step):
+    state = {'counter': step % 12, 'progress': step % 12, 'warnings': []}
+    for key, _, _ in EXERCISES[exercise_type]['overlay']['stages']:
+        state[key] = "Flex" if step % 2 else "Relaxed"
+    for key, _, _, _, _ in EXERCISES[exercise_type]['overlay']['gauges']:
+        state[key] = 40.0 + step % 120
+    return state
+
+
+def main():
+    frame = np.random.default_rng(0).integers(0, 255, FRAME_SHAPE, dtype=np.uint8)
+    for exercise_type in ("squat", "hammer_curl"):
+        hud = HudCompositor(exercise_type)
+        state = sample_state(exercise_type, 7)
+
+        # Same pixels both ways
+        expected, composited = frame.copy(), frame.copy()
+        redraw(expected, exercise_type, state)
+        hud.render(composited, state, HEADER)
+        print(f"{exercise_type:<12} pixels differing: {np.count_nonzero((expected != composited).any(axis=2))}")
+
+        # Both draw over the same frame each time, so only drawing is timed
+        canvas = frame.copy()
+        cases = [("redraw", lambda: redraw(canvas, exercise_type, state)),
+                 ("cached layer", lambda: hud.render(canvas, state, HEADER))]
+        for name, func in cases:
+            seconds = min(timeit.repeat(func, number=1000, repeat=5)) / 1000
+            print(f"{exercise_type:<12} {name:<14} {seconds * 1e6:8.1f} us/frame")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Rep-count accuracy and inference savings of the adaptive rate controller.
+
+Replays a synthetic 30 fps squat recording (reps of varying depth and speed,
+with landmark jitter) through the Squat tracker at full rate and through
+AdaptiveRateController at several target rates.
+
+Run from the project root:
+    python -m benchmarks.bench_rate_control
+"""
+import numpy as np
+
+from exercises.squat import Squat
+from pose_estimation.rate_control import AdaptiveRateController
+
+FPS = 30
+FRAME_SHAPE = (720, 1280, 3)
+
+
+def knee_angle_track(rng, seconds=120):
+    """Knee angle per frame: standing pauses and reps of random depth and duration."""
+    angles = []
+    while len(angles) < seconds * FPS:
+        angles.extend([178.0] * int(rng.uniform(0.3, 1.5) * FPS))
+        depth = rng.uniform(60, 100)  # some reps stop short of the 90 degree threshold
+        duration = rng.uniform(1.0, 3.0)
+        phase = np.linspace(0, 2 * np.pi, int(duration * FPS))
+        angles.extend(178.0 - (178.0 - depth) * (1 - np.cos(phase)) / 2)
+    return np.array(angles[:seconds * FPS])
+
+
+def landmark_sequence(angles, rng, noise=0.002):
+    """(T, 33, 4) landmarks whose shoulder-hip-knee angle follows angles."""
+    sequence = np.zeros((len(angles), 33, 4), dtype=np.float32)
+    sequence[:, :, 3] = 1.0
+    theta = np.radians(angles)
+    for shoulder, hip, knee, x in ((11, 23, 25, 0.45), (12, 24, 26, 0.55)):
+        sequence[:, shoulder, :2] = (x, 0.3)
+        sequence[:, hip, :2] = (x, 0.55)
+        # The knee sits at the given angle from the hip->shoulder direction (pixel space)
+        sequence[:, knee, 0] = x + np.sin(theta) * 250 / FRAME_SHAPE[1]
+        sequence[:, knee, 1] = 0.55 - np.cos(theta) * 250 / FRAME_SHAPE[0]
+    sequence[:, :, :2] += rng.normal(0, noise, sequence[:, :, :2].shape)
+    return sequence
+
+
+class ReplayEstimator:
+    def __init__(self, sequence):
+        self.sequence = sequence
+        self.index = 0
+        self.calls = 0
+
+    def estimate_landmarks(self, frame, is_rgb=False):
+        self.calls += 1
+        return self.sequence[self.index]
+
+
+def count_reps(sequence, target_fps=None):
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    estimator = ReplayEstimator(sequence)
+    squat = Squat()
+    controller = AdaptiveRateController(estimator, target_fps) if target_fps else None
+    counter = 0
+    for index in range(len(sequence)):
+        estimator.index = index
+        if controller is None:
+            landmarks = estimator.estimate_landmarks(frame)
+        else:
+            landmarks = controller.estimate_landmarks(frame, exercise=squat, timestamp=index / FPS)
+        counter, _, _ = squat.track_squat(landmarks, frame, draw=False)
+    return counter, estimator.calls
+
+
+def main():
+    for seed in range(3):
+        rng = np.random.default_rng(seed)
+        sequence = landmark_sequence(knee_angle_track(rng), rng)
+        baseline, calls = count_reps(sequence)
+        print(f"seed {seed}  {'full rate':<16} reps {baseline:3d}   inferences {calls:5d} (100.0%)")
+        for target_fps in (15, 10, 5):
+            reps, calls = count_reps(sequence, target_fps)
+            print(f"seed {seed}  {f'target {target_fps} fps':<16} reps {reps:3d}   inferences {calls:5d} "
+                  f"({100.0 * calls / len(sequence):5.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
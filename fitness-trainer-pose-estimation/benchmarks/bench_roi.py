@@ -0,0 +1,66 @@
+"""Per-frame preprocessing cost with and without the ROI crop.
+
+Times the work PoseEstimator does before the model sees a frame (BGR->RGB
+conversion plus MediaPipe's resize to its 256x256 detector input) on a full
+1280x720 frame and on the crop RoiTracker picks for a trainee standing in
+part of it. When MediaPipe's legacy solutions API is available the model
+call is timed as well; MediaPipe resizes its input internally, so that call
+costs about the same for the crop as for the full frame.
+
+Run from the project root:
+    python -m benchmarks.bench_roi
+"""
+import timeit
+
+import cv2
+import numpy as np
+
+from pose_estimation.roi import RoiTracker
+
+FRAME_SHAPE = (720, 1280, 3)
+
+
+def preprocess(frame):
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return cv2.resize(rgb, (256, 256), interpolation=cv2.INTER_AREA)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, FRAME_SHAPE, dtype=np.uint8)
+
+    # A trainee standing in the middle third of the frame, head to ankles
+    landmarks = np.zeros((33, 4), dtype=np.float32)
+    landmarks[:, 0] = rng.uniform(0.4, 0.6, 33)
+    landmarks[:, 1] = rng.uniform(0.15, 0.9, 33)
+    landmarks[:, 3] = 1.0
+    tracker = RoiTracker()
+    tracker.update(landmarks, FRAME_SHAPE)
+    x0, y0, x1, y1 = tracker.crop_box()
+    ratio = (x1 - x0) * (y1 - y0) / (FRAME_SHAPE[0] * FRAME_SHAPE[1])
+    print(f"ROI {x1 - x0}x{y1 - y0}, {ratio * 100:.1f}% of the frame")
+
+    cases = [
+        ("cvtColor, full frame", lambda: cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)),
+        ("cvtColor, ROI", lambda: cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2RGB)),
+        ("cvtColor + resize, full frame", lambda: preprocess(frame)),
+        ("cvtColor + resize, ROI", lambda: preprocess(frame[y0:y1, x0:x1])),
+    ]
+    try:
+        from pose_estimation.estimation import PoseEstimator
+        # Time the model call itself; on a random frame no pose is found, which
+        # would otherwise send the ROI path back to the full frame
+        full, roi = PoseEstimator(), PoseEstimator()
+        cases += [("model, full frame", lambda: full.process(frame)),
+                  ("model, ROI", lambda: roi.process(frame[y0:y1, x0:x1]))]
+    except (ImportError, AttributeError):
+        print("MediaPipe solutions API not available, timing preprocessing only")
+
+    for name, func in cases:
+        number = 50 if name.startswith("model") else 500
+        seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+        print(f"{name:<32} {seconds * 1e6:10.1f} us/frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Encode cost and bandwidth of each MJPEG stream profile.
+
+Encodes a synthetic 1280x720 camera-like frame (smooth gradients, shapes
+and sensor noise) with every profile in streaming/profiles.py and reports
+the encode time, frame size and the bandwidth at the profile's fps cap
+(30 fps for uncapped profiles).
+
+Run from the project root:
+    python -m benchmarks.bench_stream_profiles
+"""
+import timeit
+
+import cv2
+import numpy as np
+
+from streaming.profiles import STREAM_PROFILES, encode_frame
+
+FRAME_SHAPE = (720, 1280, 3)
+CAMERA_FPS = 30
+
+
+def camera_frame(rng):
+    y, x = np.mgrid[0:FRAME_SHAPE[0], 0:FRAME_SHAPE[1]]
+    frame = np.stack([x * 255 // FRAME_SHAPE[1], y * 255 // FRAME_SHAPE[0], (x + y) % 256], axis=2).astype(np.uint8)
+    cv2.rectangle(frame, (500, 100), (780, 650), (40, 60, 90), -1)
+    cv2.circle(frame, (640, 160), 60, (120, 150, 200), -1)
+    cv2.putText(frame, "Count: 7", (40, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 1)
+    noise = rng.normal(0, 4, FRAME_SHAPE)
+    return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+
+def main():
+    frame = camera_frame(np.random.default_rng(0))
+    for name, profile in STREAM_PROFILES.items():
+        seconds = min(timeit.repeat(lambda: encode_frame(frame, profile), number=50, repeat=3)) / 50
+        size = len(encode_frame(frame, profile))
+        fps = profile['fps'] or CAMERA_FPS
+        print(f"{name:<8} {profile['width'] or FRAME_SHAPE[1]:>5}px q{profile['quality']:<3} "
+              f"encode {seconds * 1e3:6.2f} ms  {size / 1024:7.1f} KB/frame  "
+              f"{size * 8 * fps / 1e6:6.2f} Mbit/s at {fps} fps")
+
+
+if __name__ == '__main__':
+    main()
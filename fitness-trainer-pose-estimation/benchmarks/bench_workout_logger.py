@@ -0,0 +1,92 @@
+"""Dashboard query latency on a large workout history.
+
+Generates synthetic workouts into a temporary SQLite database (see
+db/generate_data.py) and times every query the dashboard makes, for random
+users, with their query plans. Then grows one user's history and compares
+the rollup reads with the same statistics scanned from the workouts table.
+
+Run from the project root:
+    python -m benchmarks.bench_workout_logger [--workouts 2000000] [--users 1000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date
+
+from db.generate_data import generate_rows, populate
+from db.workout_logger import DAILY_TOTALS, EXERCISE_COUNTS, RECENT_WORKOUTS, WORKOUT_DAYS, WorkoutLogger
+
+
+# The dashboard statistics computed straight from the workouts table
+SCAN_QUERIES = {
+    "weekly": "SELECT day, COUNT(*), SUM(duration_seconds) FROM workouts WHERE user_id = ? AND day >= ? GROUP BY day",
+    "distribution": "SELECT exercise_type, COUNT(*) FROM workouts WHERE user_id = ? GROUP BY exercise_type",
+    "streak days": "SELECT DISTINCT day FROM workouts WHERE user_id = ? ORDER BY day DESC",
+}
+
+
+def time_query(func, users, repeat=200):
+    samples = []
+    for user_id in random.Random(1).choices(users, k=repeat):
+        start = time.perf_counter()
+        func(user_id)
+        samples.append((time.perf_counter() - start) * 1e3)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workouts', type=int, default=2000000)
+    parser.add_argument('--users', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        logger = WorkoutLogger(os.path.join(directory, 'workouts.db'))
+        start = time.perf_counter()
+        populate(logger, args.users, args.workouts)
+        print(f"Generated {args.workouts} workouts for {args.users} users in {time.perf_counter() - start:.1f}s")
+
+        connection = logger._connection()
+        today = date.today().isoformat()
+        for name, sql, params in (("recent", RECENT_WORKOUTS, ('user000000', 5)),
+                                  ("weekly", DAILY_TOTALS, ('user000000', today, today)),
+                                  ("distribution", EXERCISE_COUNTS, ('user000000',)),
+                                  ("streak", WORKOUT_DAYS, ('user000000', today))):
+            plan = ' / '.join(row[-1] for row in connection.execute("EXPLAIN QUERY PLAN " + sql, params))
+            print(f"{name:<14} {plan}")
+
+        users = [f"user{user:06d}" for user in range(args.users)]
+        for name, func in (("log_workout", lambda user_id: logger.log_workout("squat", 3, 10, 300, user_id)),
+                           ("recent", lambda user_id: logger.get_recent_workouts(5, user_id)),
+                           ("weekly", logger.get_weekly_stats),
+                           ("distribution", logger.get_exercise_distribution),
+                           ("user_stats", logger.get_user_stats)):
+            median, p95 = time_query(func, users)
+            print(f"{name:<14} median {median:7.3f} ms   p95 {p95:7.3f} ms")
+
+        # One user whose history keeps growing: rollup reads stay flat, scans grow with it
+        connection = logger._connection()
+        week_start = date.fromordinal(date.today().toordinal() - 6).isoformat()
+        logged = 0
+        for size in (1000, 10000, 100000):
+            rows = [('heavy',) + row[1:] for row in generate_rows(1, size - logged, seed=size)]
+            logger.log_workouts(rows)
+            logged = size
+            median, _ = time_query(logger.get_user_stats, ['heavy'], repeat=50)
+            weekly, _ = time_query(logger.get_weekly_stats, ['heavy'], repeat=50)
+            scans = []
+            for name, sql in SCAN_QUERIES.items():
+                params = ('heavy', week_start) if name == "weekly" else ('heavy',)
+                scan, _ = time_query(lambda user_id: connection.execute(sql, params).fetchall(), ['heavy'], repeat=20)
+                scans.append(f"{name} {scan:7.3f}")
+            print(f"heavy user {size:>7} workouts: rollups user_stats {median:6.3f} ms weekly {weekly:6.3f} ms"
+                  f" | scans (ms) {', '.join(scans)}")
+        logger.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Fill a workout database with synthetic history.
+
+Users train on a random subset of days, one to three workouts a day, so each
+has a realistic mix of streaks and gaps. Rows are generated and inserted in
+chunks, which keeps memory flat for millions of workouts.
+
+    python -m db.generate_data --db /tmp/workouts.db --users 1000 --workouts 2000000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from db.workout_logger import WorkoutLogger
+from exercises.registry import EXERCISES
+
+CHUNK = 50000
+
+
+def generate_rows(users, workouts, end=None, seed=0):
+    """Yield (user_id, exercise_type, sets, reps, duration_seconds, performed_at) tuples."""
+    rng = random.Random(seed)
+    end = end or datetime.now()
+    exercise_types = list(EXERCISES)
+    per_user = workouts // users
+    for user in range(users):
+        user_id = f"user{user:06d}"
+        # Spread the user's workouts over enough days at ~2 per active day, 70% of days active
+        days = max(1, int(per_user / 2 / 0.7))
+        performed_at = end - timedelta(days=days)
+        for _ in range(per_user):
+            if rng.random() < 0.5:
+                performed_at += timedelta(days=1 if rng.random() < 0.7 else rng.randint(2, 4))
+            performed_at = performed_at.replace(hour=rng.randint(6, 21), minute=rng.randint(0, 59))
+            sets = rng.randint(1, 5)
+            yield (user_id, rng.choice(exercise_types), sets, rng.randint(5, 15),
+                   sets * rng.randint(40, 120), min(performed_at, end))
+
+
+def populate(logger, users, workouts, seed=0):
+    rows = generate_rows(users, workouts, seed=seed)
+    total = 0
+    while True:
+        chunk = [row for _, row in zip(range(CHUNK), rows)]
+        if not chunk:
+            return total
+        logger.log_workouts(chunk)
+        total += len(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic workout history")
+    parser.add_argument('--db', required=True, help="SQLite database to fill")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--workouts', type=int, default=1000000, help="Total workouts across all users")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    total = populate(WorkoutLogger(args.db), args.users, args.workouts, args.seed)
+    print(f"Inserted {total} workouts for {args.users} users in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
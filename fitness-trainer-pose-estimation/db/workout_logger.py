@@ -0,0 +1,244 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+DEFAULT_DB_PATH = os.environ.get('WORKOUT_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'workouts.db'))
+# The app has no accounts yet, every workout belongs to this user
+DEFAULT_USER = 'local'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workouts (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    exercise_type TEXT NOT NULL,
+    sets INTEGER NOT NULL,
+    reps INTEGER NOT NULL,
+    duration_seconds INTEGER NOT NULL,
+    performed_at TEXT NOT NULL,
+    day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_workouts_user_time ON workouts (user_id, performed_at);
+CREATE INDEX IF NOT EXISTS idx_workouts_user_day ON workouts (user_id, day);
+CREATE INDEX IF NOT EXISTS idx_workouts_user_exercise ON workouts (user_id, exercise_type);
+
+-- Rollups kept up to date by log_workout, so dashboard reads never scan history
+CREATE TABLE IF NOT EXISTS daily_totals (
+    user_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    exercise_type TEXT NOT NULL,
+    workout_count INTEGER NOT NULL,
+    duration_seconds INTEGER NOT NULL,
+    total_reps INTEGER NOT NULL,
+    PRIMARY KEY (user_id, day, exercise_type)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS exercise_totals (
+    user_id TEXT NOT NULL,
+    exercise_type TEXT NOT NULL,
+    workout_count INTEGER NOT NULL,
+    PRIMARY KEY (user_id, exercise_type)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id TEXT PRIMARY KEY,
+    last_day TEXT NOT NULL,
+    streak_days INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Every query is a constant string, so sqlite3's per-connection statement cache
+# prepares each one once per thread
+INSERT_WORKOUT = """
+INSERT INTO workouts (user_id, exercise_type, sets, reps, duration_seconds, performed_at, day)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+RECENT_WORKOUTS = """
+SELECT performed_at, exercise_type, sets, reps, duration_seconds FROM workouts
+WHERE user_id = ? ORDER BY performed_at DESC LIMIT ?
+"""
+DAILY_TOTALS = """
+SELECT day, SUM(workout_count), SUM(duration_seconds), SUM(total_reps) FROM daily_totals
+WHERE user_id = ? AND day BETWEEN ? AND ? GROUP BY day
+"""
+EXERCISE_COUNTS = """
+SELECT exercise_type, workout_count FROM exercise_totals WHERE user_id = ?
+"""
+WORKOUT_DAYS = """
+SELECT DISTINCT day FROM daily_totals WHERE user_id = ? AND day <= ? ORDER BY day DESC
+"""
+USER_STATS = """
+SELECT last_day, streak_days, version, updated_at FROM user_stats WHERE user_id = ?
+"""
+
+# Rollup maintenance. The workouts with id > ? are folded into the rollups with
+# upserts, so logging one workout touches one row per rollup table. NOT INDEXED
+# keeps SQLite on the rowid range instead of walking a whole (user_id, ...)
+# index to satisfy the GROUP BY.
+ROLLUP_DAILY = """
+INSERT INTO daily_totals (user_id, day, exercise_type, workout_count, duration_seconds, total_reps)
+SELECT user_id, day, exercise_type, COUNT(*), SUM(duration_seconds), SUM(sets * reps) FROM workouts NOT INDEXED
+WHERE id > ? GROUP BY user_id, day, exercise_type
+ON CONFLICT (user_id, day, exercise_type) DO UPDATE SET
+    workout_count = workout_count + excluded.workout_count,
+    duration_seconds = duration_seconds + excluded.duration_seconds,
+    total_reps = total_reps + excluded.total_reps
+"""
+ROLLUP_EXERCISES = """
+INSERT INTO exercise_totals (user_id, exercise_type, workout_count)
+SELECT user_id, exercise_type, COUNT(*) FROM workouts NOT INDEXED WHERE id > ? GROUP BY user_id, exercise_type
+ON CONFLICT (user_id, exercise_type) DO UPDATE SET workout_count = workout_count + excluded.workout_count
+"""
+NEW_USER_DAYS = """
+SELECT user_id, MIN(day), MAX(day) FROM workouts NOT INDEXED WHERE id > ? GROUP BY user_id
+"""
+UPSERT_USER_STATS = """
+INSERT INTO user_stats (user_id, last_day, streak_days, version, updated_at) VALUES (?, ?, ?, 1, ?)
+ON CONFLICT (user_id) DO UPDATE SET
+    last_day = excluded.last_day, streak_days = excluded.streak_days,
+    version = version + 1, updated_at = excluded.updated_at
+"""
+
+
+def count_streak(days, end):
+    """Length of the run of consecutive days ending at end, from ISO days sorted newest first."""
+    expected = end
+    streak = 0
+    for day in days:
+        if date.fromisoformat(day) != expected:
+            break
+        streak += 1
+        expected -= timedelta(days=1)
+    return streak
+
+
+class WorkoutLogger:
+    """Workout history in SQLite (WAL mode), one connection per thread.
+
+    Every logged workout is also folded into rollup tables in the same
+    transaction: per-day/per-exercise totals, per-exercise counts and a
+    running streak with a version number per user. Dashboard reads only touch
+    rollup rows for the days they show, so their cost stays flat as history
+    grows; recent workouts come from the (user_id, performed_at) index.
+    See benchmarks/bench_workout_logger.py.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.executescript(SCHEMA)
+        # Databases written before the rollups existed get them built once
+        if connection.execute("SELECT EXISTS (SELECT 1 FROM workouts) AND NOT EXISTS (SELECT 1 FROM user_stats)"
+                              ).fetchone()[0]:
+            self.rebuild_rollups()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10, cached_statements=64)
+            # WAL lets the dashboard read while a workout is being logged
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def log_workout(self, exercise_type, sets, reps, duration_seconds, user_id=DEFAULT_USER, performed_at=None):
+        """Store one workout and return it as a dict."""
+        performed_at = performed_at or datetime.now()
+        row = (user_id, exercise_type, int(sets), int(reps), int(duration_seconds),
+               performed_at.strftime('%Y-%m-%d %H:%M:%S'), performed_at.strftime('%Y-%m-%d'))
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(INSERT_WORKOUT, row)
+            self._update_rollups(connection, cursor.lastrowid - 1)
+        return {'id': cursor.lastrowid, 'user_id': user_id, 'exercise_type': exercise_type, 'sets': row[2],
+                'reps': row[3], 'duration_seconds': row[4], 'date': row[5]}
+
+    def log_workouts(self, rows):
+        """Bulk insert (user_id, exercise_type, sets, reps, duration_seconds, performed_at) tuples."""
+        connection = self._connection()
+        with connection:
+            # Take the write lock first so no other writer's rows land after last_id
+            connection.execute("BEGIN IMMEDIATE")
+            last_id = connection.execute("SELECT COALESCE(MAX(id), 0) FROM workouts").fetchone()[0]
+            connection.executemany(INSERT_WORKOUT, (
+                (user_id, exercise_type, sets, reps, duration, performed_at.strftime('%Y-%m-%d %H:%M:%S'),
+                 performed_at.strftime('%Y-%m-%d'))
+                for user_id, exercise_type, sets, reps, duration, performed_at in rows))
+            self._update_rollups(connection, last_id)
+
+    def rebuild_rollups(self):
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            for table in ('daily_totals', 'exercise_totals', 'user_stats'):
+                connection.execute(f"DELETE FROM {table}")
+            self._update_rollups(connection, 0)
+
+    def _update_rollups(self, connection, last_id):
+        """Fold the workouts with id > last_id into the rollups; runs inside the writing transaction."""
+        connection.execute(ROLLUP_DAILY, (last_id,))
+        connection.execute(ROLLUP_EXERCISES, (last_id,))
+        updated_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        for user_id, first_day, last_day in connection.execute(NEW_USER_DAYS, (last_id,)).fetchall():
+            stats = connection.execute(USER_STATS, (user_id,)).fetchone()
+            previous_day, streak = (stats[0], stats[1]) if stats else (None, 0)
+            if previous_day is not None and first_day == last_day and first_day >= previous_day:
+                # The common case, one new workout on or after the latest day: extend, keep or restart
+                gap = (date.fromisoformat(first_day) - date.fromisoformat(previous_day)).days
+                streak = streak if gap == 0 else streak + 1 if gap == 1 else 1
+            else:
+                # Several new days or a backfill: recount from the daily rollup, newest first
+                last_day = max(last_day, previous_day or last_day)
+                days = (day for (day,) in connection.execute(WORKOUT_DAYS, (user_id, last_day)))
+                streak = count_streak(days, date.fromisoformat(last_day))
+            connection.execute(UPSERT_USER_STATS, (user_id, last_day, streak, updated_at))
+
+    def get_recent_workouts(self, limit=5, user_id=DEFAULT_USER):
+        rows = self._connection().execute(RECENT_WORKOUTS, (user_id, limit)).fetchall()
+        return [{'date': performed_at[:16], 'exercise_type': exercise_type, 'sets': sets, 'reps': reps,
+                 'duration_seconds': duration} for performed_at, exercise_type, sets, reps, duration in rows]
+
+    def get_weekly_stats(self, user_id=DEFAULT_USER, today=None):
+        """Totals for each of the last seven days, oldest first, keyed by ISO date."""
+        today = today or date.today()
+        days = [(today - timedelta(days=offset)).isoformat() for offset in range(6, -1, -1)]
+        stats = {day: {'workout_count': 0, 'duration_seconds': 0, 'total_reps': 0} for day in days}
+        for day, count, duration, reps in self._connection().execute(DAILY_TOTALS, (user_id, days[0], days[-1])):
+            stats[day] = {'workout_count': count, 'duration_seconds': duration, 'total_reps': reps}
+        return stats
+
+    def get_exercise_distribution(self, user_id=DEFAULT_USER):
+        return dict(self._connection().execute(EXERCISE_COUNTS, (user_id,)).fetchall())
+
+    def get_user_stats(self, user_id=DEFAULT_USER, today=None):
+        distribution = self.get_exercise_distribution(user_id)
+        return {'total_workouts': sum(distribution.values()),
+                'total_exercises': len(distribution),
+                'streak_days': self.get_streak(user_id, today)}
+
+    def get_streak(self, user_id=DEFAULT_USER, today=None):
+        """Consecutive days with a workout, ending today or, if none yet today, yesterday."""
+        today = today or date.today()
+        stats = self._connection().execute(USER_STATS, (user_id,)).fetchone()
+        if stats is None:
+            return 0
+        last_day, streak = date.fromisoformat(stats[0]), stats[1]
+        return streak if today - timedelta(days=1) <= last_day <= today else 0
+
+    def get_version(self, user_id=DEFAULT_USER):
+        """(version, updated_at UTC datetime) of a user's rollups; version grows with every logged workout."""
+        stats = self._connection().execute(USER_STATS, (user_id,)).fetchone()
+        if stats is None:
+            return 0, None
+        return stats[2], datetime.strptime(stats[3], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
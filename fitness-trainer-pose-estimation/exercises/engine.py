@@ -0,0 +1,143 @@
+import time
+
+import cv2
+import numpy as np
+
+from pose_estimation.angle_calculation import calculate_angles
+from pose_estimation.landmarks import to_pixels
+
+
+# How a spec's counters combine into its rep count or progress
+TOTALS = {'max': max, 'sum': sum, 'mean': lambda counters: sum(counters) / len(counters)}
+
+
+class ExerciseEngine:
+    """Table-driven rep counter for an exercise spec from exercises/registry.py.
+
+    The spec is compiled once: angle triplets into one index array, so every
+    angle of a frame comes from a single vectorized calculate_angles call, and
+    transitions into tuples the state machine walks per counter.
+    update() returns a JSON friendly state dict:
+        counter, progress, warnings, and per counter angle/stage/counter keys
+        (suffixed with _<name> when the spec has several counters).
+    """
+
+    # Longest gap (s) a hold counter credits between two frames
+    MAX_HOLD_STEP = 1.0
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.angle_names = list(spec['angles'])
+        self.angle_triplets = np.array([spec['angles'][name] for name in self.angle_names])
+        index = {name: i for i, name in enumerate(self.angle_names)}
+
+        self.counter_specs = spec['counters']
+        self.counter_angles = [index[counter['angle']] for counter in self.counter_specs]
+        multiple = len(self.counter_specs) > 1
+        self.counter_suffixes = [f"_{counter['name']}" if multiple else '' for counter in self.counter_specs]
+        self.total = TOTALS[spec.get('total', 'max')]
+        self.progress_total = TOTALS[spec.get('progress', spec.get('total', 'max'))]
+        self.warning_specs = [(index[warning['angle']], warning.get('above'), warning.get('below'), warning['message'])
+                              for warning in spec.get('warnings', [])]
+
+        # What the adaptive inference rate controller watches: counted angles and their thresholds
+        self.stage_angles = sorted(set(self.counter_angles))
+        thresholds = set()
+        for counter in self.counter_specs:
+            bounds = [counter['hold']] if 'hold' in counter else [t[1:3] for t in counter['transitions']]
+            thresholds.update(bound for pair in bounds for bound in pair if bound is not None)
+        self.stage_thresholds = tuple(sorted(thresholds))
+
+        self.angles = np.zeros(len(self.angle_names))
+        self.reset()
+
+    def reset(self):
+        self.counters = [0] * len(self.counter_specs)
+        self.stages = [counter.get('initial_stage') for counter in self.counter_specs]
+        self.held = [0.0] * len(self.counter_specs)
+        self.last_count_time = [None] * len(self.counter_specs)
+        self.last_update = None
+        self.warnings = [None] * len(self.warning_specs)
+
+    def reset_counters(self):
+        """Start a new set: zero the counters but keep the current stages."""
+        self.counters = [0] * len(self.counter_specs)
+        self.held = [0.0] * len(self.counter_specs)
+
+    @property
+    def counter(self):
+        return self.total(self.counters)
+
+    def update(self, landmarks, frame_shape, timestamp=None):
+        """Advance every counter with a (33, 4) landmark array; returns the state dict.
+
+        timestamp (seconds) drives hold timers and rep debouncing; it defaults
+        to the wall clock, pass frame times when replaying recordings.
+        """
+        now = time.time() if timestamp is None else timestamp
+        pixels = to_pixels(landmarks, frame_shape)
+        self.angles = calculate_angles(pixels[self.angle_triplets])
+        angles = self.angles.tolist()
+
+        for i, counter in enumerate(self.counter_specs):
+            angle = angles[self.counter_angles[i]]
+            if 'hold' in counter:
+                self._advance_hold(i, counter, angle, now)
+            else:
+                self._advance_transitions(i, counter, angle, now)
+
+        for i, (angle_index, above, below, message) in enumerate(self.warning_specs):
+            angle = angles[angle_index]
+            outside = (above is not None and angle > above) or (below is not None and angle < below)
+            self.warnings[i] = message.format(angle=angle) if outside else None
+
+        self.last_update = now
+        return self.state()
+
+    def _advance_transitions(self, i, counter, angle, now):
+        if self.last_count_time[i] is None:
+            # Debounce windows start when tracking starts
+            self.last_count_time[i] = now
+        for after, above, below, to_stage, counts in counter['transitions']:
+            if after is not None and self.stages[i] != after:
+                continue
+            if (above is not None and not angle > above) or (below is not None and not angle < below):
+                continue
+            self.stages[i] = to_stage
+            if counts:
+                min_interval = counter.get('min_interval')
+                if min_interval is None or now - self.last_count_time[i] > min_interval:
+                    self.counters[i] += 1
+                    self.last_count_time[i] = now
+            return
+
+    def _advance_hold(self, i, counter, angle, now):
+        above, below = counter['hold']
+        holding = (above is None or angle > above) and (below is None or angle < below)
+        hold_stage, break_stage = counter.get('stages', ("Hold", "Break"))
+        if holding and self.stages[i] == hold_stage and self.last_update is not None:
+            self.held[i] += min(max(now - self.last_update, 0.0), self.MAX_HOLD_STEP)
+        self.stages[i] = hold_stage if holding else break_stage
+        self.counters[i] = int(self.held[i])
+
+    def state(self):
+        angles = self.angles.tolist()
+        state = {'counter': self.counter, 'progress': self.progress_total(self.counters)}
+        for i, suffix in enumerate(self.counter_suffixes):
+            state['counter' + suffix] = self.counters[i]
+            state['angle' + suffix] = angles[self.counter_angles[i]]
+            state['stage' + suffix] = self.stages[i]
+        state['warnings'] = [warning for warning in self.warnings if warning]
+        return state
+
+    def draw(self, frame, landmarks):
+        """Highlight the tracked joints and label their angles."""
+        overlay = self.spec['overlay']
+        points = to_pixels(landmarks, frame.shape).tolist()
+        for index, color in overlay.get('points', []):
+            cv2.circle(frame, points[index], 8, color, -1)
+        angles = dict(zip(self.angle_names, self.angles.tolist()))
+        for angle_name, anchor, label in overlay.get('angle_labels', []):
+            x, y = points[anchor]
+            cv2.putText(frame, f'{label}: {int(angles[angle_name])}', (x + 10, y - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
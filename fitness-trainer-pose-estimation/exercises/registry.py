@@ -0,0 +1,277 @@
+"""Declarative exercise specs.
+
+Each exercise is data: the joint angles it measures, the counters driven by
+those angles, form warnings, overlay layout and descriptive info. The generic
+ExerciseEngine in exercises/engine.py runs any spec, so adding an exercise
+means adding an entry to EXERCISES.
+
+angles:      name -> (a, b, c) landmark indices, the angle is measured at b.
+counters:    one state machine per counted angle. transitions are tried in
+             order and the first match wins, like an if/elif chain:
+             step(to_stage, after=stage, above=low, below=high, count=True)
+             fires when the current stage is `after` (any stage if None) and
+             low < angle < high. A counter with `hold` instead accumulates
+             the seconds the angle stays inside (above, below).
+             min_interval (s) ignores reps that come faster than that.
+total:       how the counters combine into the rep count ('max', 'sum' or 'mean').
+progress:    how they combine into the progress bar; defaults to total.
+warnings:    form messages shown while an angle is outside a limit.
+overlay:     lines, points and angle labels drawn over the body, plus the
+             counter/stage/progress/gauge indicators.
+"""
+
+
+def step(to_stage, after=None, above=None, below=None, count=False):
+    return (after, above, below, to_stage, count)
+
+
+LEG_COLOR_LEFT = (178, 102, 255)
+LEG_COLOR_RIGHT = (51, 153, 255)
+ARM_COLOR = (0, 0, 255)
+ARM_COLOR_RIGHT = (102, 0, 0)
+
+COUNTER_POSITION = (40, 240)
+STAGE_POSITION = (40, 270)
+SECOND_STAGE_POSITION = (40, 300)
+PROGRESS_POSITION = (40, 170)
+
+EXERCISES = {
+    "squat": {
+        'info': {
+            "name": "Squat",
+            "target_muscles": ["Quads", "Glutes", "Hamstrings"],
+            "equipment": "Bodyweight or Barbell",
+            "reps": 2,
+            "sets": 3,
+            "rest_time": "60 seconds",
+            "benefits": [
+                "Builds lower body strength",
+                "Improves mobility and balance"
+            ]
+        },
+        # (shoulder, hip, knee) for the left and right side
+        'angles': {'left': (11, 23, 25), 'right': (12, 24, 26)},
+        'counters': [
+            {'angle': 'left', 'transitions': [
+                step("Starting Position", above=170),
+                step("Descent", after="Starting Position", above=90, below=170),
+                step("Ascent", after="Descent", below=90, count=True),
+            ]},
+        ],
+        'overlay': {
+            'lines': [((11, 23), LEG_COLOR_LEFT, 2), ((23, 25), LEG_COLOR_LEFT, 2),
+                      ((12, 24), LEG_COLOR_RIGHT, 2), ((24, 26), LEG_COLOR_RIGHT, 2)],
+            'points': [(11, LEG_COLOR_LEFT), (23, LEG_COLOR_LEFT), (25, LEG_COLOR_LEFT),
+                       (12, LEG_COLOR_RIGHT), (24, LEG_COLOR_RIGHT), (26, LEG_COLOR_RIGHT)],
+            'angle_labels': [('left', 25, "Angle Left"), ('right', 26, "Angle Right")],
+            'stages': [('stage', "Stage", STAGE_POSITION)],
+            'progress_max': 15,
+            'gauges': [('angle', "Squat Gauge Meter", (135, 415), 75, (0, 0, 255))],
+        },
+    },
+    "push_up": {
+        'info': {
+            "name": "Push-Up",
+            "target_muscles": ["Chest", "Triceps", "Shoulders"],
+            "equipment": "Bodyweight",
+            "reps": 10,
+            "sets": 1,
+            "rest_time": "45 seconds",
+            "benefits": [
+                "Builds upper body strength",
+                "Improves core stability"
+            ]
+        },
+        # (shoulder, elbow, wrist) for the left and right arm
+        'angles': {'left': (11, 13, 15), 'right': (12, 14, 16)},
+        'counters': [
+            {'angle': 'left', 'initial_stage': "Initial", 'min_interval': 1.0, 'transitions': [
+                step("Starting position", above=150),
+                step("Descent", after="Starting position", above=70, below=150),
+                step("Ascent", after="Descent", below=70, count=True),
+            ]},
+        ],
+        'overlay': {
+            'lines': [((11, 13), ARM_COLOR, 2), ((13, 15), ARM_COLOR, 2),
+                      ((12, 14), ARM_COLOR_RIGHT, 2), ((14, 16), ARM_COLOR_RIGHT, 2)],
+            'points': [(11, ARM_COLOR), (13, ARM_COLOR), (15, ARM_COLOR),
+                       (12, ARM_COLOR_RIGHT), (14, ARM_COLOR_RIGHT), (16, ARM_COLOR_RIGHT)],
+            'angle_labels': [('left', 13, "Angle"), ('right', 14, "Angle")],
+            'stages': [('stage', "Stage", STAGE_POSITION)],
+            'progress_max': 10,
+            'gauges': [('angle', "Push-u Gauge Meter", (350, 80), 50, (0, 102, 204))],
+        },
+    },
+    "hammer_curl": {
+        'info': {
+            "name": "Hammer Curl",
+            "target_muscles": ["Biceps", "Brachialis"],
+            "equipment": "Dumbbells",
+            "reps": 8,
+            "sets": 1,
+            "rest_time": "60 seconds",
+            "benefits": [
+                "Improves bicep and forearm strength",
+                "Enhances grip strength"
+            ]
+        },
+        # Elbow flexion (shoulder, elbow, wrist) for the right and left arm, then
+        # shoulder-elbow-hip alignment measured at the shoulder (elbow, shoulder, hip)
+        'angles': {'right': (11, 13, 15), 'left': (12, 14, 16),
+                   'right_alignment': (13, 11, 23), 'left_alignment': (14, 12, 24)},
+        'counters': [
+            {'name': 'right', 'angle': 'right', 'transitions': [
+                step("Flex", above=155),
+                step("Up", after="Flex", above=47, below=155),
+                step("Down", after="Up", below=47, count=True),
+            ]},
+            {'name': 'left', 'angle': 'left', 'transitions': [
+                step("Flex", above=155),
+                step("Up", after="Flex", above=47, below=155),
+                step("Down", after="Up", below=47, count=True),
+            ]},
+        ],
+        'total': 'max',
+        # The progress bar shows both arms' average, as the hammer curl always has
+        'progress': 'mean',
+        'warnings': [
+            {'angle': 'right_alignment', 'above': 40,
+             'message': "Right Shoulder-Elbow-Hip Misalignment! Angle: {angle:.2f}°"},
+            {'angle': 'left_alignment', 'above': 40,
+             'message': "Left Shoulder-Elbow-Hip Misalignment! Angle: {angle:.2f}°"},
+        ],
+        'overlay': {
+            'lines': [((12, 14), ARM_COLOR, 4), ((14, 16), ARM_COLOR, 4),
+                      ((11, 13), ARM_COLOR, 4), ((13, 15), ARM_COLOR, 4)],
+            'points': [(12, ARM_COLOR), (14, ARM_COLOR), (16, ARM_COLOR),
+                       (11, ARM_COLOR), (13, ARM_COLOR), (15, ARM_COLOR)],
+            'angle_labels': [('left', 14, "Angle"), ('right', 13, "Angle")],
+            'stages': [('stage_right', "Right Stage", STAGE_POSITION),
+                       ('stage_left', "Left Stage", SECOND_STAGE_POSITION)],
+            'progress_max': 12,
+            'gauges': [('angle_right', "Right Gauge Meter", (1200, 80), 50, (0, 102, 204)),
+                       ('angle_left', "Left Gauge Meter", (1200, 240), 50, (0, 102, 204))],
+        },
+    },
+    "lunge": {
+        'info': {
+            "name": "Lunge",
+            "target_muscles": ["Quads", "Glutes", "Hamstrings", "Calves"],
+            "equipment": "Bodyweight or Dumbbells",
+            "reps": 10,
+            "sets": 2,
+            "rest_time": "60 seconds",
+            "benefits": [
+                "Builds single-leg strength",
+                "Improves balance and hip mobility"
+            ]
+        },
+        # Knee flexion (hip, knee, ankle); both knees bend in every lunge
+        'angles': {'left': (23, 25, 27), 'right': (24, 26, 28)},
+        'counters': [
+            {'name': 'left', 'angle': 'left', 'transitions': [
+                step("Standing", above=160),
+                step("Lowering", after="Standing", above=100, below=160),
+                step("Rising", after="Lowering", below=100, count=True),
+            ]},
+            {'name': 'right', 'angle': 'right', 'transitions': [
+                step("Standing", above=160),
+                step("Lowering", after="Standing", above=100, below=160),
+                step("Rising", after="Lowering", below=100, count=True),
+            ]},
+        ],
+        'total': 'max',
+        'overlay': {
+            'lines': [((23, 25), LEG_COLOR_LEFT, 2), ((25, 27), LEG_COLOR_LEFT, 2),
+                      ((24, 26), LEG_COLOR_RIGHT, 2), ((26, 28), LEG_COLOR_RIGHT, 2)],
+            'points': [(23, LEG_COLOR_LEFT), (25, LEG_COLOR_LEFT), (27, LEG_COLOR_LEFT),
+                       (24, LEG_COLOR_RIGHT), (26, LEG_COLOR_RIGHT), (28, LEG_COLOR_RIGHT)],
+            'angle_labels': [('left', 25, "Angle Left"), ('right', 26, "Angle Right")],
+            'stages': [('stage_left', "Left Stage", STAGE_POSITION),
+                       ('stage_right', "Right Stage", SECOND_STAGE_POSITION)],
+            'progress_max': 12,
+            'gauges': [('angle_left', "Left Knee", (1200, 80), 50, (0, 102, 204)),
+                       ('angle_right', "Right Knee", (1200, 240), 50, (0, 102, 204))],
+        },
+    },
+    "shoulder_press": {
+        'info': {
+            "name": "Shoulder Press",
+            "target_muscles": ["Deltoids", "Triceps", "Upper Chest"],
+            "equipment": "Dumbbells or Barbell",
+            "reps": 10,
+            "sets": 3,
+            "rest_time": "60 seconds",
+            "benefits": [
+                "Builds shoulder strength",
+                "Improves overhead stability"
+            ]
+        },
+        # Elbow extension (shoulder, elbow, wrist); a rep ends with the arms locked out overhead
+        'angles': {'left': (11, 13, 15), 'right': (12, 14, 16)},
+        'counters': [
+            {'name': 'left', 'angle': 'left', 'transitions': [
+                step("Down", below=90),
+                step("Pressing", after="Down", above=90, below=160),
+                step("Up", after="Pressing", above=160, count=True),
+            ]},
+            {'name': 'right', 'angle': 'right', 'transitions': [
+                step("Down", below=90),
+                step("Pressing", after="Down", above=90, below=160),
+                step("Up", after="Pressing", above=160, count=True),
+            ]},
+        ],
+        'total': 'max',
+        'overlay': {
+            'lines': [((11, 13), ARM_COLOR, 3), ((13, 15), ARM_COLOR, 3),
+                      ((12, 14), ARM_COLOR_RIGHT, 3), ((14, 16), ARM_COLOR_RIGHT, 3)],
+            'points': [(11, ARM_COLOR), (13, ARM_COLOR), (15, ARM_COLOR),
+                       (12, ARM_COLOR_RIGHT), (14, ARM_COLOR_RIGHT), (16, ARM_COLOR_RIGHT)],
+            'angle_labels': [('left', 13, "Angle"), ('right', 14, "Angle")],
+            'stages': [('stage_left', "Left Stage", STAGE_POSITION),
+                       ('stage_right', "Right Stage", SECOND_STAGE_POSITION)],
+            'progress_max': 10,
+            'gauges': [('angle_left', "Left Elbow", (1200, 80), 50, (0, 102, 204)),
+                       ('angle_right', "Right Elbow", (1200, 240), 50, (0, 102, 204))],
+        },
+    },
+    "plank": {
+        'info': {
+            "name": "Plank",
+            "target_muscles": ["Core", "Shoulders", "Glutes"],
+            "equipment": "Bodyweight",
+            "reps": 30,  # seconds held per set
+            "sets": 3,
+            "rest_time": "45 seconds",
+            "benefits": [
+                "Builds core endurance",
+                "Improves posture"
+            ]
+        },
+        # Body line (shoulder, hip, ankle); the rep count is the number of seconds held straight
+        'angles': {'body': (11, 23, 27)},
+        'counters': [
+            {'angle': 'body', 'hold': (160, None), 'stages': ("Hold", "Break")},
+        ],
+        'warnings': [
+            {'angle': 'body', 'below': 150, 'message': "Keep your body in a straight line! Angle: {angle:.0f}°"},
+        ],
+        'overlay': {
+            'lines': [((11, 23), LEG_COLOR_LEFT, 2), ((23, 27), LEG_COLOR_LEFT, 2)],
+            'points': [(11, LEG_COLOR_LEFT), (23, LEG_COLOR_LEFT), (27, LEG_COLOR_LEFT)],
+            'angle_labels': [('body', 23, "Body Angle")],
+            'stages': [('stage', "Stage", STAGE_POSITION)],
+            'progress_max': 60,
+            'gauges': [('angle', "Body Line", (135, 415), 75, (0, 0, 255))],
+        },
+    },
+}
+
+
+def get_spec(exercise_type):
+    return EXERCISES.get(exercise_type)
+
+
+def overlay_connections():
+    """Landmark pairs drawn for each exercise, for the browser-side overlay."""
+    return {name: [list(pair) for pair, _, _ in spec['overlay']['lines']] for name, spec in EXERCISES.items()}
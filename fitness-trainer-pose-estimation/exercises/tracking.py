@@ -0,0 +1,25 @@
+from exercises.engine import ExerciseEngine
+from exercises.registry import EXERCISES
+
+
+def create_exercise(exercise_type):
+    """Build the counter for an exercise type, or None if it is unknown."""
+    spec = EXERCISES.get(exercise_type)
+    return ExerciseEngine(spec) if spec else None
+
+
+def track_exercise(exercise, exercise_type, landmarks, frame, draw=True, timestamp=None):
+    """Advance a counter by one frame; returns (exercise_data, counter).
+
+    exercise_data is the engine's state dict. timestamp defaults to the wall
+    clock; pass frame times when replaying recordings.
+    """
+    exercise_data = exercise.update(landmarks, frame.shape, timestamp)
+    if draw:
+        exercise.draw(frame, landmarks)
+    return exercise_data, exercise_data['counter']
+
+
+def describe_exercise_data(exercise_type, exercise_data):
+    """Turn a tracker state into a JSON friendly dict with rounded angles."""
+    return {key: round(value, 1) if key.startswith('angle') else value for key, value in exercise_data.items()}
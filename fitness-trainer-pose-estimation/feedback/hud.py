@@ -0,0 +1,104 @@
+# feedback/hud.py
+import cv2
+import numpy as np
+
+from exercises.registry import EXERCISES
+from feedback.indicators import display_counter_poisiton, display_progress_position
+from utils.draw_text_with_background import draw_text_with_background
+from utils.drawing_utils import (display_counter, display_stage, draw_gauge_face, draw_gauge_needle,
+                                 draw_progress_bar_background, draw_progress_bar_fill)
+
+HEADER_POSITION = (40, 50)
+HEADER_SPACING = 30
+HEADER_COLOR = (255, 255, 255)
+HEADER_BACKGROUND = (118, 29, 14)
+PROGRESS_SIZE = (200, 20)
+PROGRESS_COLOR = (163, 245, 184)
+
+
+class HudCompositor:
+    """Exercise HUD drawn as a cached static layer plus the per-frame values.
+
+    The header lines, progress bar background and label, and gauge faces are
+    rendered once per frame size and header text into a layer, which is
+    alpha-composited onto each frame: one cv2.copyTo for the opaque pixels
+    plus a small blend for the antialiased text edges. Only
+    the counter, stages, progress fill and gauge needles are drawn per frame.
+    """
+
+    def __init__(self, exercise_type):
+        self.exercise_type = exercise_type
+        self.overlay = EXERCISES[exercise_type]['overlay']
+        self._layers = {}
+
+    def render(self, frame, exercise_data=None, header=()):
+        """Draw header lines, plus the indicators when exercise_data is given."""
+        key = (frame.shape, tuple(header), exercise_data is not None)
+        layer = self._layers.get(key)
+        if layer is None:
+            # Header text changes once per set at most, so a handful of layers covers a session
+            if len(self._layers) >= 4:
+                self._layers.clear()
+            layer = self._layers[key] = self._build_layer(frame.shape, header, exercise_data is not None)
+        self._composite(frame, layer)
+        if exercise_data is not None:
+            self._draw_values(frame, exercise_data)
+        return frame
+
+    def _draw_static(self, canvas, header, indicators):
+        if indicators:
+            draw_progress_bar_background(canvas, self.exercise_type, display_progress_position, PROGRESS_SIZE)
+            for _, text, position, radius, _ in self.overlay.get('gauges', []):
+                draw_gauge_face(canvas, text, position, radius)
+        # The header goes on top, the last header line overlaps the progress label
+        for i, text in enumerate(header):
+            x, y = HEADER_POSITION
+            draw_text_with_background(canvas, text, (x, y + i * HEADER_SPACING), cv2.FONT_HERSHEY_DUPLEX, 0.7,
+                                      HEADER_COLOR, HEADER_BACKGROUND, 1)
+
+    def _build_layer(self, shape, header, indicators):
+        # Draw on a black and a white canvas: a pixel covered with alpha a in colour C
+        # reads a*C on black and a*C + (1 - a)*255 on white, so the pair gives the
+        # premultiplied colour and the coverage of every pixel, black text included
+        dark = np.zeros(shape, dtype=np.uint8)
+        light = np.full(shape, 255, dtype=np.uint8)
+        self._draw_static(dark, header, indicators)
+        self._draw_static(light, header, indicators)
+        transparency = light.astype(np.uint16) - dark
+        covered = (transparency < 255).any(axis=2)
+        rows, cols = np.nonzero(covered.any(axis=1))[0], np.nonzero(covered.any(axis=0))[0]
+        if not len(rows):
+            return None
+        y0, y1, x0, x1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+        opaque = (transparency == 0).all(axis=2)
+        # Antialiased text edges are the only partially covered pixels, a few per glyph
+        edges = covered & ~opaque
+        return ((y0, y1, x0, x1), dark[y0:y1, x0:x1].copy(), opaque[y0:y1, x0:x1].astype(np.uint8),
+                np.flatnonzero(edges), dark[edges], transparency[edges].astype(np.uint8))
+
+    @staticmethod
+    def _composite(frame, layer):
+        """Alpha-composite the static layer: copy opaque pixels, blend the edges."""
+        if layer is None:
+            return
+        (y0, y1, x0, x1), pixels, opaque, edges, edge_colors, edge_transparency = layer
+        # Writes through the view into frame; far faster than np.copyto with a boolean mask
+        cv2.copyTo(pixels, opaque, frame[y0:y1, x0:x1])
+        if not len(edges):
+            return
+        flat = frame.reshape(-1, 3)
+        blended = flat.take(edges, axis=0)
+        cv2.multiply(blended, edge_transparency, blended, scale=1 / 255.0)
+        cv2.add(blended, edge_colors, blended)
+        flat[edges] = blended
+
+    def _draw_values(self, frame, exercise_data):
+        display_counter(frame, exercise_data['counter'], position=display_counter_poisiton, color=(0, 0, 0),
+                        background_color=(192, 192, 192))
+        for key, label, position in self.overlay.get('stages', []):
+            display_stage(frame, exercise_data[key], label, position=position, color=(0, 0, 0),
+                          background_color=(192, 192, 192))
+        draw_progress_bar_fill(frame, exercise_data['progress'], display_progress_position, PROGRESS_SIZE,
+                               PROGRESS_COLOR, self.overlay.get('progress_max', 10))
+        for key, _, position, radius, color in self.overlay.get('gauges', []):
+            draw_gauge_needle(frame, exercise_data[key], position, radius, color)
@@ -1,82 +1,127 @@
+import argparse
+import logging
+import time
+
 import cv2
-from pose_estimation.estimation import PoseEstimator
-from exercises.squat import Squat
-from exercises.hammer_curl import HammerCurl
-from exercises.push_up import PushUp
-from feedback.layout import layout_indicators
+from exercises.registry import EXERCISES
+from exercises.tracking import create_exercise, track_exercise
+from pose_estimation.backends import TIERS, DEFAULT_TIER, BACKENDS
+from feedback.hud import HudCompositor
 from feedback.information import get_exercise_info
-from utils.draw_text_with_background import draw_text_with_background
 
-def main():
-    video_path = r"C:\Users\user\Fitness-Trainer\data\squat.mp4"
-    video_path = r"C:\Users\user\Fitness-Trainer\data\push_up.mp4"
-    video_path = r"C:\Users\user\Fitness-Trainer\data\dumbel-workout.mp4"
 
-    exercise_type = "hammer_curl"  # Determine Exercise Type ("hammer_curl", "squat", "push_up")
+def parse_args():
+    parser = argparse.ArgumentParser(description="Exercise tracker for a webcam, a video, or a batch of videos")
+    parser.add_argument('--exercise', choices=sorted(EXERCISES),
+                        help="Exercise type (default for batch videos without one in the manifest)")
+    parser.add_argument('--video', default='0', help="Video file or camera index (default: webcam 0)")
+    parser.add_argument('--output', help="Write the annotated video to this XVID .avi file")
+    parser.add_argument('--no-display', action='store_true', help="Do not open a preview window")
+    parser.add_argument('--tier', choices=list(TIERS), default=DEFAULT_TIER, help="Pose model performance tier")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='mediapipe', help="Pose engine")
+    parser.add_argument('--smoothing-cutoff', type=float, default=0.0,
+                        help="One-Euro landmark filter minimum cutoff in Hz, e.g. 2 (default 0: no smoothing)")
+    parser.add_argument('--smoothing-beta', type=float, default=5.0, help="One-Euro filter speed coefficient")
+    parser.add_argument('--inference-fps', type=float, default=0,
+                        help="Run pose inference at this rate away from stage thresholds (default: every frame)")
 
-    cap = cv2.VideoCapture(0)
-    pose_estimator = PoseEstimator()
+    batch = parser.add_argument_group("batch analysis")
+    batch.add_argument('--batch', metavar='SOURCE',
+                       help="Directory of videos or manifest CSV (path, exercise_type) to analyze offline")
+    batch.add_argument('--out', default='output/analysis', help="Directory for timelines and summary.csv")
+    batch.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    batch.add_argument('--render', action='store_true', help="Also write annotated videos")
+    batch.add_argument('--format', choices=('parquet', 'csv'), default='parquet',
+                       help="Timeline format; falls back to CSV without pandas/pyarrow")
+    return parser.parse_args()
 
-    if exercise_type == "hammer_curl":
-        exercise = HammerCurl()
-    elif exercise_type == "squat":
-        exercise = Squat()
-    elif exercise_type == "push_up":
-        exercise = PushUp()
-    else:
-        print("Invalid exercise type.")
-        return
 
+def run_live(args):
+    from pose_estimation.estimation import PoseEstimator
+    from pose_estimation.rate_control import AdaptiveRateController
+    from pose_estimation.filters import OneEuroFilterBank
+
+    exercise_type = args.exercise or "hammer_curl"
+    is_camera = args.video.isdigit()
+    cap = cv2.VideoCapture(int(args.video) if is_camera else args.video)
+    pose_estimator = PoseEstimator(tier=args.tier, backend=args.backend)
+    rate_controller = AdaptiveRateController(pose_estimator, args.inference_fps) if args.inference_fps else None
+    landmark_filter = OneEuroFilterBank(args.smoothing_cutoff, args.smoothing_beta) if args.smoothing_cutoff else None
+    exercise = create_exercise(exercise_type)
     exercise_info = get_exercise_info(exercise_type)
+    hud = HudCompositor(exercise_type)
+    header = (f"Exercise: {exercise_info.get('name', 'N/A')}",
+              f"Reps: {exercise_info.get('reps', 0)}",
+              f"Sets: {exercise_info.get('sets', 0)}")
 
-    fourcc = cv2.VideoWriter_fourcc(*'XVID')
-    output_file = r"C:\Users\user\Fitness-Trainer\output\push-up.avi"
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    out = cv2.VideoWriter(output_file, fourcc, fps, (frame_width, frame_height))
+    out = None
+    if args.output:
+        fourcc = cv2.VideoWriter_fourcc(*'XVID')
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        out = cv2.VideoWriter(args.output, fourcc, fps, (frame_width, frame_height))
+
+    window_name = f"{exercise_type.replace('_', ' ').title()} Tracker"
+    if not args.no_display:
+        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(window_name, 1920, 1080)
 
     while cap.isOpened():
         ret, frame = cap.read()
         if not ret:
             break
 
-        results = pose_estimator.estimate_pose(frame, exercise_type)
-        if results.pose_landmarks:
-            if exercise_type == "squat":
-                counter, angle, stage = exercise.track_squat(results.pose_landmarks.landmark, frame)
-                layout_indicators(frame, exercise_type, (counter, angle, stage))
-            elif exercise_type == "hammer_curl":
-                (counter_right, angle_right, counter_left, angle_left,
-                 warning_message_right, warning_message_left, progress_right, progress_left, stage_right, stage_left) = exercise.track_hammer_curl(
-                    results.pose_landmarks.landmark, frame)
-                layout_indicators(frame, exercise_type,
-                                  (counter_right, angle_right, counter_left, angle_left,
-                                   warning_message_right, warning_message_left, progress_right, progress_left, stage_right, stage_left))
-            elif exercise_type == "push_up":
-                counter, angle, stage = exercise.track_push_up(results.pose_landmarks.landmark, frame)
-                layout_indicators(frame, exercise_type, (counter, angle, stage))
-
-        draw_text_with_background(frame, f"Exercise: {exercise_info.get('name', 'N/A')}", (40, 50),
-                                  cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255,), (118, 29, 14, 0.79), 1)
-        draw_text_with_background(frame, f"Reps: {exercise_info.get('reps', 0)}", (40, 80),
-                                  cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255,), (118, 29, 14, 0.79), 1)
-        draw_text_with_background(frame, f"Sets: {exercise_info.get('sets', 0)}", (40, 110),
-                                  cv2.FONT_HERSHEY_DUPLEX, 0.7, (255, 255, 255,), (118, 29, 14, 0.79),1 )
-
-        out.write(frame)
-
-        cv2.namedWindow(f"{exercise_type.replace('_', ' ').title()} Tracker", cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(f"{exercise_type.replace('_', ' ').title()} Tracker", 1920, 1080)
-        cv2.imshow(f"{exercise_type.replace('_', ' ').title()} Tracker", frame)
-
-        if cv2.waitKey(10) & 0xFF == ord('q'):
-            break
+        # Recorded videos are paced by their own timestamps, cameras by the clock
+        timestamp = time.monotonic() if is_camera else cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if rate_controller is not None:
+            landmarks = rate_controller.estimate_landmarks(frame, exercise=exercise, timestamp=timestamp)
+        else:
+            landmarks = pose_estimator.estimate_landmarks(frame)
+        if landmarks is not None and landmark_filter is not None:
+            landmarks = landmark_filter(landmarks, timestamp)
+        if landmarks is not None:
+            pose_estimator.draw_exercise_lines(frame, landmarks, exercise_type)
+            exercise_data, _ = track_exercise(exercise, exercise_type, landmarks, frame, timestamp=timestamp)
+        else:
+            exercise_data = None
+
+        hud.render(frame, exercise_data, header)
+
+        if out is not None:
+            out.write(frame)
+
+        if not args.no_display:
+            cv2.imshow(window_name, frame)
+            if cv2.waitKey(10) & 0xFF == ord('q'):
+                break
 
     cap.release()
-    out.release()
+    if out is not None:
+        out.release()
     cv2.destroyAllWindows()
 
 
+def run_batch_analysis(args):
+    from analysis.batch import collect_jobs, run_batch
+
+    jobs = collect_jobs(args.batch, args.exercise)
+    if not jobs:
+        print(f"No videos found in {args.batch}")
+        return
+    run_batch(jobs, args.out, workers=args.workers, render=args.render, output_format=args.format,
+              inference_fps=args.inference_fps, tier=args.tier, backend=args.backend,
+              smoothing=(args.smoothing_cutoff, args.smoothing_beta) if args.smoothing_cutoff else None)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    args = parse_args()
+    if args.batch:
+        run_batch_analysis(args)
+    else:
+        run_live(args)
+
+
 if __name__ == '__main__':
     main()
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 def calculate_angle(a,b,c):
     # abc [x,y,z]
@@ -13,8 +14,46 @@ def calculate_angle(a,b,c):
     magnitude_ba = math.sqrt(ba[0] ** 2 + ba[1] ** 2)
     magnitude_bc = math.sqrt(bc[0] ** 2 + bc[1] ** 2)
 
-    cosine_angle = dot_product / (magnitude_ba * magnitude_bc)
+    # A zero-length segment has no direction; treat the joint as straight
+    if magnitude_ba == 0 or magnitude_bc == 0:
+        return 180.0
+
+    # Rounding can push the cosine just outside [-1, 1]
+    cosine_angle = max(-1.0, min(1.0, dot_product / (magnitude_ba * magnitude_bc)))
 
     angle = math.degrees(math.acos(cosine_angle))
 
-    return angle
\ No newline at end of file
+    return angle
+
+def calculate_angles(triplets):
+    """Vectorized calculate_angle for many joints at once.
+
+    triplets has shape (..., 3, D) holding (a, b, c) points with D = 2 or 3,
+    e.g. (N, 3, 2) for one frame or (T, N, 3, 3) for a recorded sequence.
+    Returns the angle at b in degrees with shape (...). Like calculate_angle,
+    zero-length segments give 180 (a straight joint can never complete a rep)
+    and cosines are clipped to [-1, 1].
+    """
+    triplets = np.asarray(triplets, dtype=np.float64)
+    ba = triplets[..., 0, :] - triplets[..., 1, :]
+    bc = triplets[..., 2, :] - triplets[..., 1, :]
+
+    dot_product = (ba * bc).sum(axis=-1)
+    magnitudes = np.sqrt((ba * ba).sum(axis=-1) * (bc * bc).sum(axis=-1))
+    degenerate = magnitudes == 0
+    cosine_angle = np.where(degenerate, -1.0, dot_product / np.where(degenerate, 1.0, magnitudes))
+    return np.degrees(np.arccos(np.clip(cosine_angle, -1.0, 1.0)))
+
+def joint_angles(landmarks, triplets, frame_shape=None, use_z=False):
+    """Angles for landmark index triplets of a (33, 4) frame or (T, 33, 4) sequence.
+
+    triplets is an (N, 3) array of landmark indices with the vertex in the
+    middle. With frame_shape the normalized coordinates are scaled to pixels
+    first so angles match what is drawn on screen; use_z adds MediaPipe's depth
+    (which shares the x scale) for 3-D angles. Returns shape (N,) or (T, N).
+    """
+    coords = np.asarray(landmarks, dtype=np.float64)[..., :3 if use_z else 2]
+    if frame_shape is not None:
+        height, width = frame_shape[:2]
+        coords = coords * np.array([width, height, width][:coords.shape[-1]])
+    return calculate_angles(coords[..., np.asarray(triplets), :])
@@ -0,0 +1,147 @@
+import time
+import logging
+
+import numpy as np
+
+from pose_estimation.landmarks import NUM_LANDMARKS, landmarks_to_array
+
+logger = logging.getLogger(__name__)
+
+# Named performance tiers, from cheapest to most accurate. input_size caps the
+# longest side of the frame handed to the backend; landmarks are normalized,
+# so downscaling does not change their coordinates.
+TIERS = {
+    'lite': {'model_complexity': 0, 'input_size': 480, 'smooth_landmarks': True,
+             'min_detection_confidence': 0.5, 'min_tracking_confidence': 0.5},
+    'full': {'model_complexity': 1, 'input_size': 640, 'smooth_landmarks': True,
+             'min_detection_confidence': 0.5, 'min_tracking_confidence': 0.5},
+    'heavy': {'model_complexity': 2, 'input_size': 960, 'smooth_landmarks': True,
+              'min_detection_confidence': 0.5, 'min_tracking_confidence': 0.5},
+}
+DEFAULT_TIER = 'full'
+
+
+def tier_options(tier, **overrides):
+    """Options for a named tier with per-deployment overrides applied."""
+    if tier not in TIERS:
+        raise ValueError(f"Unknown pose tier: {tier}")
+    options = dict(TIERS[tier])
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return options
+
+
+class MediaPipeBackend:
+    """MediaPipe Pose (legacy solutions API) configured from a tier."""
+
+    def __init__(self, tier=DEFAULT_TIER, **overrides):
+        import mediapipe as mp
+        options = tier_options(tier, **overrides)
+        self.tier = tier
+        self.input_size = options.pop('input_size')
+        self.pose = mp.solutions.pose.Pose(**options)
+
+    def infer(self, rgb_frame):
+        """(33, 4) landmark array for an RGB frame, or None if no pose was found."""
+        results = self.pose.process(rgb_frame)
+        if not results.pose_landmarks:
+            return None
+        return landmarks_to_array(results.pose_landmarks.landmark)
+
+    def reset(self):
+        """Forget the tracked pose and smoothing state, e.g. before frames in another coordinate frame."""
+        self.pose.reset()
+
+    def close(self):
+        self.pose.close()
+
+
+class FakeBackend:
+    """Deterministic stand-in for tests and benchmarks without a model.
+
+    Returns a person squatting in the middle of the frame, one cycle every
+    period calls, independent of the pixels it is given. latency simulates the
+    tier's inference time (defaults to LATENCY[tier] when simulate_latency).
+    """
+
+    LATENCY = {'lite': 0.005, 'full': 0.015, 'heavy': 0.040}
+
+    def __init__(self, tier=DEFAULT_TIER, period=60, latency=None, simulate_latency=False, **overrides):
+        options = tier_options(tier, **overrides)
+        self.tier = tier
+        self.input_size = options['input_size']
+        self.period = period
+        self.latency = latency if latency is not None else (self.LATENCY[tier] if simulate_latency else 0.0)
+        self.calls = 0
+
+    def infer(self, rgb_frame):
+        if self.latency:
+            time.sleep(self.latency)
+        phase = 2 * np.pi * (self.calls % self.period) / self.period
+        self.calls += 1
+        # Knee angle swings between 178 and 70 degrees
+        knee_angle = np.radians(178.0 - 54.0 * (1 - np.cos(phase)))
+        height, width = rgb_frame.shape[:2]
+        landmarks = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+        landmarks[:, 0], landmarks[:, 1], landmarks[:, 3] = 0.5, 0.5, 0.99
+        for shoulder, elbow, wrist, hip, knee, ankle, x in ((11, 13, 15, 23, 25, 27, 0.45),
+                                                            (12, 14, 16, 24, 26, 28, 0.55)):
+            landmarks[shoulder, :2] = (x, 0.3)
+            landmarks[elbow, :2] = (x, 0.4)
+            landmarks[wrist, :2] = (x, 0.5)
+            landmarks[hip, :2] = (x, 0.55)
+            # Place the knee at the current angle from the hip->shoulder direction in pixel space
+            landmarks[knee, 0] = x + np.sin(knee_angle) * 0.2 * height / width
+            landmarks[knee, 1] = 0.55 - np.cos(knee_angle) * 0.2
+            landmarks[ankle, :2] = (landmarks[knee, 0], min(landmarks[knee, 1] + 0.2, 0.99))
+        return landmarks
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+
+BACKENDS = {
+    'mediapipe': MediaPipeBackend,
+    'fake': FakeBackend,
+}
+
+
+def create_backend(name='mediapipe', tier=DEFAULT_TIER, **options):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown pose backend: {name}")
+    return BACKENDS[name](tier, **options)
+
+
+def benchmark_tier(name, tier, frame, frames=30, warmup=5, **options):
+    """Frames per second a backend tier sustains on frame, preprocessing included."""
+    # Imported here to avoid a cycle; PoseEstimator builds on this module
+    from pose_estimation.estimation import PoseEstimator
+    estimator = PoseEstimator(tier=tier, backend=name, **options)
+    try:
+        for _ in range(warmup):
+            estimator.estimate_landmarks(frame)
+        start = time.perf_counter()
+        for _ in range(frames):
+            estimator.estimate_landmarks(frame)
+        return frames / (time.perf_counter() - start)
+    finally:
+        estimator.close()
+
+
+def select_tier(target_fps, name='mediapipe', frame_shape=(720, 1280, 3), frames=30, **options):
+    """Startup self-benchmark: the most accurate tier that still reaches target_fps.
+
+    Falls back to 'lite' when none does. Returns (tier, {tier: fps}). The test
+    frame is noise, so MediaPipe runs its person detector on every frame, which
+    costs about as much as tracking a person found earlier.
+    """
+    frame = np.random.default_rng(0).integers(0, 255, frame_shape, dtype=np.uint8)
+    measured = {}
+    for tier in sorted(TIERS, key=lambda tier: TIERS[tier]['model_complexity'], reverse=True):
+        measured[tier] = benchmark_tier(name, tier, frame, frames, **options)
+        logger.info(f"Pose tier {tier}: {measured[tier]:.1f} fps")
+        if measured[tier] >= target_fps:
+            return tier, measured
+    return 'lite', measured
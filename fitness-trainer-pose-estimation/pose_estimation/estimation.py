@@ -1,81 +1,104 @@
 import cv2
-import mediapipe as mp
-from exercises.hammer_curl import HammerCurl
+import numpy as np
+from pose_estimation.backends import DEFAULT_TIER, create_backend
+from pose_estimation.landmarks import to_pixels
+from pose_estimation.roi import RoiTracker, crop_to_frame
+from exercises.registry import EXERCISES
 
 class PoseEstimator:
-    def __init__(self):
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose()
-        self.mp_drawing = mp.solutions.drawing_utils
+    def __init__(self, roi_tracking=False, tier=DEFAULT_TIER, backend='mediapipe', **backend_options):
+        # The engine and its performance tier are swappable; see pose_estimation/backends.py
+        self.backend_name = backend
+        self.backend_options = backend_options
+        self.backend = create_backend(backend, tier, **backend_options)
+        # Crop to the person found in the previous frame instead of converting the whole frame
+        self.roi_tracker = RoiTracker() if roi_tracking else None
+        # Box of the frames the backend has been tracking in (None: full frames)
+        self._input_box = None
+
+    @property
+    def tier(self):
+        return self.backend.tier
+
+    def set_tier(self, tier):
+        """Switch to another performance tier, rebuilding the backend only if it changes."""
+        if tier is None or tier == self.backend.tier:
+            return
+        self.backend.close()
+        self.backend = create_backend(self.backend_name, tier, **self.backend_options)
+        self._input_box = None
+        if self.roi_tracker is not None:
+            self.roi_tracker.reset()
+
+    def reset(self):
+        """Forget the tracked pose, e.g. before a new video: the backend's tracking and the ROI crop."""
+        self.backend.reset()
+        self._input_box = None
+        if self.roi_tracker is not None:
+            self.roi_tracker.reset()
+
+    def close(self):
+        self.backend.close()
 
     def estimate_pose(self, frame, exercise_type):
-        # BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        landmarks = self.estimate_landmarks(frame)
+        if landmarks is not None:
+            self.draw_exercise_lines(frame, landmarks, exercise_type)
+        return landmarks
+
+    def estimate_landmarks(self, frame, is_rgb=False):
+        """Run pose inference and return the (33, 4) landmark array, or None if no pose was found.
+
+        With ROI tracking only the crop around the previous pose is converted
+        and handed to the model, so the person fills more of its input;
+        landmarks are always returned in full-frame coordinates. The model
+        tracks and smooths in the normalized coordinates of the images it is
+        given, so it is reset whenever the crop box changes or it falls back
+        to the full frame.
+        """
+        box = self.roi_tracker.crop_box() if self.roi_tracker is not None else None
+        landmarks = None
+        if box is not None:
+            x0, y0, x1, y1 = box
+            landmarks = self._process_in(box, frame[y0:y1, x0:x1], is_rgb)
+            if landmarks is not None:
+                landmarks = crop_to_frame(landmarks, box, frame.shape)
+        if landmarks is None:
+            # No ROI yet or the person left it: search the full frame
+            landmarks = self._process_in(None, frame, is_rgb)
+        if self.roi_tracker is not None:
+            self.roi_tracker.update(landmarks, frame.shape)
+        return landmarks
+
+    def _process_in(self, box, frame, is_rgb):
+        """process() for frames cropped to box, resetting the backend when the box differs from the last one."""
+        if box != self._input_box:
+            self.backend.reset()
+            self._input_box = box
+        return self.process(frame, is_rgb)
+
+    def process(self, frame, is_rgb=False):
+        """Run the backend on a BGR (or already RGB) frame without drawing on it.
+
+        The frame is first scaled down to the tier's input size; returns
+        normalized landmarks or None.
+        """
+        height, width = frame.shape[:2]
+        scale = self.backend.input_size / max(height, width)
+        if scale < 1:
+            frame = cv2.resize(frame, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_LINEAR)
+
+        # BGR to RGB; RGB crops go to the model as is and must be contiguous
+        rgb_frame = np.ascontiguousarray(frame) if is_rgb else cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
         # Pose estimate
-        results = self.pose.process(rgb_frame)
-
-        # Draw landmarks and specific connections based on exercise type
-        if results.pose_landmarks:
-            # Draw specific landmarks and connections based on exercise_type
-            if exercise_type == "squat":
-                self.draw_squat_lines(frame, results.pose_landmarks.landmark)
-            elif exercise_type == "push_up":
-                self.draw_push_up_lines(frame, results.pose_landmarks.landmark)
-            elif exercise_type == "hammer_curl":
-                self.draw_hammerl_curl_lines(frame, results.pose_landmarks.landmark)
-
-        return results
-    def draw_hammerl_curl_lines(self, frame, landmarks):
-
-        shoulder_right = [int(landmarks[11].x * frame.shape[1]), int(landmarks[11].y * frame.shape[0])]
-        elbow_right = [int(landmarks[13].x * frame.shape[1]), int(landmarks[13].y * frame.shape[0])]
-        hip_right = [int(landmarks[23].x * frame.shape[1]), int(landmarks[23].y * frame.shape[0])]
-        wrist_right = [int(landmarks[15].x * frame.shape[1]), int(landmarks[15].y * frame.shape[0])]
-
-        # Left arm landmarks (shoulder, elbow, hip, wrist)
-        shoulder_left = [int(landmarks[12].x * frame.shape[1]), int(landmarks[12].y * frame.shape[0])]
-        elbow_left = [int(landmarks[14].x * frame.shape[1]), int(landmarks[14].y * frame.shape[0])]
-        hip_left = [int(landmarks[24].x * frame.shape[1]), int(landmarks[24].y * frame.shape[0])]
-        wrist_left = [int(landmarks[16].x * frame.shape[1]), int(landmarks[16].y * frame.shape[0])]
-
-        # Draw lines with improved style
-        cv2.line(frame, shoulder_left, elbow_left, (0, 0, 255), 4,2)
-        cv2.line(frame, elbow_left, wrist_left, (0, 0, 255), 4,2)
-
-        cv2.line(frame, shoulder_right, elbow_right, (0, 0, 255), 4,2)
-        cv2.line(frame, elbow_right, wrist_right, (0, 0, 255), 4,2)
-
-
-
-    def draw_squat_lines(self, frame, landmarks):
-        # Squat specific lines (hip, knee, shoulder)
-        hip = [int(landmarks[23].x * frame.shape[1]), int(landmarks[23].y * frame.shape[0])]
-        knee = [int(landmarks[25].x * frame.shape[1]), int(landmarks[25].y * frame.shape[0])]
-        shoulder = [int(landmarks[11].x * frame.shape[1]), int(landmarks[11].y * frame.shape[0])]
-
-        hip_right = [int(landmarks[24].x * frame.shape[1]), int(landmarks[24].y * frame.shape[0])]
-        knee_right = [int(landmarks[26].x * frame.shape[1]), int(landmarks[26].y * frame.shape[0])]
-        shoulder_right = [int(landmarks[12].x * frame.shape[1]), int(landmarks[12].y * frame.shape[0])]
-
-        # Draw lines for squat
-        cv2.line(frame, shoulder, hip, (178, 102, 255), 2)
-        cv2.line(frame, hip, knee, (178, 102, 255), 2)
-        cv2.line(frame, shoulder_right, hip_right, (51, 153, 255), 2)
-        cv2.line(frame, hip_right, knee_right, (51, 153, 255), 2)
-
-    def draw_push_up_lines(self, frame, landmarks):
-        # Push-up specific lines (shoulder, elbow, wrist)
-        shoulder_left = [int(landmarks[11].x * frame.shape[1]), int(landmarks[11].y * frame.shape[0])]
-        elbow_left = [int(landmarks[13].x * frame.shape[1]), int(landmarks[13].y * frame.shape[0])]
-        wrist_left = [int(landmarks[15].x * frame.shape[1]), int(landmarks[15].y * frame.shape[0])]
-
-        shoulder_right = [int(landmarks[12].x * frame.shape[1]), int(landmarks[12].y * frame.shape[0])]
-        elbow_right = [int(landmarks[14].x * frame.shape[1]), int(landmarks[14].y * frame.shape[0])]
-        wrist_right = [int(landmarks[16].x * frame.shape[1]), int(landmarks[16].y * frame.shape[0])]
-
-        # Draw lines for push-up
-        cv2.line(frame, shoulder_left, elbow_left, (0, 0, 255), 2)
-        cv2.line(frame, elbow_left, wrist_left, (0, 0, 255), 2)
-        cv2.line(frame, shoulder_right, elbow_right, (102, 0, 0), 2)
-        cv2.line(frame, elbow_right, wrist_right, (102, 0, 0), 2)
+        return self.backend.infer(rgb_frame)
+
+    def draw_exercise_lines(self, frame, landmarks, exercise_type):
+        """Draw the exercise specific connections from a (33, 4) landmark array."""
+        spec = EXERCISES.get(exercise_type)
+        if spec is None:
+            return
+        points = to_pixels(landmarks, frame.shape).tolist()
+        for (start, end), color, thickness in spec['overlay']['lines']:
+            cv2.line(frame, points[start], points[end], color, thickness, cv2.LINE_AA)
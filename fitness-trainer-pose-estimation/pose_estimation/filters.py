@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+
+
+class OneEuroFilterBank:
+    """One-Euro filter over every landmark coordinate at once.
+
+    Smooths the x, y, z columns of a (33, 4) landmark array in one NumPy pass
+    per frame; visibility is passed through. Each coordinate gets its own
+    adaptive cutoff: min_cutoff (Hz) removes jitter while a joint is still,
+    beta raises the cutoff with speed so fast movements are not lagged, and
+    d_cutoff smooths the speed estimate itself.
+    """
+
+    def __init__(self, min_cutoff=2.0, beta=5.0, d_cutoff=1.0, max_gap=0.5):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        # Restart instead of smoothing across a gap this long (seconds)
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self):
+        self._value = None
+        self._speed = None
+        self._last_time = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, landmarks, timestamp):
+        """Filtered copy of a landmark array; None resets the filter and is returned as is."""
+        if landmarks is None:
+            self.reset()
+            return None
+        coords = landmarks[:, :3].astype(np.float64)
+        dt = timestamp - self._last_time if self._last_time is not None else 0.0
+        if self._value is None or dt <= 0 or dt > self.max_gap:
+            self._value = coords
+            self._speed = np.zeros_like(coords)
+            self._last_time = timestamp
+            return landmarks
+
+        speed = (coords - self._value) / dt
+        self._speed += self._alpha(self.d_cutoff, dt) * (speed - self._speed)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._speed)
+        tau = 1.0 / (2 * math.pi * cutoff)
+        alpha = 1.0 / (1.0 + tau / dt)
+        self._value += alpha * (coords - self._value)
+        self._last_time = timestamp
+
+        filtered = landmarks.copy()
+        filtered[:, :3] = self._value
+        return filtered
@@ -0,0 +1,24 @@
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+
+def landmarks_to_array(landmarks):
+    """Pack MediaPipe landmarks into a (33, 4) float32 array of x, y, z, visibility.
+
+    Built once per frame; every tracker and drawer reads from this array instead
+    of going through the protobuf attributes again.
+    """
+    return np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks], dtype=np.float32)
+
+
+def to_pixels(landmarks, frame_shape):
+    """Pixel coordinates of every landmark as an (N, 2) int32 array."""
+    return (landmarks[:, :2] * np.array((frame_shape[1], frame_shape[0]), dtype=np.float32)).astype(np.int32)
+
+
+def landmarks_payload(landmarks):
+    """Compact [x, y, z, visibility] rows for sending landmarks to clients."""
+    payload = np.round(landmarks.astype(np.float64), 4)
+    payload[:, 3] = np.round(payload[:, 3], 2)
+    return payload.tolist()
@@ -0,0 +1,72 @@
+import numpy as np
+
+
+class RoiTracker:
+    """Padded bounding box around the person, derived from the previous frame's landmarks.
+
+    The box only moves when the person gets close to its edge or it becomes
+    much larger than needed, so the model sees a stable crop from frame to
+    frame. Returns None (use the full frame) until a pose has been found and
+    after tracking is lost.
+    """
+
+    def __init__(self, padding=0.25, edge_margin=0.05, min_visibility=0.5, min_size=96, max_area_ratio=0.8):
+        self.padding = padding
+        self.edge_margin = edge_margin
+        self.min_visibility = min_visibility
+        self.min_size = min_size
+        self.max_area_ratio = max_area_ratio
+        self.box = None
+
+    def reset(self):
+        self.box = None
+
+    def crop_box(self):
+        """(x0, y0, x1, y1) pixel box for the next frame, or None for the full frame."""
+        return self.box
+
+    def update(self, landmarks, frame_shape):
+        """Recompute the box from full-frame landmarks; None means tracking was lost."""
+        if landmarks is None:
+            self.box = None
+            return
+        height, width = frame_shape[:2]
+        visible = landmarks[landmarks[:, 3] >= self.min_visibility]
+        if len(visible) < 2:
+            self.box = None
+            return
+
+        x0, y0 = visible[:, 0].min() * width, visible[:, 1].min() * height
+        x1, y1 = visible[:, 0].max() * width, visible[:, 1].max() * height
+        if self.box is not None and self._contains(x0, y0, x1, y1):
+            return
+
+        pad_x = max((x1 - x0) * self.padding, (self.min_size - (x1 - x0)) / 2)
+        pad_y = max((y1 - y0) * self.padding, (self.min_size - (y1 - y0)) / 2)
+        box = (max(0, int(x0 - pad_x)), max(0, int(y0 - pad_y)),
+               min(width, int(np.ceil(x1 + pad_x))), min(height, int(np.ceil(y1 + pad_y))))
+        # Cropping most of the frame saves little and only adds mapping error
+        area = (box[2] - box[0]) * (box[3] - box[1])
+        self.box = None if area >= self.max_area_ratio * width * height else box
+
+    def _contains(self, x0, y0, x1, y1):
+        bx0, by0, bx1, by1 = self.box
+        margin_x = (bx1 - bx0) * self.edge_margin
+        margin_y = (by1 - by0) * self.edge_margin
+        if x0 < bx0 + margin_x or y0 < by0 + margin_y or x1 > bx1 - margin_x or y1 > by1 - margin_y:
+            return False
+        # Shrink the box again once the person takes up much less of it
+        needed = (x1 - x0) * (y1 - y0) * (1 + 2 * self.padding) ** 2
+        return needed >= 0.5 * (bx1 - bx0) * (by1 - by0)
+
+
+def crop_to_frame(landmarks, box, frame_shape):
+    """Map landmarks normalized to a crop back to full-frame normalized coordinates."""
+    x0, y0, x1, y1 = box
+    height, width = frame_shape[:2]
+    mapped = landmarks.copy()
+    mapped[:, 0] = (landmarks[:, 0] * (x1 - x0) + x0) / width
+    mapped[:, 1] = (landmarks[:, 1] * (y1 - y0) + y0) / height
+    # MediaPipe's z shares the x scale of the image it was given
+    mapped[:, 2] = landmarks[:, 2] * (x1 - x0) / width
+    return mapped
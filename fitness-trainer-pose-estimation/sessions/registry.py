@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+import uuid
+
+from streaming.broadcast import FrameBroadcaster
+
+
+class WorkoutSession:
+    """Workout state owned by a single trainee/station."""
+
+    def __init__(self, session_id, camera_index=0, frame_source='camera'):
+        self.session_id = session_id
+        self.camera_index = camera_index
+        self.frame_source = frame_source
+        # Pose performance tier requested by this session; None uses the deployment default
+        self.pose_tier = None
+        # Landmark smoothing state, recreated for every exercise
+        self.landmark_filter = None
+        # Cached HUD layers for the current exercise
+        self.hud = None
+
+        self.exercise_running = False
+        self.current_exercise = None
+        self.current_exercise_data = None
+        self.exercise_counter = 0
+        self.exercise_goal = 0
+        self.sets_completed = 0
+        self.sets_goal = 0
+        self.workout_start_time = None
+        self.exercise_started_at = None
+        self.first_frame_latency = None
+        self.output_frame = None
+
+        # Status deltas pushed to /status_feed subscribers; every event carries
+        # the full status, so a reader that skips some loses nothing
+        self.status_events = FrameBroadcaster(size=16, max_lag=15)
+        self._last_reps = 0
+        self._last_stages = {}
+
+        self.last_seen = time.monotonic()
+
+    def touch(self):
+        self.last_seen = time.monotonic()
+
+    def start(self, exercise_type, exercise, sets_goal, reps_goal):
+        """Reset counters and begin tracking a new exercise."""
+        self.current_exercise = exercise
+        self.current_exercise_data = {
+            'type': exercise_type,
+            'sets': sets_goal,
+            'reps': reps_goal
+        }
+        self.sets_goal = sets_goal
+        self.exercise_goal = reps_goal
+        self.exercise_counter = 0
+        self.sets_completed = 0
+        self.workout_start_time = time.time()
+        self.exercise_started_at = time.perf_counter()
+        self.first_frame_latency = None
+        self.exercise_running = True
+        self._last_reps = 0
+        self._last_stages = {}
+        self.publish_status('started', exercise_type=exercise_type)
+
+    def stop(self):
+        self.exercise_running = False
+        self.publish_status('stopped')
+
+    def record_progress(self, exercise_data, set_event=None):
+        """Publish what changed since the last tracked frame: the set event, a rep or a stage.
+
+        Called from the tracking loop after check_set_complete; repeated
+        frames with the same state publish nothing.
+        """
+        stages = {key: value for key, value in exercise_data.items() if key.startswith('stage')}
+        if set_event is not None:
+            self.publish_status(set_event)
+        elif self.exercise_counter != self._last_reps:
+            self.publish_status('rep')
+        if stages != self._last_stages:
+            self.publish_status('stage', stages=stages)
+        self._last_reps = self.exercise_counter
+        self._last_stages = stages
+
+    def publish_status(self, event, **details):
+        message = {'event': event}
+        message.update(details)
+        message.update(self.status())
+        self.status_events.publish(json.dumps(message, separators=(',', ':')))
+
+    def check_set_complete(self):
+        """Close the current set once the rep goal is reached.
+
+        Returns 'workout_complete', 'set_complete' or None.
+        """
+        if self.exercise_counter < self.exercise_goal:
+            return None
+        self.sets_completed += 1
+        self.exercise_counter = 0
+        # Reset the exercise's counters for the next set
+        self.current_exercise.reset_counters()
+
+        # Check if all sets are completed
+        if self.sets_completed >= self.sets_goal:
+            self.exercise_running = False
+            return 'workout_complete'
+        return 'set_complete'
+
+    def status(self):
+        return {
+            'exercise_running': self.exercise_running,
+            'current_reps': self.exercise_counter,
+            'current_set': self.sets_completed + 1 if self.exercise_running else 0,
+            'total_sets': self.sets_goal,
+            'rep_goal': self.exercise_goal,
+            'pose_tier': self.pose_tier,
+            'first_frame_latency_ms': (round(self.first_frame_latency * 1000, 1)
+                                       if self.first_frame_latency is not None else None)
+        }
+
+
+class SessionRegistry:
+    """Maps session ids to WorkoutSession objects and evicts idle ones.
+
+    Lookups are plain dictionary accesses; idle sessions are swept at most once
+    every sweep_interval seconds as a side effect of normal lookups.
+    """
+
+    def __init__(self, idle_timeout=30 * 60, sweep_interval=60, on_evict=None):
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self.on_evict = on_evict
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @staticmethod
+    def new_session_id():
+        return uuid.uuid4().hex
+
+    def get(self, session_id):
+        workout = self._sessions.get(session_id)
+        if workout is not None:
+            workout.touch()
+        self._maybe_sweep()
+        return workout
+
+    def get_or_create(self, session_id, **kwargs):
+        workout = self.get(session_id)
+        if workout is None:
+            with self._lock:
+                workout = self._sessions.get(session_id)
+                if workout is None:
+                    workout = WorkoutSession(session_id, **kwargs)
+                    self._sessions[session_id] = workout
+        return workout
+
+    def remove(self, session_id):
+        with self._lock:
+            workout = self._sessions.pop(session_id, None)
+        if workout is not None and self.on_evict:
+            self.on_evict(workout)
+        return workout
+
+    def evict_idle(self, now=None):
+        """Remove every session not seen within idle_timeout; returns the evicted sessions."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [sid for sid, workout in self._sessions.items()
+                       if now - workout.last_seen > self.idle_timeout]
+            evicted = [self._sessions.pop(sid) for sid in expired]
+            self._last_sweep = now
+        if self.on_evict:
+            for workout in evicted:
+                self.on_evict(workout)
+        return evicted
+
+    def _maybe_sweep(self):
+        if time.monotonic() - self._last_sweep > self.sweep_interval:
+            self.evict_idle()
@@ -1,7 +1,8 @@
 document.addEventListener('DOMContentLoaded', function() {
     // Update charts with real data when available
     function updateChartsWithServerData() {
-        fetch('/dashboard_data')
+        // The server answers 304 via its ETag while nothing new was logged
+        fetch('/dashboard_data', { cache: 'no-cache' })
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
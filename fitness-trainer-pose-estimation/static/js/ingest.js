@@ -0,0 +1,87 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Browser capture mode: frames are taken from the local webcam, downscaled,
+    // uploaded to /ingest_frame and the returned landmarks drawn client-side.
+    const video = document.getElementById('local-video');
+    const overlay = document.getElementById('overlay');
+    if (!video || !overlay) {
+        return;
+    }
+
+    const UPLOAD_WIDTH = 320;
+    const JPEG_QUALITY = 0.7;
+
+    const captureCanvas = document.createElement('canvas');
+    const captureCtx = captureCanvas.getContext('2d');
+    const overlayCtx = overlay.getContext('2d');
+
+    let uploading = false;
+    let exerciseType = null;
+
+    navigator.mediaDevices.getUserMedia({ video: true, audio: false })
+        .then(stream => {
+            video.srcObject = stream;
+        })
+        .catch(error => {
+            console.error('Could not access the webcam:', error);
+        });
+
+    document.querySelectorAll('.exercise-option').forEach(option => {
+        option.addEventListener('click', function() {
+            exerciseType = this.getAttribute('data-exercise');
+        });
+    });
+
+    document.addEventListener('workout-started', function() {
+        uploading = true;
+        uploadFrame();
+    });
+
+    document.addEventListener('workout-stopped', function() {
+        uploading = false;
+        overlayCtx.clearRect(0, 0, overlay.width, overlay.height);
+    });
+
+    // Only one upload is in flight at a time, so a slow server naturally lowers the rate
+    function uploadFrame() {
+        if (!uploading || !video.videoWidth) {
+            if (uploading) {
+                setTimeout(uploadFrame, 100);
+            }
+            return;
+        }
+
+        const scale = UPLOAD_WIDTH / video.videoWidth;
+        captureCanvas.width = UPLOAD_WIDTH;
+        captureCanvas.height = Math.round(video.videoHeight * scale);
+        captureCtx.drawImage(video, 0, 0, captureCanvas.width, captureCanvas.height);
+
+        captureCanvas.toBlob(blob => {
+            fetch('/ingest_frame', {
+                method: 'POST',
+                headers: { 'Content-Type': 'image/jpeg' },
+                body: blob
+            })
+            .then(response => response.json())
+            .then(data => {
+                drawOverlay(data);
+                if (!data.exercise_running) {
+                    uploading = false;
+                }
+            })
+            .catch(error => {
+                console.error('Error uploading frame:', error);
+            })
+            .finally(() => {
+                if (uploading) {
+                    requestAnimationFrame(uploadFrame);
+                }
+            });
+        }, 'image/jpeg', JPEG_QUALITY);
+    }
+
+    function drawOverlay(data) {
+        overlay.width = video.clientWidth;
+        overlay.height = video.clientHeight;
+        window.drawPoseOverlay(overlayCtx, overlay.width, overlay.height, data, exerciseType);
+    }
+});
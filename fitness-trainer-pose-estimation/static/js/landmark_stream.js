@@ -0,0 +1,33 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Landmark stream mode: the server camera is tracked without drawing or JPEG
+    // encoding, and per-frame landmarks arrive over Server-Sent Events.
+    const overlay = document.getElementById('overlay');
+    if (!overlay) {
+        return;
+    }
+
+    const overlayCtx = overlay.getContext('2d');
+    let source = null;
+
+    function drawMessage(event) {
+        const data = JSON.parse(event.data);
+        overlay.width = overlay.clientWidth;
+        overlay.height = overlay.clientHeight;
+        window.drawPoseOverlay(overlayCtx, overlay.width, overlay.height, data);
+    }
+
+    document.addEventListener('workout-started', function() {
+        if (!source) {
+            source = new EventSource('/landmark_feed');
+            source.onmessage = drawMessage;
+        }
+    });
+
+    document.addEventListener('workout-stopped', function() {
+        if (source) {
+            source.close();
+            source = null;
+        }
+        overlayCtx.clearRect(0, 0, overlay.width, overlay.height);
+    });
+});
@@ -0,0 +1,40 @@
+// Client-side pose overlay shared by the browser capture and landmark stream modes
+(function() {
+    // Landmark index pairs drawn for each exercise, from the server's exercise registry
+    const CONNECTIONS = window.EXERCISE_CONNECTIONS;
+
+    window.drawPoseOverlay = function(ctx, width, height, data, exerciseType) {
+        ctx.clearRect(0, 0, width, height);
+        if (!data.landmarks) {
+            return;
+        }
+
+        const connections = CONNECTIONS[exerciseType || data.exercise_type] || [];
+        const points = data.landmarks.map(lm => [lm[0] * width, lm[1] * height]);
+        ctx.strokeStyle = '#ff0000';
+        ctx.fillStyle = '#ff0000';
+        ctx.lineWidth = 3;
+        connections.forEach(([a, b]) => {
+            ctx.beginPath();
+            ctx.moveTo(points[a][0], points[a][1]);
+            ctx.lineTo(points[b][0], points[b][1]);
+            ctx.stroke();
+        });
+        new Set(connections.flat()).forEach(i => {
+            ctx.beginPath();
+            ctx.arc(points[i][0], points[i][1], 6, 0, 2 * Math.PI);
+            ctx.fill();
+        });
+
+        ctx.font = '18px Roboto, sans-serif';
+        ctx.fillStyle = '#ffffff';
+        const lines = [`Count: ${data.counter}`];
+        if (data.stage !== undefined) {
+            lines.push(`Stage: ${data.stage}`, `Angle: ${Math.round(data.angle)}`);
+        } else {
+            lines.push(`Right Stage: ${data.stage_right}`, `Left Stage: ${data.stage_left}`);
+        }
+        (data.warnings || []).forEach(w => lines.push(w));
+        lines.forEach((text, i) => ctx.fillText(text, 20, 30 + i * 24));
+    };
+})();
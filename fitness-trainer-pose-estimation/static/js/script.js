@@ -12,7 +12,7 @@ document.addEventListener('DOMContentLoaded', function() {
     // Variables
     let selectedExercise = null;
     let workoutRunning = false;
-    let statusCheckInterval = null;
+    let statusSource = null;
     
     // Select exercise
     exerciseOptions.forEach(option => {
@@ -50,7 +50,9 @@ document.addEventListener('DOMContentLoaded', function() {
             body: JSON.stringify({
                 exercise_type: selectedExercise,
                 sets: sets,
-                reps: reps
+                reps: reps,
+                source: document.body.dataset.source || 'camera',
+                tier: new URLSearchParams(window.location.search).get('tier')
             }),
         })
         .then(response => response.json())
@@ -65,8 +67,9 @@ document.addEventListener('DOMContentLoaded', function() {
                 currentSet.textContent = `1 / ${sets}`;
                 currentReps.textContent = `0 / ${reps}`;
                 
-                // Start status polling
-                statusCheckInterval = setInterval(checkStatus, 1000);
+                // Status changes are pushed by the server as they happen
+                openStatusFeed();
+                document.dispatchEvent(new CustomEvent('workout-started'));
             } else {
                 alert('Failed to start exercise: ' + (data.error || 'Unknown error'));
             }
@@ -96,11 +99,14 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
     
-    // Function to check status
-    function checkStatus() {
-        fetch('/get_status')
-        .then(response => response.json())
-        .then(data => {
+    // Status deltas (rep, stage, set_complete, workout_complete, ...) over Server-Sent Events
+    function openStatusFeed() {
+        if (statusSource) {
+            return;
+        }
+        statusSource = new EventSource('/status_feed');
+        statusSource.onmessage = function(event) {
+            const data = JSON.parse(event.data);
             if (!data.exercise_running && workoutRunning) {
                 // Workout has ended
                 resetWorkoutUI();
@@ -110,10 +116,11 @@ document.addEventListener('DOMContentLoaded', function() {
             // Update status display
             currentSet.textContent = `${data.current_set} / ${data.total_sets}`;
             currentReps.textContent = `${data.current_reps} / ${data.rep_goal}`;
-        })
-        .catch(error => {
-            console.error('Error checking status:', error);
-        });
+            document.dispatchEvent(new CustomEvent('workout-status', { detail: data }));
+        };
+        statusSource.onerror = function() {
+            console.error('Status feed interrupted, the browser will reconnect');
+        };
     }
     
     // Reset UI after workout ends
@@ -122,10 +129,11 @@ document.addEventListener('DOMContentLoaded', function() {
         startBtn.disabled = false;
         stopBtn.disabled = true;
         
-        if (statusCheckInterval) {
-            clearInterval(statusCheckInterval);
-            statusCheckInterval = null;
+        if (statusSource) {
+            statusSource.close();
+            statusSource = null;
         }
+        document.dispatchEvent(new CustomEvent('workout-stopped'));
         
         currentExercise.textContent = 'None';
         currentSet.textContent = '0 / 0';
@@ -0,0 +1,100 @@
+import threading
+
+
+class FrameBroadcaster:
+    """Ring buffer of published frames shared by any number of subscribers.
+
+    The producer never waits on readers: every subscriber keeps its own cursor,
+    and a reader that falls more than max_lag frames behind jumps straight to
+    the newest frame instead of replaying the backlog.
+    """
+
+    def __init__(self, size=4, max_lag=1):
+        self.size = size
+        self.max_lag = max_lag
+        self._ring = [None] * size
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._subscribers = 0
+        self._closed = False
+
+    @property
+    def seq(self):
+        return self._seq
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def subscriber_count(self):
+        return self._subscribers
+
+    def publish(self, item):
+        with self._cond:
+            self._seq += 1
+            self._ring[self._seq % self.size] = item
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed = False
+
+    def subscribe(self):
+        with self._cond:
+            self._subscribers += 1
+            return Subscription(self, self._seq)
+
+    def _unsubscribe(self):
+        with self._cond:
+            self._subscribers -= 1
+
+    def _read(self, cursor, timeout):
+        """Return (new_cursor, item, skipped) for the next frame after cursor."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > cursor or self._closed, timeout)
+            if self._seq <= cursor:
+                return cursor, None, 0
+            lag = self._seq - cursor
+            if lag > min(self.max_lag, self.size - 1):
+                next_seq = self._seq
+            else:
+                next_seq = cursor + 1
+            return next_seq, self._ring[next_seq % self.size], next_seq - cursor - 1
+
+
+class Subscription:
+    """A single reader's cursor into a FrameBroadcaster."""
+
+    def __init__(self, broadcaster, cursor):
+        self.broadcaster = broadcaster
+        self.cursor = cursor
+        self.skipped = 0
+        self.closed = False
+
+    def next(self, timeout=None):
+        """Wait for the next frame; returns None on timeout or once closed."""
+        if self.closed:
+            return None
+        self.cursor, item, skipped = self.broadcaster._read(self.cursor, timeout)
+        self.skipped += skipped
+        return item
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.broadcaster._unsubscribe()
+
+    def __iter__(self):
+        try:
+            while not self.closed and not self.broadcaster._closed:
+                item = self.next(timeout=1.0)
+                if item is not None:
+                    yield item
+        finally:
+            self.close()
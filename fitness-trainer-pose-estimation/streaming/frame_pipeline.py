@@ -0,0 +1,206 @@
+import time
+import threading
+import logging
+from collections import deque
+
+
+from streaming.broadcast import FrameBroadcaster
+from streaming.profiles import STREAM_PROFILES, encode_frame
+
+logger = logging.getLogger(__name__)
+
+
+class DropOldestQueue:
+    """Bounded queue that discards the oldest item instead of blocking the producer."""
+
+    def __init__(self, maxsize=1):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Pop the oldest item, or return None if nothing arrives within timeout."""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            return self._items.popleft() if self._items else None
+
+    def get_latest(self, timeout=None):
+        """Pop the newest item and drop everything queued before it."""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            self.dropped += len(self._items) - 1
+            item = self._items.pop()
+            self._items.clear()
+            return item
+
+    def wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+
+class FramePipeline:
+    """Capture -> inference -> overlay/encode pipeline running on three threads.
+
+    read_frame() returns (success, frame) like cv2.VideoCapture.read. When a
+    source_ready event is given, capture blocks on it instead of polling a
+    source that is not open yet; failed reads back off exponentially from
+    idle_backoff up to max_idle_backoff.
+    infer(frame) runs the expensive pose model and returns its result.
+    render(frame, result, draw) tracks the newest inference result and
+    returns (frame, message); the overlay is only drawn when draw is true and
+    message is an optional pre-serialized landmark/tracker update.
+
+    Every captured frame is rendered and encoded, so the stream keeps the camera
+    frame rate; inference only ever sees the freshest frame and its result is
+    reused until the next one is ready. Each stream profile (resolution, JPEG
+    quality, max fps; see streaming/profiles.py) that has viewers is encoded
+    once per frame and published to its own FrameBroadcaster, so any number of
+    clients share one pipeline and one encode per profile.
+
+    While no client watches the video, drawing and JPEG encoding are skipped
+    and each inference result is rendered once, only to advance tracking and
+    publish its message to landmark_broadcaster.
+    """
+
+    def __init__(self, read_frame, infer, render, profiles=None, source_ready=None,
+                 idle_backoff=0.01, max_idle_backoff=0.5):
+        self.read_frame = read_frame
+        self.infer = infer
+        self.render = render
+        self.source_ready = source_ready
+        self.idle_backoff = idle_backoff
+        self.max_idle_backoff = max_idle_backoff
+        self.profiles = profiles or STREAM_PROFILES
+
+        self.inference_queue = DropOldestQueue(maxsize=1)
+        self.render_queue = DropOldestQueue(maxsize=2)
+
+        self._result_lock = threading.Lock()
+        self._latest_result = None
+
+        self.broadcasters = {name: FrameBroadcaster() for name in self.profiles}
+        self._next_encode = {name: 0.0 for name in self.profiles}
+        self.landmark_broadcaster = FrameBroadcaster(size=8, max_lag=4)
+
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self._threads:
+            return self
+        self._stop.clear()
+        for broadcaster in self.broadcasters.values():
+            broadcaster.reopen()
+        self.landmark_broadcaster.reopen()
+        for target, name in ((self._capture_loop, "capture"),
+                             (self._inference_loop, "inference"),
+                             (self._encode_loop, "encode")):
+            thread = threading.Thread(target=target, name=f"frame-pipeline-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.inference_queue.wake()
+        self.render_queue.wake()
+        for broadcaster in self.broadcasters.values():
+            broadcaster.close()
+        self.landmark_broadcaster.close()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
+    @property
+    def running(self):
+        return bool(self._threads) and not self._stop.is_set()
+
+    def _capture_loop(self):
+        backoff = 0
+        while not self._stop.is_set():
+            if self.source_ready is not None and not self.source_ready.wait(timeout=0.5):
+                continue
+            success, frame = self.read_frame()
+            if not success or frame is None:
+                backoff = min(max(backoff * 2, self.idle_backoff), self.max_idle_backoff)
+                self._stop.wait(backoff)
+                continue
+            backoff = 0
+            self.inference_queue.put(frame)
+            # Inference reads the frame while the overlay stage draws on it
+            self.render_queue.put(frame.copy() if self.video_wanted else frame)
+
+    def _inference_loop(self):
+        while not self._stop.is_set():
+            frame = self.inference_queue.get_latest(timeout=0.5)
+            if frame is None:
+                continue
+            try:
+                result = self.infer(frame)
+            except Exception:
+                logger.exception("Pose inference failed")
+                continue
+            with self._result_lock:
+                self._latest_result = result
+
+    @property
+    def video_wanted(self):
+        return any(broadcaster.subscriber_count for broadcaster in self.broadcasters.values())
+
+    def _encode_loop(self):
+        last_result = None
+        while not self._stop.is_set():
+            frame = self.render_queue.get(timeout=0.5)
+            if frame is None:
+                continue
+            with self._result_lock:
+                result = self._latest_result
+            draw = self.video_wanted
+            fresh = result is not last_result
+            # Without video there is nothing to redraw until a new result arrives
+            if not draw and not fresh:
+                continue
+            last_result = result
+            try:
+                frame, message = self.render(frame, result, draw)
+                if message is not None and fresh:
+                    self.landmark_broadcaster.publish(message)
+                if draw:
+                    self._publish_profiles(frame)
+            except Exception:
+                logger.exception("Frame overlay/encoding failed")
+
+    def _publish_profiles(self, frame):
+        """Encode the frame once for every watched profile that is due under its fps cap."""
+        now = time.monotonic()
+        for name, broadcaster in self.broadcasters.items():
+            if not broadcaster.subscriber_count:
+                continue
+            max_fps = self.profiles[name]['fps']
+            if max_fps:
+                if now < self._next_encode[name]:
+                    continue
+                # Keep a fixed grid so the cap holds on average, restarting it after idle
+                self._next_encode[name] = max(self._next_encode[name] + 1.0 / max_fps, now)
+            encoded = encode_frame(frame, self.profiles[name])
+            if encoded is not None:
+                broadcaster.publish(encoded)
+
+    def subscribe(self, profile='full'):
+        """Return an iterable subscription yielding JPEG frames encoded for a stream profile."""
+        return self.broadcasters[profile].subscribe()
+
+    def subscribe_landmarks(self):
+        """Return an iterable subscription yielding serialized landmark/tracker messages."""
+        return self.landmark_broadcaster.subscribe()
@@ -0,0 +1,155 @@
+import os
+import threading
+import queue
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def decode_frame(body, content_type, width=None, height=None):
+    """Decode an uploaded frame into an image array.
+
+    JPEG/PNG bodies are decoded straight from the request buffer. Raw frames
+    (application/octet-stream with explicit width and height) are wrapped
+    without copying; 3 channel frames are expected in RGB order, 4 channel
+    frames are canvas RGBA. Returns (frame, is_rgb) or (None, False).
+    """
+    buffer = np.frombuffer(body, dtype=np.uint8)
+    if buffer.size == 0:
+        return None, False
+    if content_type in ('image/jpeg', 'image/png'):
+        return cv2.imdecode(buffer, cv2.IMREAD_COLOR), False
+    if not width or not height or buffer.size % (width * height):
+        return None, False
+    channels = buffer.size // (width * height)
+    if channels == 3:
+        return buffer.reshape(height, width, 3), True
+    if channels == 4:
+        return cv2.cvtColor(buffer.reshape(height, width, 4), cv2.COLOR_RGBA2RGB), True
+    return None, False
+
+
+class _Shard:
+    """One worker thread with its own queue and the estimators of the clients hashed to it."""
+
+    def __init__(self, name, estimator_factory, max_clients):
+        self.name = name
+        self.estimator_factory = estimator_factory
+        self.max_clients = max_clients
+        self.queue = queue.Queue()
+        self.estimators = OrderedDict()
+        self.thread = None
+        self.frames = 0
+
+    def _drain(self):
+        """Everything queued right now, waiting only for the first item."""
+        try:
+            items = [self.queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _estimator(self, client_id):
+        estimator = self.estimators.get(client_id)
+        if estimator is None:
+            estimator = self.estimator_factory()
+            self.estimators[client_id] = estimator
+            if len(self.estimators) > self.max_clients:
+                self.estimators.popitem(last=False)
+        else:
+            self.estimators.move_to_end(client_id)
+        return estimator
+
+    def run(self, stop):
+        while not stop.is_set():
+            items = self._drain()
+            # Newest frame per client wins; older ones from the same client are stale
+            newest = {}
+            for client_id, frame, is_rgb, tier, future in items:
+                if future is None:
+                    self.estimators.pop(client_id, None)
+                    released = newest.pop(client_id, None)
+                    if released is not None:
+                        released[3].set_result(None)
+                    continue
+                previous = newest.get(client_id)
+                if previous is not None:
+                    previous[3].set_result(None)
+                newest[client_id] = (frame, is_rgb, tier, future)
+
+            for client_id, (frame, is_rgb, tier, future) in newest.items():
+                try:
+                    estimator = self._estimator(client_id)
+                    if tier is not None:
+                        estimator.set_tier(tier)
+                    future.set_result(estimator.estimate_landmarks(frame, is_rgb))
+                except Exception as e:
+                    logger.exception("Pose inference failed")
+                    future.set_exception(e)
+            self.frames += len(newest)
+
+
+class InferenceWorkerPool:
+    """Runs pose inference for frames uploaded by many clients on a pool of worker threads.
+
+    Clients are sharded across the threads by hash(client_id), so each client's
+    frames stay in order on one thread with its own estimator (the pose model
+    tracks a person across consecutive frames) while different clients infer
+    in parallel; the model releases the GIL during inference. Frames are taken
+    as soon as they arrive; when a client has queued several, only the newest
+    is inferred and the stale ones resolve to None.
+    """
+
+    def __init__(self, estimator_factory, workers=None, max_clients=64):
+        workers = workers or min(4, os.cpu_count() or 1)
+        # Each shard holds up to its share of the client estimators
+        per_shard = max(1, -(-max_clients // workers))
+        self._shards = [_Shard(f"pose-inference-{i}", estimator_factory, per_shard) for i in range(workers)]
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def frames(self):
+        return sum(shard.frames for shard in self._shards)
+
+    def start(self):
+        with self._lock:
+            self._stop.clear()
+            for shard in self._shards:
+                if shard.thread is None:
+                    shard.thread = threading.Thread(target=shard.run, args=(self._stop,), name=shard.name, daemon=True)
+                    shard.thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            for shard in self._shards:
+                if shard.thread is not None:
+                    shard.thread.join(timeout=1.0)
+                    shard.thread = None
+
+    def _shard(self, client_id):
+        return self._shards[hash(client_id) % len(self._shards)]
+
+    def submit(self, client_id, frame, is_rgb=False, tier=None):
+        """Queue a frame for inference; returns a Future resolving to the landmark array.
+
+        tier switches the client's estimator to another performance tier.
+        """
+        future = Future()
+        self._shard(client_id).queue.put((client_id, frame, is_rgb, tier, future))
+        return future
+
+    def release(self, client_id):
+        """Drop a client's estimator, e.g. when its session is evicted."""
+        self._shard(client_id).queue.put((client_id, None, False, None, None))
@@ -0,0 +1,67 @@
+import cv2
+
+# MJPEG stream profiles from cheapest to best. width caps the encoded width
+# (None keeps the camera resolution), fps caps how often the profile is encoded
+# (None encodes every rendered frame).
+STREAM_PROFILES = {
+    'low': {'width': 480, 'quality': 50, 'fps': 10},
+    'medium': {'width': 854, 'quality': 70, 'fps': 20},
+    'high': {'width': 1280, 'quality': 85, 'fps': 30},
+    'full': {'width': None, 'quality': 95, 'fps': None},
+}
+PROFILE_ORDER = list(STREAM_PROFILES)
+AUTO_PROFILES = ['low', 'medium', 'high']
+
+
+def encode_frame(frame, profile):
+    """JPEG bytes for a frame downscaled and compressed as the profile says, or None."""
+    width = profile['width']
+    if width and frame.shape[1] > width:
+        height = round(frame.shape[0] * width / frame.shape[1])
+        frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_LINEAR)
+    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, profile['quality']])
+    return buffer.tobytes() if ret else None
+
+
+class ProfileAdapter:
+    """Moves one MJPEG client between AUTO_PROFILES by how fast it drains the stream.
+
+    A client that cannot keep up falls behind its broadcaster and skips frames.
+    After every window of delivered frames, a skip ratio above max_skip_ratio
+    steps the client down a profile; upgrade_windows clean windows in a row
+    step it back up.
+    """
+
+    def __init__(self, start='medium', window=30, max_skip_ratio=0.2, upgrade_windows=3):
+        self.index = AUTO_PROFILES.index(start)
+        self.window = window
+        self.max_skip_ratio = max_skip_ratio
+        self.upgrade_windows = upgrade_windows
+        self._delivered = 0
+        self._skipped = 0
+        self._clean_windows = 0
+
+    @property
+    def profile(self):
+        return AUTO_PROFILES[self.index]
+
+    def record(self, skipped):
+        """Count one delivered frame and the frames skipped before it; returns the profile to use."""
+        self._delivered += 1
+        self._skipped += skipped
+        if self._delivered < self.window:
+            return self.profile
+
+        ratio = self._skipped / (self._delivered + self._skipped)
+        self._delivered = self._skipped = 0
+        if ratio > self.max_skip_ratio:
+            self._clean_windows = 0
+            self.index = max(self.index - 1, 0)
+        elif ratio == 0:
+            self._clean_windows += 1
+            if self._clean_windows >= self.upgrade_windows:
+                self._clean_windows = 0
+                self.index = min(self.index + 1, len(AUTO_PROFILES) - 1)
+        else:
+            self._clean_windows = 0
+        return self.profile
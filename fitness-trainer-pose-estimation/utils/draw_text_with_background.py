@@ -1,8 +1,16 @@
+from functools import lru_cache
+
 import cv2
 
+
+@lru_cache(maxsize=1024)
+def text_size(text, font, font_scale, thickness):
+    """cv2.getTextSize, cached; HUD labels repeat every frame."""
+    return cv2.getTextSize(text, font, font_scale, thickness)
+
 def draw_text_with_background(frame, text, position, font, font_scale, text_color, bg_color, thickness=2):
     # Text size
-    (text_width, text_height), _ = cv2.getTextSize(text, font, font_scale, thickness)
+    (text_width, text_height), _ = text_size(text, font, font_scale, thickness)
 
     # Calculate background coordinates
     x, y = position
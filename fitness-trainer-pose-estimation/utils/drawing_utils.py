@@ -1,7 +1,7 @@
 import cv2
 import numpy as np
 import math
-from utils.draw_text_with_background import draw_text_with_background
+from utils.draw_text_with_background import draw_text_with_background, text_size
 
 def display_counter(frame, counter, position=(40, 240), color=(0, 0, 0), background_color=(192, 192, 192)):
     """Display the repetition counter."""
@@ -15,52 +15,67 @@ def display_stage(frame, stage, label="Stage", position=(40, 270), color=(0, 0,
     draw_text_with_background(frame, text, position, 
                              cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, background_color, 1)
 
-def draw_progress_bar(frame, exercise, value, position, size=(200, 20), color=(0, 255, 0), background_color=(255, 255, 255)):
+def draw_progress_bar(frame, exercise, value, position, size=(200, 20), color=(0, 255, 0), background_color=(255, 255, 255),
+                      max_value=10):
     """Draw a progress bar for tracking exercise repetitions."""
+    draw_progress_bar_background(frame, exercise, position, size, background_color)
+    draw_progress_bar_fill(frame, value, position, size, color, max_value)
+
+def draw_progress_bar_background(frame, exercise, position, size=(200, 20), background_color=(255, 255, 255)):
+    """Static part of the progress bar: background, border and label."""
+    x, y = position
+    width, height = size
+
+    # Draw background
+    cv2.rectangle(frame, (x, y), (x + width, y + height), background_color, -1)
+    cv2.rectangle(frame, (x, y), (x + width, y + height), (0, 0, 0), 1)
+
+    # Draw label above the progress bar
+    label = f"{exercise.replace('_', ' ').title()} Progress"
+    draw_text_with_background(frame, label, (x, y - 10), 
+                             cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), (118, 29, 14), 1)
+
+def draw_progress_bar_fill(frame, value, position, size=(200, 20), color=(0, 255, 0), max_value=10):
+    """Dynamic part of the progress bar: fill and value text."""
     x, y = position
     width, height = size
-    
-    # Get max value for the exercise type
-    max_value = 10  # Default
-    if exercise == "squat":
-        max_value = 15
-    elif exercise == "push_up":
-        max_value = 10
-    elif exercise == "hammer_curl":
-        max_value = 12
     
     # Calculate fill width
     fill_width = int((value / max_value) * width)
     fill_width = min(fill_width, width)  # Ensure it doesn't exceed max width
     
-    # Draw background
-    cv2.rectangle(frame, (x, y), (x + width, y + height), background_color, -1)
-    cv2.rectangle(frame, (x, y), (x + width, y + height), (0, 0, 0), 1)
-    
     # Draw fill
     if fill_width > 0:
         cv2.rectangle(frame, (x, y), (x + fill_width, y + height), color, -1)
     
     # Draw text
     text = f"{value}/{max_value}"
-    text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
-    text_x = x + (width - text_size[0]) // 2
-    text_y = y + (height + text_size[1]) // 2
+    text_width, text_height = text_size(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
+    text_x = x + (width - text_width) // 2
+    text_y = y + (height + text_height) // 2
     cv2.putText(frame, text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)
-    
-    # Draw label above the progress bar
-    label = f"{exercise.replace('_', ' ').title()} Progress"
-    draw_text_with_background(frame, label, (x, y - 10), 
-                             cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), (118, 29, 14), 1)
 
 def draw_gauge_meter(frame, angle, text, position, radius=50, color=(0, 0, 255)):
     """Draw a gauge meter visualization showing the angle."""
+    draw_gauge_face(frame, text, position, radius)
+    draw_gauge_needle(frame, angle, position, radius, color)
+
+def draw_gauge_face(frame, text, position, radius=50):
+    """Static part of the gauge: outer circle and title."""
     x, y = position
-    start_angle = 180
-    end_angle = 0
-    
+
     # Draw outer circle
     cv2.circle(frame, (x, y), radius, (200, 200, 200), 2)
+
+    # Draw title
+    cv2.putText(frame, text, (x - radius, y - radius - 10),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)
+
+def draw_gauge_needle(frame, angle, position, radius=50, color=(0, 0, 255)):
+    """Dynamic part of the gauge: needle, hub and angle text."""
+    x, y = position
+    start_angle = 180
+    end_angle = 0
     
     # Calculate the angle position on the gauge
     gauge_angle = start_angle - (angle * (start_angle - end_angle) / 180)
@@ -82,7 +97,3 @@ def draw_gauge_meter(frame, angle, text, position, radius=50, color=(0, 0, 255))
     # Draw text
     cv2.putText(frame, f"{int(angle)}°", (x - 20, y + radius + 20), 
                 cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-    
-    # Draw title
-    cv2.putText(frame, text, (x - radius, y - radius - 10),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)